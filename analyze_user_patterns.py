@@ -3,112 +3,157 @@
 사용자 이탈 패턴 분석 스크립트
 """
 
-import json
-import pandas as pd
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
-def analyze_user_patterns():
-    # 데이터 로드
-    with open('data/session_logs.json', 'r', encoding='utf-8') as f:
-        sessions = json.load(f)
-    
-    with open('data/ingame_action_logs.json', 'r', encoding='utf-8') as f:
-        actions = json.load(f)
-    
-    with open('data/item_logs.json', 'r', encoding='utf-8') as f:
-        items = json.load(f)
-    
-    with open('data/payment_logs.json', 'r', encoding='utf-8') as f:
-        payments = json.load(f)
-    
-    # DataFrame 변환
-    df_sessions = pd.DataFrame(sessions)
-    df_actions = pd.DataFrame(actions)
-    df_items = pd.DataFrame(items)
-    df_payments = pd.DataFrame(payments)
-    
+import instrumentation
+from log_reader import find_log_file, iter_column_chunks, split_ranges
+from log_tables import load_tables
+from pattern_metrics import UserPatternMetrics, aggregate_range
+
+def analyze_user_patterns(metrics=instrumentation.DISABLED, cache=True):
+    # 데이터 로드 (user_id는 네 테이블 공용 정수 코드, 반복 문자열은 범주형)
+    # cache=True면 data/.column_cache의 파싱된 컬럼 캐시를 사용 (원본이 바뀌면 다시 파싱)
+    with metrics.stage('load'):
+        tables = load_tables({
+            'session': 'data/session_logs.json',
+            'ingame_action': 'data/ingame_action_logs.json',
+            'item': 'data/item_logs.json',
+            'payment': 'data/payment_logs.json',
+        }, cache=cache)
+        metrics.add('records_loaded', sum(len(table) for table in tables.tables.values()))
+
+    # 컬럼 파싱과 유저별 집계를 한 번에 (모든 섹션이 같은 집계를 공유)
+    with metrics.stage('aggregate'):
+        report = UserPatternMetrics.from_tables(tables, tables.dictionaries['user_id']).report()
+
+    print_report(report)
+    return results_of(report)
+
+def analyze_user_patterns_chunked(data_dir='data', chunk_rows=100000, metrics=instrumentation.DISABLED):
+    """로그를 chunk_rows건씩 읽으며 유저별 집계에 더함 - 메모리는 한 청크와 유저별 집계만 사용
+
+    data_dir에서 로그 타입별 NDJSON/CSV/JSON 배열 파일을 찾아(log_reader.find_log_file) 읽으며,
+    전체를 올려 분석한 결과와 같은 리포트를 냅니다.
+    """
+    aggregates = UserPatternMetrics()
+    for log_name, columns in UserPatternMetrics.COLUMNS.items():
+        path = find_log_file(data_dir, log_name)
+        print(f"📂 {path} 청크 단위 집계 중...")
+        with metrics.stage(log_name):
+            for chunk in iter_column_chunks(path, columns, chunk_rows):
+                aggregates.add(log_name, chunk)
+                metrics.add('records_loaded', len(chunk['user_id']))
+
+    report = aggregates.report()
+    print_report(report)
+    return results_of(report)
+
+def analyze_user_patterns_parallel(data_dir='data', workers=None, chunk_rows=100000, metrics=instrumentation.DISABLED):
+    """로그 파일을 레코드 경계에 맞춘 바이트 범위로 나눠 워커 프로세스에서 집계한 뒤 merge로 합침
+
+    각 워커는 맡은 범위만 읽고 파싱하므로 전체 파싱 작업은 한 번이며(워커 수만큼 늘지 않음),
+    워커 메모리는 한 청크와 그 범위에 나온 유저의 집계뿐입니다. 범위별 집계를 파일/범위 순서대로
+    합치므로 결제자/무기 구매자 목록 순서까지 --chunked와 같습니다.
+    압축 파일은 중간부터 읽을 수 없어 파일 하나가 워커 하나에 배정됩니다 (log_reader.split_ranges).
+    """
+    workers = workers or os.cpu_count()
+    tasks = []
+    for log_name in UserPatternMetrics.COLUMNS:
+        path = find_log_file(data_dir, log_name)
+        tasks += [(log_name, path, byte_range) for byte_range in split_ranges(path, workers)]
+    print(f"📂 {data_dir} 로그를 {len(tasks)}개 범위로 나눠 {workers}개 워커에서 병렬 집계 중...")
+    with metrics.stage('partitions'):
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(aggregate_range, *task, chunk_rows) for task in tasks]
+            # 제출 순서(파일/범위 순서)대로 합쳐야 유저 등장 순서가 파일 순서와 같음
+            aggregates = UserPatternMetrics()
+            for future in futures:
+                aggregates.merge(future.result())
+
+    report = aggregates.report()
+    print_report(report)
+    return results_of(report)
+
+def results_of(report):
+    return {
+        'daily_users': report['daily_users'],
+        'stage_users': report['stage_users'],
+        'special_weapon_buyers': report['special_weapon_buyers'],
+        'paying_users': report['paying_users']
+    }
+
+def print_report(report):
     print("🔍 사용자 이탈 패턴 분석 결과")
     print("=" * 50)
-    
+
     # 1. 일별 활성 사용자 수 분석
-    df_sessions['login_date'] = pd.to_datetime(df_sessions['login_time']).dt.date
-    daily_users = df_sessions.groupby('login_date')['user_id'].nunique().reset_index()
-    daily_users = daily_users.sort_values('login_date')
-    
     print(f"\n📅 일별 활성 사용자 수:")
-    print(f"초기 (첫 3일 평균): {daily_users.head(3)['user_id'].mean():.0f}명")
-    print(f"후기 (마지막 3일 평균): {daily_users.tail(3)['user_id'].mean():.0f}명")
-    print(f"감소율: {(1 - daily_users.tail(3)['user_id'].mean() / daily_users.head(3)['user_id'].mean()) * 100:.1f}%")
-    
+    print(f"초기 (첫 3일 평균): {report['early_daily_users']:.0f}명")
+    print(f"후기 (마지막 3일 평균): {report['late_daily_users']:.0f}명")
+    print(f"감소율: {report['daily_decline']:.1f}%")
+
     # 2. 스테이지별 사용자 분포
-    stage_users = df_actions.groupby('stage')['user_id'].nunique().reset_index()
-    stage_users['stage_num'] = stage_users['stage'].str.extract('(\d+)').astype(int)
-    stage_users = stage_users.sort_values('stage_num')
-    
     print(f"\n🎯 스테이지별 활성 사용자 수:")
-    for _, row in stage_users.iterrows():
+    for _, row in report['stage_users'].iterrows():
         print(f"  {row['stage']}: {row['user_id']}명")
-    
+
     # 3. 특별 무기 구매 분석
-    special_weapon_buyers = df_items[df_items['item_id'] == 'weapon_legendary_001']['user_id'].unique()
     print(f"\n⚔️ 특별 무기 구매 분석:")
-    print(f"특별 무기 구매자: {len(special_weapon_buyers)}명")
-    
-    # 특별 무기 구매자의 스테이지 진행도
-    weapon_buyer_stages = df_actions[df_actions['user_id'].isin(special_weapon_buyers)]
-    weapon_buyer_max_stages = weapon_buyer_stages.groupby('user_id')['stage'].apply(
-        lambda x: x.str.extract('(\d+)').astype(int).max()
-    )
-    
-    print(f"특별 무기 구매자 평균 최대 스테이지: {weapon_buyer_max_stages.mean():.1f}")
-    
+    print(f"특별 무기 구매자: {len(report['special_weapon_buyers'])}명")
+    print(f"특별 무기 구매자 평균 최대 스테이지: {report['weapon_buyer_max_stage']:.1f}")
+
     # 4. 결제 패턴 분석
-    paying_users = df_payments['user_id'].unique()
-    total_users = df_sessions['user_id'].nunique()
-    
+    paying_users = report['paying_users']
+    total_users = report['total_users']
+
     print(f"\n💳 결제 패턴 분석:")
     print(f"전체 사용자: {total_users}명")
     print(f"결제 사용자: {len(paying_users)}명 ({len(paying_users)/total_users*100:.1f}%)")
-    
-    # 결제자와 비결제자의 스테이지 진행도 비교
-    payer_stages = df_actions[df_actions['user_id'].isin(paying_users)]
-    non_payer_stages = df_actions[~df_actions['user_id'].isin(paying_users)]
-    
-    payer_max_stages = payer_stages.groupby('user_id')['stage'].apply(
-        lambda x: x.str.extract('(\d+)').astype(int).max()
-    )
-    non_payer_max_stages = non_payer_stages.groupby('user_id')['stage'].apply(
-        lambda x: x.str.extract('(\d+)').astype(int).max()
-    )
-    
-    print(f"결제자 평균 최대 스테이지: {payer_max_stages.mean():.1f}")
-    print(f"비결제자 평균 최대 스테이지: {non_payer_max_stages.mean():.1f}")
-    
+    print(f"결제자 평균 최대 스테이지: {report['payer_max_stage']:.1f}")
+    print(f"비결제자 평균 최대 스테이지: {report['non_payer_max_stage']:.1f}")
+
     # 5. 세션 지속 시간 분석
-    df_sessions['session_hours'] = df_sessions['session_duration_seconds'] / 3600
-    
-    payer_sessions = df_sessions[df_sessions['user_id'].isin(paying_users)]
-    non_payer_sessions = df_sessions[~df_sessions['user_id'].isin(paying_users)]
-    
     print(f"\n⏰ 세션 지속 시간 분석:")
-    print(f"결제자 평균 세션 시간: {payer_sessions['session_hours'].mean():.1f}시간")
-    print(f"비결제자 평균 세션 시간: {non_payer_sessions['session_hours'].mean():.1f}시간")
-    
+    print(f"결제자 평균 세션 시간: {report['payer_session_hours']:.1f}시간")
+    print(f"비결제자 평균 세션 시간: {report['non_payer_session_hours']:.1f}시간")
+
     # 6. 스테이지 6-7에서의 이탈 패턴
-    stage_6_7_users = df_actions[df_actions['stage'].isin(['stage_06', 'stage_07'])]['user_id'].unique()
-    stage_8_plus_users = df_actions[df_actions['stage'].str.extract('(\d+)').astype(int)[0] >= 8]['user_id'].unique()
-    
     print(f"\n🚪 이탈 패턴 분석:")
-    print(f"스테이지 6-7 도달 사용자: {len(stage_6_7_users)}명")
-    print(f"스테이지 8+ 진행 사용자: {len(stage_8_plus_users)}명")
-    print(f"스테이지 6-7에서 이탈률: {(1 - len(stage_8_plus_users)/len(stage_6_7_users))*100:.1f}%")
-    
-    return {
-        'daily_users': daily_users,
-        'stage_users': stage_users,
-        'special_weapon_buyers': special_weapon_buyers,
-        'paying_users': paying_users
-    }
+    print(f"스테이지 6-7 도달 사용자: {report['churn_stage_users']}명")
+    print(f"스테이지 8+ 진행 사용자: {report['past_churn_stage_users']}명")
+    print(f"스테이지 6-7에서 이탈률: {(1 - report['past_churn_stage_users']/report['churn_stage_users'])*100:.1f}%")
 
 if __name__ == "__main__":
-    results = analyze_user_patterns()
+    parser = argparse.ArgumentParser(description="사용자 이탈 패턴 분석")
+    parser.add_argument(
+        "--chunked",
+        action="store_true",
+        help="로그를 청크 단위로 스트리밍 집계 (메모리보다 큰 NDJSON/CSV 로그용)",
+    )
+    parser.add_argument("--data-dir", default="data", help="--chunked/--workers로 읽을 로그 디렉토리")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="워커 프로세스 수 - 로그 파일을 레코드 경계의 바이트 범위로 나눠 병렬 집계 (--data-dir 로그를 청크 단위로 읽음)",
+    )
+    parser.add_argument("--chunk-rows", type=int, default=100000, help="--chunked/--workers 청크 크기(건)")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="파싱된 컬럼 캐시(data/.column_cache)를 읽거나 쓰지 않고 JSON을 매번 파싱",
+    )
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+    metrics = instrumentation.from_args(args)
+    if args.workers:
+        results = analyze_user_patterns_parallel(args.data_dir, args.workers, args.chunk_rows, metrics)
+    elif args.chunked:
+        results = analyze_user_patterns_chunked(args.data_dir, args.chunk_rows, metrics)
+    else:
+        results = analyze_user_patterns(metrics, cache=not args.no_cache)
+    if metrics.finish(args.report):
+        print(f"📝 실행 리포트: {args.report}")
@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+NumPy 배치 로그 생성 엔진
+GameLogGenerator의 generate_*_logs와 같은 분포를 레코드 단위가 아닌 열(column) 단위로 한 번에 뽑고,
+dict 레코드는 직렬화 시점에만 조립합니다.
+"""
+
+import numpy as np
+
+from scenario import MAX_STAGE, PERIOD_DAYS
+from session_store import to_epoch
+from value_pools import ValuePools
+
+# UUID 문자열(8-4-4-4-12)에서 16진수 32자가 들어갈 위치
+_UUID_HEX_POSITIONS = np.array(
+    [i for i in range(36) if i not in (8, 13, 18, 23)], dtype=np.intp
+)
+
+
+def format_uuids(raw):
+    """(N, 16) uint8 배열을 UUID4 문자열 numpy 배열로 변환"""
+    raw = raw.copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40  # version 4
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # RFC 4122 variant
+    hex_chars = np.frombuffer(raw.tobytes().hex().encode("ascii"), dtype=np.uint8)
+    out = np.full((len(raw), 36), ord("-"), dtype=np.uint8)
+    out[:, _UUID_HEX_POSITIONS] = hex_chars.reshape(len(raw), 32)
+    return out.view("S36").ravel().astype(str)
+
+
+def format_uuid_parts(hi, lo):
+    """상위/하위 64비트 uint64 배열 -> UUID 문자열 numpy 배열"""
+    raw = np.empty((len(hi), 16), dtype=np.uint8)
+    raw[:, :8] = hi.astype(">u8").view(np.uint8).reshape(-1, 8)
+    raw[:, 8:] = lo.astype(">u8").view(np.uint8).reshape(-1, 8)
+    return format_uuids(raw)
+
+
+def alias_arrays(table):
+    """AliasTable -> (값, prob, alias) numpy 배열"""
+    return np.array(table.values), np.array(table.prob), np.array(table.alias)
+
+
+class ColumnBatch:
+    """열 단위로 보관된 로그 배치 - 반복하면 dict 레코드를 하나씩 조립해 돌려줌"""
+
+    def __init__(self, columns):
+        # 필드 순서는 generate_*_logs 레코드와 동일하게 유지
+        self.columns = columns
+
+    def __len__(self):
+        if not self.columns:
+            return 0
+        return len(next(iter(self.columns.values())))
+
+    def __iter__(self):
+        names = list(self.columns)
+        values = [
+            column.tolist() if isinstance(column, np.ndarray) else column
+            for column in self.columns.values()
+        ]
+        for row in zip(*values):
+            yield dict(zip(names, row))
+
+    def to_records(self):
+        return list(self)
+
+    def rows(self, names):
+        """names 순서의 값 튜플을 차례로 반환 (dict를 만들지 않는 CSV 기록용)"""
+        return zip(
+            *(
+                column.tolist() if isinstance(column, np.ndarray) else column
+                for column in (self.columns[name] for name in names)
+            )
+        )
+
+
+class NumpyBatchEngine:
+    """GameLogGenerator의 설정(모집단, 아이템/지역/디바이스 목록, 시작일)을 공유하는 배치 엔진
+
+    세션은 generator.sessions(SessionStore)에 열 단위로 추가되며, 액션/아이템/결제/에러 로그는
+    이 저장소의 배열을 numpy 뷰로 읽어 샘플링합니다.
+    """
+
+    def __init__(self, generator, seed=None):
+        self.generator = generator
+        self.rng = np.random.default_rng(seed)
+
+        population = generator.population
+        self.success_flags = np.frombuffer(population.success_flags, dtype=np.uint8)
+        self.successful_pool = np.frombuffer(population.successful_pool, dtype=np.int32)
+        self.unsuccessful_pool = np.frombuffer(population.unsuccessful_pool, dtype=np.int32)
+        # generator.user_progress(bytearray)를 그대로 공유하는 쓰기 가능한 뷰
+        self.user_progress = np.frombuffer(generator.user_progress, dtype=np.uint8)
+
+        self.sessions = generator.sessions
+        self.start = to_epoch(generator.start_date)
+
+        # 시나리오 분포 -> (값, prob, alias) 배열
+        scenario = generator.scenario
+        self._alias = {
+            name: alias_arrays(table) for name, table in scenario.distributions.items()
+        }
+        # 정확한 건수 모드: 채택되는 (성공 여부, 경과일) 분포
+        self.exact_counts = generator.exact_counts
+        self._accepted_sessions = alias_arrays(generator.accepted_session_table())
+        self.quest_ids = np.array(generator.quest_ids)
+        self.skill_ids = np.array(generator.skill_ids)
+
+        # 아이템 테이블: 마지막 칸은 특별 무기
+        item_ids = generator.item_ids + [generator.special_weapon]
+        self.item_ids = np.array(item_ids)
+        self.item_names = np.array([f"아이템_{i.split('_')[-1]}" for i in item_ids])
+        self.special_weapon_index = len(item_ids) - 1
+
+        # 스테이지(0~10)별 액션 alias 테이블을 같은 폭으로 채운 2차원 배열 (0번 행은 미사용)
+        tables = scenario.stage_actions[1:]
+        width = max(len(table) for table in tables)
+
+        def padded(rows, fill):
+            return np.array([[fill] * width] + [row + [fill] * (width - len(row)) for row in rows])
+
+        self.stage_action_values = padded([table.values for table in tables], "")
+        self.stage_action_prob = padded([table.prob for table in tables], 1.0)
+        self.stage_action_alias = padded([table.alias for table in tables], 0)
+        self.stage_action_counts = np.array([1] + [len(table) for table in tables])
+        self.stage_names = np.array([""] + [f"stage_{i:02d}" for i in range(1, 11)])
+
+        self.error_messages = np.array(
+            [f"{t.replace('_', ' ').title()} occurred" for t in self._alias["error_type"][0]]
+        )
+        self.error_codes = np.array([f"E{code}" for code in range(1000, 10000)])
+
+        # Faker 값은 풀에서 인덱스로 사용 (generator에 풀이 없으면 엔진 seed로 생성)
+        pools = generator.values
+        if not isinstance(pools, ValuePools):
+            pools = ValuePools.build(seed)
+        self.per_user_values = pools.per_user
+        self.ip_pool = np.array(pools.ips)
+        self.country_pool = np.array(pools.countries)
+        self.stack_trace_pool = np.array(pools.stack_traces, dtype=object)
+        # user_id 문자열 캐시 (해시 계산은 유저당 한 번)
+        self._user_id_cache = np.full(population.user_count, None, dtype=object)
+        self.time_format = generator.time_formatter.mode
+
+    def _uuids(self, n):
+        return format_uuids(self.rng.integers(0, 256, size=(n, 16), dtype=np.uint8))
+
+    def _timestamps(self, seconds):
+        """epoch 초 배열 -> ISO 문자열 배열 (epoch_ms 형식이면 밀리초 정수 배열)"""
+        if self.time_format == "epoch_ms":
+            return seconds.astype(np.int64) * 1000
+        return np.datetime_as_string(seconds.astype("datetime64[s]"), unit="s")
+
+    def _batch(self, columns, seconds):
+        """열 dict -> ColumnBatch (both 형식이면 epoch_ms 열 추가)"""
+        if self.time_format == "both":
+            columns["epoch_ms"] = seconds.astype(np.int64) * 1000
+        return ColumnBatch(columns)
+
+    def _session_column(self, name, dtype):
+        """세션 저장소 열의 numpy 뷰 (저장소에 추가하기 전에 반드시 버려야 함)"""
+        return np.frombuffer(getattr(self.sessions, name).view(), dtype=dtype)
+
+    def _choice(self, values, n):
+        return values[self.rng.integers(0, len(values), size=n)]
+
+    def _draw_index(self, name, n):
+        """시나리오 분포 name에서 n개 추출한 값 인덱스"""
+        return self._alias_slots(self._alias[name], n)
+
+    def _alias_slots(self, arrays, n):
+        """(값, prob, alias) 배열에서 n개 추출한 인덱스 (alias method 벡터화)"""
+        values, prob, alias = arrays
+        u = self.rng.random(n) * len(values)
+        slot = u.astype(np.intp)
+        return np.where(u - slot < prob[slot], slot, alias[slot])
+
+    def _draw(self, name, n):
+        """시나리오 분포 name에서 값 n개 추출"""
+        return self._alias[name][0][self._draw_index(name, n)]
+
+    def _user_values(self, pool, users):
+        """per_user 풀이면 유저 인덱스에 고정된 값, 아니면 균등 추출 (ValuePools.user_slot과 동일)"""
+        if self.per_user_values:
+            return pool[(users.astype(np.int64) * 2654435761) % len(pool)]
+        return self._choice(pool, len(users))
+
+    def _sample_sessions(self, n):
+        """세션 n개를 균등 추출하고 세션 안의 임의 시점(초)을 함께 반환"""
+        index = self.rng.integers(0, len(self.sessions), size=n)
+        return index, self._session_times(index)
+
+    def _session_times(self, index):
+        """세션 인덱스별 로그인~로그아웃 사이 임의 시점(초)"""
+        login = self._session_column("login", np.int64)[index]
+        logout = self._session_column("logout", np.int64)[index]
+        return login + self.rng.integers(0, logout - login + 1)
+
+    def _no_sessions(self):
+        if len(self.sessions):
+            return False
+        print("세션 로그를 먼저 생성해주세요.")
+        return True
+
+    def generate_session_logs(self, count=10000):
+        """세션 로그 배치 - 성공 유저 30%, 그 외는 경과일별 retention으로 걸러냄"""
+        rng = self.rng
+        if self.exact_counts:
+            # 채택될 (성공 여부, 경과일)을 직접 뽑아 정확히 count개
+            cells = self._accepted_sessions[0][self._alias_slots(self._accepted_sessions, count)]
+            pick_successful = cells[:, 0] == 1
+            days = cells[:, 1]
+        else:
+            first_day = self.generator.first_day
+            days = rng.integers(first_day, first_day + PERIOD_DAYS, size=count)
+            retention = np.maximum(0.2, 1.0 - days * 0.027)
+            pick_successful = rng.random(count) < 0.3
+            keep = pick_successful | (rng.random(count) <= retention)
+
+            days = days[keep]
+            pick_successful = pick_successful[keep]
+        n = len(days)
+
+        users = np.where(
+            pick_successful,
+            self._choice(self.successful_pool, n),
+            self._choice(self.unsuccessful_pool, n),
+        )
+        login = (
+            self.start
+            + days.astype(np.int64) * 86400
+            + rng.integers(0, 24, size=n) * 3600
+            + rng.integers(0, 60, size=n) * 60
+        )
+        duration = np.where(
+            pick_successful,
+            rng.integers(1800, 10801, size=n),
+            rng.integers(300, 3601, size=n),
+        )
+        logout = login + duration
+        # UUID4 version/variant 비트를 맞춘 128비트 세션 ID
+        id_hi = rng.integers(0, 2**64, size=n, dtype=np.uint64)
+        id_hi = (id_hi & ~np.uint64(0xF000)) | np.uint64(0x4000)
+        id_lo = rng.integers(0, 2**64, size=n, dtype=np.uint64)
+        id_lo = (id_lo >> np.uint64(2)) | np.uint64(1 << 63)
+        self.sessions.extend_bytes(
+            users.astype(np.int32).tobytes(),
+            login.astype(np.int64).tobytes(),
+            logout.astype(np.int64).tobytes(),
+            id_hi.tobytes(),
+            id_lo.tobytes(),
+        )
+
+        login_time = self._timestamps(login)
+        return self._batch(
+            {
+                "log_id": self._uuids(n),
+                "user_id": self._user_ids(users),
+                "session_id": format_uuid_parts(id_hi, id_lo),
+                "login_time": login_time,
+                "logout_time": self._timestamps(logout),
+                "session_duration_seconds": duration,
+                "device": self._draw("device", n),
+                "os_version": self._draw("os_version", n),
+                "app_version": self._draw("app_version", n),
+                "ip_address": self._user_values(self.ip_pool, users),
+                "country": self._user_values(self.country_pool, users),
+                "timestamp": login_time,
+            },
+            login,
+        )
+
+    def _user_ids(self, users):
+        """유저 인덱스 배열 -> user_id 문자열 배열 (처음 등장한 유저만 해시 계산)"""
+        cache = self._user_id_cache
+        ids = cache[users]
+        missing = ids == None  # noqa: E711 - object 배열의 원소별 비교
+        if missing.any():
+            user_id = self.generator.population.user_id
+            for index in np.unique(users[missing]).tolist():
+                cache[index] = user_id(index)
+            ids = cache[users]
+        return ids
+
+    def _session_columns(self, index):
+        users = self._session_column("user_index", np.int32)[index]
+        session_ids = format_uuid_parts(
+            self._session_column("id_hi", np.uint64)[index],
+            self._session_column("id_lo", np.uint64)[index],
+        )
+        return users, self._user_ids(users), session_ids
+
+    def _assign_progress(self, users):
+        """최대 스테이지가 아직 없는 유저에게 부여 (성공 유저 10, 그 외 시나리오 max_stage 분포)"""
+        new_users = np.unique(users[self.user_progress[users] == 0])
+        if not len(new_users):
+            return
+        max_stage = self._draw("max_stage", len(new_users)).astype(np.uint8)
+        max_stage[self.success_flags[new_users] == 1] = MAX_STAGE
+        self.user_progress[new_users] = max_stage
+
+    def generate_ingame_action_logs(self, count=10000):
+        """인게임 액션 로그 배치 - 유저별 최대 스테이지 안에서 스테이지 구간별 액션"""
+        if self._no_sessions():
+            return ColumnBatch({})
+        rng = self.rng
+        index, offsets = self._sample_sessions(count)
+        users, user_ids, session_ids = self._session_columns(index)
+
+        self._assign_progress(users)
+        stage = rng.integers(1, self.user_progress[users].astype(np.int64) + 1)
+        u = rng.random(count) * self.stage_action_counts[stage]
+        slot = u.astype(np.intp)
+        slot = np.where(
+            u - slot < self.stage_action_prob[stage, slot], slot, self.stage_action_alias[stage, slot]
+        )
+
+        return self._batch(
+            {
+                "log_id": self._uuids(count),
+                "user_id": user_ids,
+                "session_id": session_ids,
+                "timestamp": self._timestamps(offsets),
+                "action_type": self.stage_action_values[stage, slot],
+                "stage": self.stage_names[stage],
+                "region": self._draw("region", count),
+                "quest_id": self._choice(self.quest_ids, count),
+                "skill_used": self._choice(self.skill_ids, count),
+                "experience_gained": rng.integers(10, 101, size=count),
+                "level": np.minimum(stage * 5 + rng.integers(1, 11, size=count), 50),
+            },
+            offsets,
+        )
+
+    def generate_item_logs(self, count=10000):
+        """아이템 로그 배치 - 성공 유저는 10% 확률로 특별 무기 구매"""
+        if self._no_sessions():
+            return ColumnBatch({})
+        rng = self.rng
+        index, offsets = self._sample_sessions(count)
+        users, user_ids, session_ids = self._session_columns(index)
+
+        legendary = (self.success_flags[users] == 1) & (rng.random(count) < 0.1)
+        item = rng.integers(0, self.special_weapon_index, size=count)
+        item[legendary] = self.special_weapon_index
+        action_type = np.where(legendary, "buy", self._draw("item_action", count))
+        price = rng.integers(100, 5001, size=count)
+        price[legendary] = 9900
+        rarity = np.where(legendary, "legendary", self._draw("item_rarity", count))
+
+        return self._batch(
+            {
+                "log_id": self._uuids(count),
+                "user_id": user_ids,
+                "session_id": session_ids,
+                "timestamp": self._timestamps(offsets),
+                "action_type": action_type,
+                "item_id": self.item_ids[item],
+                "item_name": self.item_names[item],
+                "quantity": rng.integers(1, 6, size=count),
+                "price": price,
+                "currency": ["gold"] * count,
+                "item_level": rng.integers(1, 21, size=count),
+                "rarity": rarity,
+            },
+            offsets,
+        )
+
+    def generate_payment_logs(self, count=10000):
+        """결제 로그 배치 - 성공 유저 30%, 그 외 5% 확률로 결제"""
+        if self._no_sessions():
+            return ColumnBatch({})
+        rng = self.rng
+        if self.exact_counts:
+            index, successful = self._sample_payer_sessions(count)
+            offsets = self._session_times(index)
+        else:
+            index, offsets = self._sample_sessions(count)
+            users = self._session_column("user_index", np.int32)[index]
+            successful = self.success_flags[users] == 1
+            keep = rng.random(count) <= np.where(successful, 0.3, 0.05)
+
+            index, offsets, successful = index[keep], offsets[keep], successful[keep]
+        n = len(index)
+        users, user_ids, session_ids = self._session_columns(index)
+
+        amount = np.where(
+            successful, self._draw("successful_amount", n), self._draw("amount", n)
+        )
+        product = np.where(
+            successful, self._draw("successful_product", n), self._draw("product", n)
+        )
+        product_name = np.char.title(np.char.replace(product, "_", " "))
+
+        return self._batch(
+            {
+                "log_id": self._uuids(n),
+                "user_id": user_ids,
+                "session_id": session_ids,
+                "timestamp": self._timestamps(offsets),
+                "transaction_id": self._uuids(n),
+                "product_id": product,
+                "product_name": product_name,
+                "amount": amount,
+                "currency": ["USD"] * n,
+                "payment_method": self._draw("payment_method", n),
+                "status": self._draw("payment_status", n),
+                "country": self._user_values(self.country_pool, users),
+            },
+            offsets,
+        )
+
+    def _sample_payer_sessions(self, n):
+        """결제 확률(성공 유저 0.3, 그 외 0.05)로 가중한 세션 n개 (정확한 건수 모드)"""
+        flags = self.success_flags[self._session_column("user_index", np.int32)] == 1
+        groups = np.flatnonzero(flags), np.flatnonzero(~flags)
+        weights = len(groups[0]) * 0.3, len(groups[1]) * 0.05
+        successful_share = weights[0] / sum(weights) if sum(weights) else 0.0
+
+        successful = self.rng.random(n) < successful_share
+        index = np.empty(n, dtype=np.int64)
+        for group, mask in zip(groups, (successful, ~successful)):
+            picks = int(mask.sum())
+            if picks:
+                index[mask] = group[self.rng.integers(0, len(group), size=picks)]
+        return index, successful
+
+    def generate_error_logs(self, count=10000):
+        """에러 로그 배치"""
+        if self._no_sessions():
+            return ColumnBatch({})
+        rng = self.rng
+        index, offsets = self._sample_sessions(count)
+        _, user_ids, session_ids = self._session_columns(index)
+        error = self._draw_index("error_type", count)
+
+        return self._batch(
+            {
+                "log_id": self._uuids(count),
+                "user_id": user_ids,
+                "session_id": session_ids,
+                "timestamp": self._timestamps(offsets),
+                "error_type": self._alias["error_type"][0][error],
+                "error_code": self._choice(self.error_codes, count),
+                "error_message": self.error_messages[error],
+                "severity": self._draw("severity", count),
+                "device": self._draw("device", count),
+                "os_version": self._draw("os_version", count),
+                "app_version": self._draw("app_version", count),
+                "stack_trace": self._choice(self.stack_trace_pool, count),
+            },
+            offsets,
+        )
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+게임 로그 생성기 벤치마크
+generate_*_logs 메서드와 writer(save_to_json/csv/ndjson)를 건수 x 유저 수 조합으로 실행해
+처리량(건/초), 최대 RSS, 건당 할당 바이트(tracemalloc), 건당 출력 바이트를 측정합니다.
+결과를 JSON 기준선으로 저장해 두고, 다음 실행에서 기준선보다 처리량이 tolerance 넘게 떨어진
+항목이 있으면 실패(종료 코드 1)합니다.
+
+사용 예:
+    python3 benchmark_generator.py --save-baseline benchmarks/baseline.json
+    python3 benchmark_generator.py --baseline benchmarks/baseline.json --tolerance 0.15
+    python3 benchmark_generator.py --counts 10000 100000 1000000 --users 1000 100000 --engines python numpy
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+GENERATE_TARGETS = [
+    "generate_session_logs",
+    "generate_ingame_action_logs",
+    "generate_item_logs",
+    "generate_payment_logs",
+    "generate_error_logs",
+]
+WRITE_TARGETS = ["save_to_json", "save_to_csv", "save_to_ndjson"]
+
+# 출력이 매번 같도록 시작 시각과 seed 고정
+START_DATE = datetime(2025, 7, 1)
+SEED = 42
+# tracemalloc은 실행을 크게 느리게 하므로 할당량은 최대 이 건수로 따로 측정
+ALLOC_SAMPLE = 10000
+
+
+def case_key(case):
+    pools = ":pools" if case["value_pools"] else ""
+    return f"{case['engine']}:{case['target']}:{case['count']}:{case['users']}{pools}"
+
+
+def rss_mb():
+    """현재 프로세스의 최대 RSS(MB) - Linux ru_maxrss는 KB 단위"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_case(case):
+    """벤치마크 항목 하나 실행 (새 프로세스에서 호출되어 최대 RSS가 항목별로 분리됨)"""
+    from generate_game_logs import GameLogGenerator
+
+    generator = GameLogGenerator(case["users"], seed=SEED, start_date=START_DATE)
+    if case["value_pools"]:
+        from value_pools import ValuePools
+
+        generator.use_value_pools(ValuePools.build(SEED))
+    source = generator
+    if case["engine"] == "numpy":
+        from batch_engine import NumpyBatchEngine
+
+        source = NumpyBatchEngine(generator, seed=SEED)
+
+    count = case["count"]
+    target = case["target"]
+    if target != "generate_session_logs":
+        # 세션 외 로그와 writer는 세션이 있어야 하므로 같은 건수의 세션을 먼저 생성 (측정 제외)
+        sessions = source.generate_session_logs(count)
+    base_rss = rss_mb()
+
+    def generate(n):
+        # numpy 배치는 직렬화 시점에 dict를 조립하므로 엔진 간 비교를 위해 레코드 리스트까지 만듦
+        return list(getattr(source, target)(n))
+
+    def write(records, filename):
+        with contextlib.redirect_stdout(io.StringIO()):
+            getattr(generator, target)(records, filename)
+        return os.path.getsize(os.path.join(generator.output_dir, filename))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        generator.output_dir = tmp_dir
+        # repeat회 실행해 가장 빠른 시간을 씀 (짧은 항목의 측정 잡음 완화)
+        elapsed = None
+        for _ in range(case["repeat"]):
+            gc.collect()
+            if target in WRITE_TARGETS:
+                records = list(sessions)
+                started = time.perf_counter()
+                output_bytes = write(records, "bench.log")
+                took = time.perf_counter() - started
+            else:
+                records = None  # 이전 반복의 결과를 먼저 놓아 최대 RSS가 두 배로 잡히지 않게 함
+                started = time.perf_counter()
+                records = generate(count)
+                took = time.perf_counter() - started
+                output_bytes = None
+            events = len(records)
+            elapsed = took if elapsed is None else min(elapsed, took)
+        peak_rss = rss_mb()
+
+        # 할당량 측정 (같은 작업을 ALLOC_SAMPLE건 이하로 한 번 더)
+        sample = min(count, ALLOC_SAMPLE)
+        del records
+        gc.collect()
+        tracemalloc.start()
+        if target in WRITE_TARGETS:
+            sample_records = list(sessions)[:sample]
+            tracemalloc.reset_peak()
+            write(sample_records, "alloc.log")
+            sample_events = len(sample_records)
+        else:
+            sample_events = len(generate(sample))
+        _, alloc_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "events": events,
+        "seconds": round(elapsed, 4),
+        "events_per_sec": round(events / elapsed, 1) if elapsed else 0.0,
+        "base_rss_mb": round(base_rss, 1),
+        "peak_rss_mb": round(peak_rss, 1),
+        "alloc_bytes_per_event": round(alloc_peak / sample_events, 1) if sample_events else 0.0,
+        "bytes_per_event": round(output_bytes / events, 1) if output_bytes and events else None,
+    }
+
+
+def build_cases(args):
+    targets = args.targets or GENERATE_TARGETS + WRITE_TARGETS
+    cases = []
+    for engine in args.engines:
+        for target in targets:
+            # writer는 엔진과 무관하므로 python 엔진에서만 측정
+            if target in WRITE_TARGETS and engine != "python":
+                continue
+            for users in args.users:
+                for count in args.counts:
+                    cases.append(
+                        {
+                            "engine": engine,
+                            "target": target,
+                            "count": count,
+                            "users": users,
+                            "value_pools": args.value_pools,
+                            "repeat": args.repeat,
+                        }
+                    )
+    return cases
+
+
+def run_benchmarks(cases):
+    """항목마다 새 프로세스(spawn)를 띄워 실행하고 {항목 키: 결과} 반환"""
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for case in cases:
+        key = case_key(case)
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            result = executor.submit(run_case, case).result()
+        results[key] = dict(case, **result)
+        print(
+            f"  {key:<52} {result['events_per_sec']:>12,.0f}건/s  "
+            f"RSS {result['peak_rss_mb']:>7.1f}MB  할당 {result['alloc_bytes_per_event']:>8.0f}B/건"
+        )
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """기준선 대비 처리량이 tolerance 넘게 떨어진 항목 목록 [(키, 현재, 기준, 비율)]"""
+    regressions = []
+    print(f"\n📏 기준선 비교 (허용 하락폭 {tolerance:.0%})")
+    for key, result in results.items():
+        base = baseline["results"].get(key)
+        if base is None or not base["events_per_sec"]:
+            print(f"  {key:<52} 기준선 없음")
+            continue
+        ratio = result["events_per_sec"] / base["events_per_sec"]
+        mark = "❌" if ratio < 1 - tolerance else "✅"
+        print(f"  {mark} {key:<50} {ratio - 1:+7.1%}")
+        if ratio < 1 - tolerance:
+            regressions.append((key, result["events_per_sec"], base["events_per_sec"], ratio))
+    return regressions
+
+
+def environment():
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="게임 로그 생성기 벤치마크")
+    parser.add_argument(
+        "--counts", type=int, nargs="+", default=[10000, 100000, 1000000], help="생성 건수 목록"
+    )
+    parser.add_argument("--users", type=int, nargs="+", default=[1000, 100000], help="유저 수 목록")
+    parser.add_argument(
+        "--engines", nargs="+", choices=["python", "numpy"], default=["python"], help="생성 엔진"
+    )
+    parser.add_argument(
+        "--targets",
+        nargs="+",
+        choices=GENERATE_TARGETS + WRITE_TARGETS,
+        default=None,
+        help="측정할 메서드 (기본: 전체)",
+    )
+    parser.add_argument("--value-pools", action="store_true", help="Faker 대신 값 풀 사용")
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="항목별 반복 횟수 (가장 빠른 실행으로 처리량 계산)"
+    )
+    parser.add_argument("--output", default=None, help="이번 결과를 저장할 JSON 파일")
+    parser.add_argument("--save-baseline", default=None, help="이번 결과를 기준선 JSON으로 저장")
+    parser.add_argument("--baseline", default=None, help="비교할 기준선 JSON")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.10, help="허용하는 처리량 하락 비율 (0.10 = 10%%)"
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    cases = build_cases(args)
+    print(f"⏱️  벤치마크 {len(cases)}개 항목 실행 중...")
+    report = {"environment": environment(), "results": run_benchmarks(cases)}
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {path}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report["results"], baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ 처리량 회귀 {len(regressions)}건:")
+            for key, current, base, ratio in regressions:
+                print(f"  - {key}: {base:,.0f} → {current:,.0f}건/s ({ratio - 1:+.1%})")
+            sys.exit(1)
+        print("\n✅ 처리량 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
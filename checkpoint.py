@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+생성 체크포인트 / 이어서 생성 / 기간 추가
+긴 생성 작업의 상태(난수 상태, 사용자 모집단, 유저 진행도, 세션 저장소, 로그 타입별 진행 건수,
+출력 파일 위치)를 주기적으로 바이너리 파일 하나에 저장합니다.
+- --resume: 중단된 작업을 마지막 체크포인트부터 이어서 생성 (중단 없이 생성한 결과와 같은 레코드)
+- --append: 끝난 작업에 같은 유저/진행도로 다음 기간(scenario.PERIOD_DAYS일)의 로그를 기존 파일 뒤에 추가
+
+파일 형식: MAGIC(8바이트) | 메타 JSON 길이(uint32 LE) | 메타 JSON | 섹션 원시 바이트 (메타 sections 순서)
+"""
+
+import json
+import os
+import struct
+import time
+from array import array
+from datetime import datetime
+
+from faker.generator import random as faker_shared_random
+
+MAGIC = b"GLCKPT01"
+
+# 체크포인트에 저장하지 않는 실행 옵션 (체크포인트 파일 자체와 실행 리포트를 다루는 옵션)
+RUN_OPTIONS = {
+    "checkpoint",
+    "checkpoint_interval",
+    "resume",
+    "append",
+    "report",
+    "trace_memory",
+    "profile_interval",
+}
+
+
+def _faker_randoms(fake):
+    """Faker가 쓰는 random.Random 목록 (locale 선택용 공용 인스턴스 + locale별, 순서 고정)"""
+    randoms = [faker_shared_random] + [factory.random for factory in fake.factories]
+    return list({id(rng): rng for rng in randoms}.values())
+
+
+def _rng_state(rng):
+    """random.Random(또는 random 모듈) 상태 -> (내부 상태 uint32 array, [version, gauss_next])"""
+    version, internal, gauss_next = rng.getstate()
+    return array("I", internal), [version, gauss_next]
+
+
+def _set_rng_state(rng, raw, extra):
+    rng.setstate((extra[0], tuple(array("I", raw)), extra[1]))
+
+
+def save_checkpoint(path, generator, meta, engine=None):
+    """생성기 상태와 meta(설정, 진행 건수, 출력 위치)를 path에 원자적으로 저장"""
+    population = generator.population
+    sections = []
+    rng_internal, rng_extra = _rng_state(generator.rng)
+    sections.append(("rng", rng_internal))
+    faker_extra = []
+    for i, rng in enumerate(_faker_randoms(generator.fake)):
+        internal, extra = _rng_state(rng)
+        sections.append((f"faker.{i}", internal))
+        faker_extra.append(extra)
+    sections += [
+        ("population.success_flags", population.success_flags),
+        ("population.successful_pool", population.successful_pool),
+        ("population.unsuccessful_pool", population.unsuccessful_pool),
+        ("user_progress", generator.user_progress),
+    ]
+    sessions = generator.sessions
+    for name, _ in sessions.COLUMNS:
+        sections.append((f"sessions.{name}", getattr(sessions, name).view()))
+
+    views = [(name, memoryview(data).cast("B")) for name, data in sections]
+    meta = dict(
+        meta,
+        saved_at=datetime.now().isoformat(timespec="seconds"),
+        start_date=generator.start_date.isoformat(),
+        first_day=generator.first_day,
+        scenario=generator.scenario.spec,
+        rng=rng_extra,
+        faker=faker_extra,
+        salt=population._salt.hex(),
+        numpy_rng=engine.rng.bit_generator.state if engine is not None else None,
+        sections=[[name, len(view)] for name, view in views],
+    )
+    header = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+
+    # 쓰는 도중 중단돼도 이전 체크포인트가 남도록 임시 파일에 쓴 뒤 교체
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        for _, view in views:
+            f.write(view)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class Checkpoint:
+    """읽어 들인 체크포인트 (meta dict + 섹션 이름별 원시 바이트)"""
+
+    def __init__(self, meta, sections):
+        self.meta = meta
+        self.sections = sections
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"체크포인트 파일이 아닙니다: {path}")
+            (length,) = struct.unpack("<I", f.read(4))
+            meta = json.loads(f.read(length).decode("utf-8"))
+            sections = {}
+            for name, size in meta["sections"]:
+                sections[name] = f.read(size)
+                if len(sections[name]) != size:
+                    raise ValueError(f"체크포인트 파일이 잘려 있습니다: {path} ({name})")
+        return cls(meta, sections)
+
+    @property
+    def settings(self):
+        """저장된 생성 옵션 dict (start_date는 datetime)"""
+        settings = dict(self.meta["settings"])
+        settings["start_date"] = datetime.fromisoformat(self.meta["start_date"])
+        return settings
+
+    def is_complete(self):
+        """모든 로그 타입이 요청 건수까지 생성되었는지"""
+        count = self.meta["settings"]["count"]
+        return all(done >= count for done in self.meta["progress"].values()) and len(
+            self.meta["progress"]
+        ) == len(self.meta["log_types"])
+
+    def restore(self, generator, sessions=True):
+        """generator(같은 설정으로 새로 만든 GameLogGenerator)에 저장된 상태를 덮어씀
+
+        sessions=False면 세션 저장소는 비운 채로 둡니다 (--append: 새 기간은 새 세션만 참조).
+        """
+        sections = self.sections
+        _set_rng_state(generator.rng, sections["rng"], self.meta["rng"])
+        for i, rng in enumerate(_faker_randoms(generator.fake)):
+            _set_rng_state(rng, sections[f"faker.{i}"], self.meta["faker"][i])
+
+        population = generator.population
+        if len(sections["population.success_flags"]) != population.user_count:
+            raise ValueError("체크포인트의 사용자 수가 현재 설정과 다릅니다.")
+        population._salt = bytes.fromhex(self.meta["salt"])
+        population._index_by_id = None
+        population.success_flags[:] = sections["population.success_flags"]
+        population.successful_pool = array("i", sections["population.successful_pool"])
+        population.unsuccessful_pool = array("i", sections["population.unsuccessful_pool"])
+        generator.user_progress[:] = sections["user_progress"]
+        generator.first_day = self.meta["first_day"]
+
+        if sessions:
+            store = generator.sessions
+            store.extend_bytes(
+                *(sections[f"sessions.{name}"] for name, _ in store.COLUMNS)
+            )
+
+    def restore_engine(self, engine):
+        """numpy 배치 엔진의 난수 상태 복원"""
+        if self.meta["numpy_rng"] is not None:
+            engine.rng.bit_generator.state = self.meta["numpy_rng"]
+
+
+class Checkpointer:
+    """로그 타입별 진행 건수와 출력 파일 위치를 추적하고 interval초마다 체크포인트를 갱신
+
+    생성은 청크 단위로 진행되며, 청크가 sink에 넘어간 직후(다음 청크를 생성하기 전)에만 저장하므로
+    저장된 난수 상태는 항상 '기록된 청크 수'와 맞습니다.
+    """
+
+    def __init__(
+        self,
+        path,
+        generator,
+        settings,
+        log_types,
+        engine=None,
+        interval=60.0,
+        progress=None,
+        outputs=None,
+    ):
+        self.path = path
+        self.generator = generator
+        self.engine = engine
+        self.settings = {
+            key: value for key, value in settings.items() if key not in RUN_OPTIONS
+        }
+        self.settings.pop("start_date", None)
+        self.log_types = log_types
+        self.interval = interval
+        # 로그 타입 -> 생성을 마친 반복 수, 출력 파일 이름 -> sink.checkpoint() 결과
+        self.progress = dict(progress or {})
+        self.outputs = {name: tuple(value) for name, value in (outputs or {}).items()}
+        self.saves = 0
+        self._log_name = None
+        self._pending = 0
+        self._last_save = time.monotonic()
+
+    def done(self, log_name):
+        return self.progress.get(log_name, 0)
+
+    def resume_of(self, filename):
+        """filename 출력을 이어 쓸 sink resume 값 (처음 쓰는 파일이면 None)"""
+        return self.outputs.get(filename)
+
+    def chunks(self, source, method, log_name, count, chunk_size):
+        """이미 생성한 반복 수 이후부터 iter_log_chunks와 같은 크기로 청크를 나눠 생성"""
+        self._log_name = log_name
+        generate = getattr(source, method)
+        metrics = self.generator.instrumentation
+        done = self.done(log_name)
+        while done < count:
+            size = min(chunk_size, count - done)
+            self._pending = size
+            yield metrics.generated(generate, size)
+            done += size
+
+    def chunk_written(self, sinks):
+        """청크를 sink에 넘긴 직후 호출 - sinks는 {출력 파일 이름: sink}"""
+        self.progress[self._log_name] = self.done(self._log_name) + self._pending
+        self._pending = 0
+        if time.monotonic() - self._last_save >= self.interval:
+            self.sync(sinks)
+            self.save()
+
+    def sync(self, sinks):
+        """sink 내용을 디스크에 내리고 이어 쓸 위치 기록"""
+        for filename, sink in sinks.items():
+            self.outputs[filename] = sink.checkpoint()
+
+    def step_done(self, log_name, count):
+        """로그 타입 하나의 출력을 닫은 뒤 호출"""
+        self.progress[log_name] = count
+        self.save()
+
+    def save(self):
+        meta = {
+            "settings": self.settings,
+            "log_types": self.log_types,
+            "progress": self.progress,
+            "outputs": self.outputs,
+        }
+        save_checkpoint(self.path, self.generator, meta, self.engine)
+        self.saves += 1
+        self._last_save = time.monotonic()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+파싱한 로그 테이블의 바이너리 컬럼 캐시
+로그 파일을 처음 읽을 때 압축 테이블(log_tables)을 타입이 있는 NumPy 배열과 사전으로 바꿔
+데이터 옆 .column_cache/<파일 이름>.cols 에 저장하고, 다음부터는 JSON/CSV 파싱 없이 mmap으로 읽습니다.
+
+캐시 키는 원본 경로, 크기, 수정 시각(mtime_ns), 내용 해시(blake2b)입니다.
+경로/크기/수정 시각이 같으면 바로 캐시를 쓰고, 다르면 내용 해시를 비교해 같을 때만 키를 갱신해 재사용합니다.
+원본 내용이 바뀌었으면 None을 반환하므로 호출 쪽이 다시 파싱해 캐시를 새로 씁니다.
+
+파일 구조: MAGIC(8바이트) + 헤더 길이(8바이트) + JSON 헤더(여유 공간 포함) + 64바이트 정렬 배열들
+  - 일반 컬럼(숫자/bool/datetime64): 배열 그대로
+  - 범주형 컬럼: 코드 배열 + 범주(utf-8 고정 폭 바이트 배열)
+  - ID 컬럼: 파일 안에서만 쓰는 코드 배열 + 코드 -> ID 바이트 배열 (읽을 때 공용 사전 코드로 바꿈)
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+import pandas as pd
+
+from compressed_io import resolve_input
+
+CACHE_DIR = ".column_cache"
+MAGIC = b"GLCOLS1\n"
+VERSION = 1
+_ALIGN = 64
+_HEADER_RESERVE = 256  # 캐시 키를 제자리에서 갱신할 수 있도록 헤더 뒤에 남기는 공간
+_HASH_BLOCK = 1024 * 1024
+
+
+def cache_path(source):
+    """원본 로그 경로 -> 캐시 파일 경로"""
+    directory, name = os.path.split(os.path.abspath(source))
+    return os.path.join(directory, CACHE_DIR, name + ".cols")
+
+
+def file_hash(path):
+    """파일 내용 blake2b 해시 (hex)"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_key(source):
+    stat = os.stat(source)
+    return {"path": os.path.abspath(source), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def read(path):
+    """path 로그의 캐시 -> (테이블, ID 컬럼 -> 코드 순서 ID 바이트 배열), 없거나 낡았으면 None
+
+    배열은 캐시 파일을 mmap한 읽기 전용 배열입니다.
+    """
+    source = resolve_input(path)
+    if source is None:
+        return None
+    cache = cache_path(source)
+    try:
+        with open(cache, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    header = _read_header(buffer)
+    if header is None:
+        return None
+    key = _source_key(source)
+    if any(header["source"][name] != value for name, value in key.items()):
+        # 경로/크기/수정 시각이 달라짐 -> 내용이 같으면 키만 갱신해 재사용
+        if header["source"]["hash"] != file_hash(source):
+            return None
+        header["source"].update(key)
+        if not _rewrite_header(cache, header):
+            return None
+
+    def array(entry):
+        dtype = np.dtype(entry["dtype"])
+        if not entry["count"]:
+            return np.zeros(0, dtype)
+        return np.frombuffer(buffer, dtype, entry["count"], entry["offset"])
+
+    data = {}
+    for column in header["columns"]:
+        values = array(column)
+        if column["kind"] == "category":
+            categories = [value.decode("utf-8") for value in array(column["categories"]).tolist()]
+            values = pd.Categorical.from_codes(values, categories=categories)
+        data[column["name"]] = values
+    table = pd.DataFrame(data, copy=False)
+    ids = {name: array(entry) for name, entry in header["ids"].items()}
+    return table, ids
+
+
+def write(path, table, ids):
+    """테이블과 ID 값 배열을 캐시에 저장 - 저장할 수 없는 컬럼이 있거나 쓰기 실패 시 False"""
+    source = resolve_input(path)
+    if source is None:
+        return False
+    arrays = []  # 저장 순서대로의 배열
+    columns = []
+    for name in table.columns:
+        values = table[name]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            categories = np.array(
+                [category.encode("utf-8") for category in values.cat.categories], dtype="S"
+            )
+            column = {"name": name, "kind": "category"}
+            column.update(_entry(arrays, values.cat.codes.to_numpy()))
+            column["categories"] = _entry(arrays, categories)
+        elif isinstance(values.dtype, np.dtype) and values.dtype.kind in "biufM":
+            column = {"name": name, "kind": "array"}
+            column.update(_entry(arrays, values.to_numpy()))
+        else:
+            # 객체/시간대 있는 시각 등 배열로 저장할 수 없는 컬럼 -> 캐시하지 않음
+            return False
+        columns.append(column)
+    header = {
+        "version": VERSION,
+        "source": dict(_source_key(source), hash=file_hash(source)),
+        "rows": len(table),
+        "columns": columns,
+        "ids": {name: _entry(arrays, values) for name, values in ids.items()},
+    }
+    cache = cache_path(source)
+    temporary = f"{cache}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache), exist_ok=True)
+        with open(temporary, "wb") as f:
+            _write_file(f, header, arrays)
+        os.replace(temporary, cache)
+    except OSError:
+        # 읽기 전용 데이터 디렉토리 등 -> 캐시 없이 계속
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        return False
+    return True
+
+
+def _entry(arrays, values):
+    """배열을 저장 목록에 추가하고 헤더 항목(dtype, 개수, 저장 순서 - 오프셋은 기록할 때 채움) 반환"""
+    values = np.ascontiguousarray(values)
+    arrays.append(values)
+    return {"dtype": values.dtype.str, "count": len(values), "index": len(arrays) - 1}
+
+
+def _write_file(f, header, arrays):
+    entries = list(header["columns"])
+    entries += [column["categories"] for column in header["columns"] if "categories" in column]
+    entries += list(header["ids"].values())
+    # 헤더 길이를 먼저 정해야 오프셋을 알 수 있으므로 오프셋 자리를 최대값으로 잡아 크기를 잼
+    for entry in entries:
+        entry["offset"] = 2**62
+    reserved = len(_encode_header(header)) + _HEADER_RESERVE
+    position = _aligned(len(MAGIC) + 8 + reserved)
+    offsets = []
+    for values in arrays:
+        offsets.append(position)
+        position = _aligned(position + values.nbytes)
+    for entry in entries:
+        entry["offset"] = offsets[entry.pop("index")]
+    f.write(MAGIC + struct.pack("<Q", reserved) + _encode_header(header).ljust(reserved))
+    for offset, values in zip(offsets, arrays):
+        f.write(b"\0" * (offset - f.tell()))
+        f.write(values.tobytes())
+
+
+def _read_header(buffer):
+    if len(buffer) < len(MAGIC) + 8 or buffer[: len(MAGIC)] != MAGIC:
+        return None
+    (length,) = struct.unpack_from("<Q", buffer, len(MAGIC))
+    start = len(MAGIC) + 8
+    try:
+        header = json.loads(buffer[start : start + length])
+    except ValueError:
+        return None
+    return header if header.get("version") == VERSION else None
+
+
+def _rewrite_header(cache, header):
+    """캐시 키만 바뀐 헤더를 제자리에 다시 씀 (예약 공간을 넘으면 False)"""
+    encoded = _encode_header(header)
+    try:
+        with open(cache, "r+b") as f:
+            f.seek(len(MAGIC))
+            (reserved,) = struct.unpack("<Q", f.read(8))
+            if len(encoded) > reserved:
+                return False
+            f.write(encoded.ljust(reserved))
+    except OSError:
+        return False
+    return True
+
+
+def _encode_header(header):
+    return json.dumps(header, ensure_ascii=False).encode("utf-8")
+
+
+def _aligned(position):
+    return -(-position // _ALIGN) * _ALIGN
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+압축 로그 입출력
+gzip/bz2/lzma(표준 라이브러리)로 로그를 압축해 기록하고, 압축 여부와 관계없이 로그 파일을 읽습니다.
+출력은 고정 크기 블록으로 나눠 스레드 풀에서 블록마다 독립적으로 압축한 뒤 순서대로 이어 붙입니다.
+각 블록이 완결된 gzip 멤버(bz2/xz 스트림)이므로 zcat, xzcat 등 표준 도구로 그대로 읽을 수 있고,
+zlib/bz2/lzma는 압축 중 GIL을 해제하므로 스레드만으로 여러 코어를 사용합니다.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+COMPRESSIONS = ["none", "gzip", "bz2", "lzma"]
+
+EXTENSIONS = {"gzip": ".gz", "bz2": ".bz2", "lzma": ".xz"}
+
+_COMPRESSORS = {
+    # mtime=0: 같은 입력이면 같은 출력 (재현 가능한 생성 결과 유지)
+    "gzip": lambda data, level: gzip.compress(data, compresslevel=level, mtime=0),
+    "bz2": lambda data, level: bz2.compress(data, compresslevel=level),
+    "lzma": lambda data, level: lzma.compress(data, preset=level),
+}
+
+_DEFAULT_LEVELS = {"gzip": 6, "bz2": 9, "lzma": 6}
+
+# 파일 앞부분 magic bytes -> 압축 해제 open 함수
+_MAGIC = [
+    (b"\x1f\x8b", gzip.open),
+    (b"BZh", bz2.open),
+    (b"\xfd7zXZ\x00", lzma.open),
+]
+
+
+def output_path(filepath, compression):
+    """압축 형식에 맞는 확장자를 붙인 출력 경로"""
+    return filepath + EXTENSIONS.get(compression, "")
+
+
+class BlockCompressedWriter(io.BufferedIOBase):
+    """블록 단위 병렬 압축 바이너리 writer
+
+    write()로 받은 바이트를 block_size까지 모은 뒤 스레드 풀에 압축을 맡기고,
+    완료된 블록을 제출 순서대로 파일에 씁니다. 압축 중인 블록은 workers * 2개로 제한해
+    출력 크기와 관계없이 메모리 사용량이 일정합니다.
+    """
+
+    def __init__(
+        self,
+        filepath,
+        compression="gzip",
+        level=None,
+        block_size=4 * 1024 * 1024,
+        workers=None,
+        mode="w",
+    ):
+        if compression not in _COMPRESSORS:
+            raise ValueError(f"지원하지 않는 압축 형식: {compression}")
+        super().__init__()
+        self.filepath = filepath
+        self.compression = compression
+        self.level = _DEFAULT_LEVELS[compression] if level is None else level
+        self.block_size = block_size
+        self.workers = workers or os.cpu_count() or 1
+        self.raw_bytes = 0
+        self.compressed_bytes = 0
+        self.elapsed = 0.0
+
+        self._compress = _COMPRESSORS[compression]
+        self._file = open(filepath, mode + "b")
+        self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        self._pending = deque()
+        self._buffer = bytearray()
+        self._started = time.perf_counter()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._buffer += data
+        if len(self._buffer) >= self.block_size:
+            self._submit()
+        return len(data)
+
+    def _submit(self):
+        block = bytes(self._buffer)
+        self._buffer.clear()
+        self.raw_bytes += len(block)
+        self._pending.append(self._executor.submit(self._compress, block, self.level))
+        self._write_ready(limit=self.workers * 2)
+
+    def _write_ready(self, limit):
+        """완료된 앞쪽 블록과 limit를 넘는 블록을 순서대로 기록"""
+        pending = self._pending
+        while pending and (len(pending) > limit or pending[0].done()):
+            compressed = pending.popleft().result()
+            self._file.write(compressed)
+            self.compressed_bytes += len(compressed)
+
+    def flush(self):
+        # 아직 모자란 블록은 그대로 두고(작은 멤버 방지) 완료된 블록만 내보냄
+        if self._file.closed:
+            return
+        self._write_ready(limit=self.workers * 2)
+        self._file.flush()
+
+    def sync(self):
+        """모자란 블록까지 압축해 모두 디스크에 내리고 파일 끝 위치(바이트) 반환 - 체크포인트용
+
+        남은 버퍼는 짧은 멤버(스트림)로 끝나므로, 반환한 위치에서 잘라도 완결된 압축 파일입니다.
+        """
+        if self._buffer:
+            self._submit()
+        self._write_ready(limit=0)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def close(self):
+        if self.closed:
+            return
+        super().close()
+        if self._buffer:
+            self._submit()
+        self._write_ready(limit=0)
+        self._executor.shutdown()
+        self._file.close()
+        self.elapsed = time.perf_counter() - self._started
+
+    @property
+    def ratio(self):
+        """압축률 (원본 / 압축 크기)"""
+        return self.raw_bytes / self.compressed_bytes if self.compressed_bytes else 0.0
+
+    def summary(self):
+        """'원본 → 압축 크기, 압축률, 처리량' 요약 문자열 (close 이후 사용)"""
+        mb = 1024 * 1024
+        throughput = self.raw_bytes / mb / self.elapsed if self.elapsed else 0.0
+        return (
+            f"{self.compression} {self.raw_bytes / mb:.1f}MB → {self.compressed_bytes / mb:.1f}MB, "
+            f"압축률 {self.ratio:.1f}배, {throughput:.1f}MB/s"
+        )
+
+
+def open_output(filepath, compression=None, mode="w", newline=None, **options):
+    """텍스트 출력 파일 열기 - compression이 None/'none'이면 일반 파일
+
+    압축 시 반환되는 TextIOWrapper의 .buffer가 BlockCompressedWriter입니다.
+    """
+    if compression in (None, "none"):
+        return open(filepath, mode, encoding="utf-8", newline=newline)
+    raw = BlockCompressedWriter(filepath, compression, mode=mode, **options)
+    return io.TextIOWrapper(raw, encoding="utf-8", newline=newline)
+
+
+def sync_output(binary):
+    """바이너리 출력(일반 파일 또는 BlockCompressedWriter)을 디스크에 내리고 파일 끝 위치 반환"""
+    if isinstance(binary, BlockCompressedWriter):
+        return binary.sync()
+    binary.flush()
+    os.fsync(binary.fileno())
+    return binary.tell()
+
+
+def truncate_output(filepath, offset):
+    """체크포인트 이후 기록된 꼬리를 잘라 offset 위치부터 이어 쓸 수 있게 함"""
+    size = os.path.getsize(filepath)
+    if size < offset:
+        raise ValueError(f"{filepath} 크기({size})가 체크포인트 위치({offset})보다 작습니다.")
+    os.truncate(filepath, offset)
+
+
+def resolve_input(filepath):
+    """filepath 또는 압축 확장자를 붙인 경로 중 존재하는 첫 번째 (없으면 None)"""
+    for candidate in [filepath] + [filepath + ext for ext in EXTENSIONS.values()]:
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def _opener_of(path):
+    """압축 파일이면 압축 해제 open 함수, 아니면 None (magic bytes로 판별)"""
+    with open(path, "rb") as f:
+        head = f.read(6)
+    for magic, opener in _MAGIC:
+        if head.startswith(magic):
+            return opener
+    return None
+
+
+def is_compressed(filepath):
+    """filepath(또는 압축 확장자를 붙인 경로)가 gzip/bz2/xz 압축 파일인지"""
+    path = resolve_input(filepath)
+    if path is None:
+        raise FileNotFoundError(filepath)
+    return _opener_of(path) is not None
+
+
+def open_input(filepath, newline=None, binary=False):
+    """로그 파일을 텍스트 모드(binary=True면 바이너리 모드)로 열기 - 압축 여부는 magic bytes로 판별
+
+    filepath가 없고 filepath.gz/.bz2/.xz가 있으면 그 파일을 엽니다.
+    """
+    path = resolve_input(filepath)
+    if path is None:
+        raise FileNotFoundError(filepath)
+    opener = _opener_of(path)
+    if opener is not None:
+        if binary:
+            return opener(path, "rb")
+        return opener(path, "rt", encoding="utf-8", newline=newline)
+    if binary:
+        return open(path, "rb")
+    return open(path, "r", encoding="utf-8", newline=newline)
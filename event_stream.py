@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+전역 시간순 통합 이벤트 스트림
+다섯 가지 로그 타입을 각각 timestamp 기준으로 정렬된 run으로 만든 뒤 k-way 힙 병합으로
+전체를 시간 순서대로 내보냅니다. 메모리에 두기 어려운 run은 디스크로 내려쓰므로
+1억 건 이상도 전체를 메모리에 올리지 않고 생성할 수 있습니다.
+"""
+
+import heapq
+import json
+import os
+import shutil
+import tempfile
+from operator import itemgetter
+
+from log_types import LOG_TYPES, iter_log_chunks
+
+_by_timestamp = itemgetter(0)
+
+
+class TimeOrderedMerger:
+    """정렬된 run을 모아 timestamp 순으로 병합
+
+    run의 원소는 (timestamp, log_name, compact JSON 문자열) 튜플입니다.
+    메모리에 보관 중인 레코드가 memory_records를 넘으면 이후 run은 spill_dir에 파일로 씁니다.
+    열린 run 파일이 max_open_runs를 넘으면 먼저 일부를 하나의 run으로 병합해 파일 수를 줄입니다.
+    """
+
+    def __init__(self, run_size=1000000, memory_records=2000000, spill_dir=None, max_open_runs=128):
+        self.run_size = run_size
+        self.memory_records = memory_records
+        self.max_open_runs = max_open_runs
+        self._spill_dir = tempfile.mkdtemp(prefix="game-log-runs-", dir=spill_dir)
+        self._memory_runs = []
+        self._memory_count = 0
+        self._file_runs = []
+        self.spilled_runs = 0
+
+    def add_records(self, log_name, records):
+        """레코드 iterable을 run_size 단위 run으로 잘라 정렬 후 보관"""
+        run = []
+        for record in records:
+            line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+            # epoch_ms 형식도 디스크 run과 같은 문자열 키로 비교 (13자리라 사전순 = 시간순)
+            run.append((str(record["timestamp"]), log_name, line))
+            if len(run) >= self.run_size:
+                self._add_run(run)
+                run = []
+        if run:
+            self._add_run(run)
+
+    def _add_run(self, run):
+        run.sort(key=_by_timestamp)
+        if self._memory_count + len(run) <= self.memory_records:
+            self._memory_runs.append(run)
+            self._memory_count += len(run)
+            return
+        self._file_runs.append(self._write_run(run))
+        if len(self._file_runs) > self.max_open_runs:
+            self._compact_file_runs()
+
+    def _write_run(self, events):
+        fd, path = tempfile.mkstemp(suffix=".run", dir=self._spill_dir)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for timestamp, log_name, line in events:
+                f.write(f"{timestamp}\t{log_name}\t{line}\n")
+        self.spilled_runs += 1
+        return path
+
+    def _compact_file_runs(self):
+        """가장 오래된 run 파일 절반을 하나의 run 파일로 병합"""
+        half = len(self._file_runs) // 2
+        paths, self._file_runs = self._file_runs[:half], self._file_runs[half:]
+        merged = self._write_run(heapq.merge(*map(_read_run, paths), key=_by_timestamp))
+        for path in paths:
+            os.remove(path)
+        self._file_runs.insert(0, merged)
+
+    def __iter__(self):
+        """(timestamp, log_name, line)를 전역 timestamp 순서로 반환"""
+        runs = [iter(run) for run in self._memory_runs]
+        runs += [_read_run(path) for path in self._file_runs]
+        return heapq.merge(*runs, key=_by_timestamp)
+
+    def records(self):
+        """(log_name, record dict)를 시간 순서로 반환"""
+        for _, log_name, line in self:
+            yield log_name, json.loads(line)
+
+    def cleanup(self):
+        shutil.rmtree(self._spill_dir, ignore_errors=True)
+        self._memory_runs = []
+        self._file_runs = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cleanup()
+
+
+def _read_run(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for row in f:
+            timestamp, log_name, line = row.rstrip("\n").split("\t", 2)
+            yield timestamp, log_name, line
+
+
+def generate_runs(source, count, merger, chunk_size=100000):
+    """source(GameLogGenerator 또는 NumpyBatchEngine)로 타입별 count건을 chunk 단위로 생성해 merger에 추가
+
+    세션을 모두 만든 뒤 나머지 타입을 생성하므로 모든 이벤트는 전체 세션 풀에서 샘플링됩니다.
+    """
+    totals = {}
+    for log_name, method in LOG_TYPES:
+        total = 0
+        for records in iter_log_chunks(source, method, count, chunk_size):
+            total += len(records)
+            merger.add_records(log_name, records)
+        totals[log_name] = total
+    return totals
+
+
+def write_unified(merger, filepath, flush_bytes=1024 * 1024):
+    """병합 스트림을 log_type 필드가 앞에 붙은 NDJSON 한 파일로 기록"""
+    written = 0
+    buffer = []
+    buffered = 0
+    with open(filepath, "w", encoding="utf-8") as f:
+        for _, log_name, line in merger:
+            # 직렬화된 JSON 앞부분에 log_type을 끼워 넣어 다시 파싱하지 않음
+            row = f'{{"log_type":"{log_name}",{line[1:]}\n'
+            buffer.append(row)
+            buffered += len(row)
+            written += 1
+            if buffered >= flush_bytes:
+                f.write("".join(buffer))
+                buffer = []
+                buffered = 0
+        f.write("".join(buffer))
+    return written
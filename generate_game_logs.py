@@ -4,14 +4,26 @@
 초기 유입 후 시간이 지날수록 감소, 특정 스테이지에서 이탈하는 패턴 구현
 """
 
+import argparse
 import json
 import csv
 import random
 import uuid
+from array import array
 from datetime import datetime, timedelta
 from faker import Faker
 import os
 
+import instrumentation
+from compressed_io import COMPRESSIONS, output_path
+from log_sinks import CSV_SCHEMAS, SINKS, AsyncSink, FanOutSink, open_sink
+from log_types import LOG_TYPES, iter_log_chunks
+from scenario import PERIOD_DAYS, AliasTable, Scenario
+from session_store import SessionStore, to_epoch, to_utc, utc_now
+from timestamp_format import TIME_FORMATS, TimestampFormatter
+from user_population import UserPopulation
+from value_pools import DEFAULT_CACHE_DIR, FakerValues, ValuePools
+
 fake = Faker(["ko_KR", "en_US"])
 Faker.seed(42)
 random.seed(42)
@@ -21,370 +33,963 @@ os.makedirs(log_dir, exist_ok=True)
 
 
 class GameLogGenerator:
-    def __init__(self):
-        self.user_ids = [str(uuid.uuid4()) for _ in range(1000)]
+    def __init__(
+        self,
+        user_count=1000,
+        seed=None,
+        start_date=None,
+        session_dir=None,
+        time_format="iso",
+        scenario=None,
+        exact_counts=False,
+    ):
+        # seed가 없으면 모듈 전역 random/fake(seed 42)를 사용하고,
+        # seed가 있으면 인스턴스 전용 Random/Faker를 만들어 다른 인스턴스와 독립적으로 재현 가능
+        if seed is None:
+            self.rng = random
+            self.fake = fake
+        else:
+            self.rng = random.Random(seed)
+            self.fake = Faker(["ko_KR", "en_US"])
+            self.fake.seed_instance(seed)
+        # IP/국가 코드/스택 트레이스 공급자 (기본: 매번 Faker 호출, use_value_pools로 교체)
+        self.values = FakerValues(self.fake)
+        # 세션 시각은 epoch 초로 저장하므로 시작 시각도 초 단위로 맞춤 (UTC, naive 입력은 UTC로 간주)
+        start_date = to_utc(start_date) if start_date else utc_now() - timedelta(days=30)
+        self.start_date = start_date.replace(microsecond=0)
+        # 세션 경과일의 시작값 (start_date 기준, --append로 이어 붙인 기간은 PERIOD_DAYS씩 증가)
+        self.first_day = 0
+        self.time_formatter = TimestampFormatter(time_format)
+        self.population = UserPopulation(user_count, rng=self.rng)
+        self.user_ids = self.population.user_ids
         self.item_ids = [f"item_{i:04d}" for i in range(1, 501)]
         self.special_weapon = "weapon_legendary_001"  # 클리어 핵심 아이템
         self.quest_ids = [f"quest_{i:03d}" for i in range(1, 101)]
         self.skill_ids = [f"skill_{i:03d}" for i in range(1, 51)]
-        self.regions = ["forest", "desert", "mountain", "city", "dungeon", "castle"]
-        self.devices = ["iPhone", "Android", "iPad", "PC"]
-        self.os_versions = [
-            "iOS 17.0",
-            "Android 13",
-            "iOS 16.5",
-            "Windows 11",
-            "Android 12",
-        ]
-        self.app_versions = ["1.0.0", "1.0.1", "1.1.0", "1.1.1", "1.2.0"]
-        self.sessions = []
-        self.user_progress = {}
-        self.successful_users = set()
+        # 디바이스/지역/결제 수단 등 범주형 분포 (alias 테이블로 컴파일된 시나리오)
+        self.scenario = scenario or Scenario()
+        # True면 세션/결제 로그를 버리는 반복 없이 요청한 건수만큼 정확히 생성
+        self.exact_counts = exact_counts
+        # 세션 저장소 (session_dir 지정 시 memory-mapped 파일 사용)
+        self.sessions = SessionStore(session_dir)
+        # 사용자 인덱스별 최대 도달 스테이지 (0: 아직 미정)
+        self.user_progress = bytearray(user_count)
+        self.output_dir = log_dir
+        # 출력 압축 형식 (None, gzip, bz2, lzma)과 블록 압축 스레드 수
+        self.compression = None
+        self.compress_workers = None
+        # 비동기 기록 큐 크기 (None: 생성 스레드에서 바로 기록, 2: writer 스레드 이중 버퍼)
+        self.write_queue = None
+        # 단계별 타이머/카운터 (기본: 꺼짐, use_instrumentation으로 교체)
+        self.instrumentation = instrumentation.DISABLED
+
+    def use_value_pools(self, pools):
+        """Faker 대신 미리 생성한 값 풀(ValuePools) 사용"""
+        self.values = pools
+
+    def use_instrumentation(self, metrics):
+        """계측 사용 - 값 공급자(Faker/값 풀) 호출 시간과 sink 기록 시간, 출력 바이트 수를 metrics에 더함"""
+        self.instrumentation = metrics
+        if metrics.enabled:
+            kind = "faker" if isinstance(self.values, FakerValues) else "value_pool"
+            self.values = instrumentation.TimedValues(self.values, metrics, kind)
+
+    def _new_uuid(self):
+        """rng 기반 UUID4 - seed가 같으면 같은 ID가 생성됨"""
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def accepted_session_table(self):
+        """(성공 유저 여부, 경과일) -> 기본 모드에서 채택되는 비율의 alias 테이블
+
+        기본 모드는 성공 유저(30%)를 항상 채택하고 실패 유저는 경과일 retention만큼만 채택하므로,
+        이 테이블에서 바로 뽑으면 버리는 반복 없이 채택된 세션과 같은 분포를 얻습니다.
+        """
+        cells, weights = [], []
+        for days_passed in range(self.first_day, self.first_day + PERIOD_DAYS):
+            retention_rate = max(0.2, 1.0 - (days_passed * 0.027))
+            cells += [(True, days_passed), (False, days_passed)]
+            weights += [0.3, 0.7 * retention_rate]
+        return AliasTable(cells, weights)
+
+    def payer_sessions(self):
+        """정확한 건수 모드용 (성공 유저 세션 인덱스, 그 외 세션 인덱스, 성공 유저 결제 비중)
+
+        결제 확률(성공 유저 0.3, 그 외 0.05)을 세션 수로 가중해 결제가 어느 쪽에서 나올지 정합니다.
+        """
+        flags = self.population.success_flags
+        successful, others = array("i"), array("i")
+        for session_index, user_index in enumerate(self.sessions.user_index.view()):
+            (successful if flags[user_index] else others).append(session_index)
+        successful_weight = len(successful) * 0.3
+        total = successful_weight + len(others) * 0.05
+        return successful, others, successful_weight / total if total else 0.0
+
+    @property
+    def successful_users(self):
+        """성공 유저(30%) ID 집합"""
+        return self.population.successful_user_ids
 
     def generate_session_logs(self, count=10000):
         """세션 로그 생성 - 시간이 지날수록 유저 수 감소"""
+        rng = self.rng
+        fmt = self.time_formatter.format
+        add_epoch_ms = self.time_formatter.add_epoch_ms
         logs = []
+        population = self.population
+        values = self.values
+        scenario = self.scenario
+        device, os_version, app_version = (
+            scenario["device"],
+            scenario["os_version"],
+            scenario["app_version"],
+        )
+        sessions = self.sessions
+        start = to_epoch(self.start_date)
+        first_day = self.first_day
+        accepted = self.accepted_session_table() if self.exact_counts else None
 
-        # 30%의 성공 유저 선정
-        success_count = int(len(self.user_ids) * 0.3)
-        self.successful_users = set(random.sample(self.user_ids, success_count))
-
-        start_date = datetime.now() - timedelta(days=30)
         for i in range(count):
-            days_passed = random.randint(0, 30)
-            retention_rate = max(0.2, 1.0 - (days_passed * 0.027))
-
-            if random.random() < 0.3:
-                user_id = random.choice(list(self.successful_users))
-                retention_rate = max(0.7, retention_rate + 0.5)
+            if accepted:
+                # 채택될 (성공 여부, 경과일)을 직접 뽑으므로 건너뛰는 반복이 없음
+                pick_successful, days_passed = accepted.draw(rng)
+                if pick_successful:
+                    user_index = population.pick_successful(rng)
+                else:
+                    user_index = population.pick_unsuccessful(rng)
             else:
-                if random.random() > retention_rate:
-                    continue
-                user_id = random.choice(
-                    [u for u in self.user_ids if u not in self.successful_users]
-                )
-
-            login_time = start_date + timedelta(
-                days=days_passed,
-                hours=random.randint(0, 23),
-                minutes=random.randint(0, 59),
+                days_passed = rng.randint(first_day, first_day + PERIOD_DAYS - 1)
+                retention_rate = max(0.2, 1.0 - (days_passed * 0.027))
+
+                # 성공/실패 유저 풀에서 O(1)로 선택
+                if rng.random() < 0.3:
+                    user_index = population.pick_successful(rng)
+                    retention_rate = max(0.7, retention_rate + 0.5)
+                else:
+                    if rng.random() > retention_rate:
+                        continue
+                    user_index = population.pick_unsuccessful(rng)
+            user_id = population.user_id(user_index)
+
+            login = (
+                start
+                + days_passed * 86400
+                + rng.randint(0, 23) * 3600
+                + rng.randint(0, 59) * 60
             )
 
-            if user_id in self.successful_users:
-                session_duration = random.randint(1800, 10800)
+            if population.is_successful(user_index):
+                session_duration = rng.randint(1800, 10800)
             else:
-                session_duration = random.randint(300, 3600)
+                session_duration = rng.randint(300, 3600)
 
-            logout_time = login_time + timedelta(seconds=session_duration)
-            session_id = str(uuid.uuid4())
+            logout = login + session_duration
+            session_uuid = uuid.UUID(int=rng.getrandbits(128), version=4)
+            login_time = fmt(login)
 
             log = {
-                "log_id": str(uuid.uuid4()),
+                "log_id": self._new_uuid(),
                 "user_id": user_id,
-                "session_id": session_id,
-                "login_time": login_time.isoformat(),
-                "logout_time": logout_time.isoformat(),
+                "session_id": str(session_uuid),
+                "login_time": login_time,
+                "logout_time": fmt(logout),
                 "session_duration_seconds": session_duration,
-                "device": random.choice(self.devices),
-                "os_version": random.choice(self.os_versions),
-                "app_version": random.choice(self.app_versions),
-                "ip_address": fake.ipv4(),
-                "country": fake.country_code(),
-                "timestamp": login_time.isoformat(),
+                "device": device.draw(rng),
+                "os_version": os_version.draw(rng),
+                "app_version": app_version.draw(rng),
+                "ip_address": values.ip_for(user_index, rng),
+                "country": values.country_for(user_index, rng),
+                "timestamp": login_time,
             }
+            if add_epoch_ms:
+                log["epoch_ms"] = login * 1000
             logs.append(log)
 
-            self.sessions.append(
-                {
-                    "user_id": user_id,
-                    "session_id": session_id,
-                    "login_time": login_time,
-                    "logout_time": logout_time,
-                }
-            )
+            sessions.append(user_index, login, logout, session_uuid.int)
         return logs
 
     def generate_ingame_action_logs(self, count=10000):
         """인게임 액션 로그 생성 - 스테이지별 진행도 반영"""
-        if not self.sessions:
+        rng = self.rng
+        fmt = self.time_formatter.format
+        add_epoch_ms = self.time_formatter.add_epoch_ms
+        sessions = self.sessions
+        if not sessions:
             print("세션 로그를 먼저 생성해주세요.")
             return []
 
         logs = []
-        stages = [f"stage_{i:02d}" for i in range(1, 11)]
+        max_stage_dist = self.scenario["max_stage"]
+        stage_actions = self.scenario.stage_actions
+        region = self.scenario["region"]
 
         for i in range(count):
-            session = random.choice(self.sessions)
-            user_id = session["user_id"]
+            user_index, session_start, session_end, session_id = sessions.get(
+                rng.randrange(len(sessions))
+            )
+            user_id = self.population.user_id(user_index)
 
-            if user_id not in self.user_progress:
-                if user_id in self.successful_users:
+            if not self.user_progress[user_index]:
+                if self.population.is_successful(user_index):
                     max_stage = 10
                 else:
-                    max_stage = random.choices([5, 6, 7], weights=[30, 50, 20])[0]
-                self.user_progress[user_id] = max_stage
+                    max_stage = max_stage_dist.draw(rng)
+                self.user_progress[user_index] = max_stage
 
-            current_stage = random.randint(1, self.user_progress[user_id])
+            current_stage = rng.randint(1, self.user_progress[user_index])
             stage_name = f"stage_{current_stage:02d}"
 
-            if current_stage <= 5:
-                action_types = ["move", "attack", "collect", "jump"]
-            elif current_stage <= 7:
-                action_types = ["move", "attack", "defend", "special_attack"]
-            else:
-                action_types = [
-                    "move",
-                    "attack",
-                    "defend",
-                    "special_attack",
-                    "ultimate",
-                ]
-
-            session_start = session["login_time"]
-            session_end = session["logout_time"]
-            action_time = session_start + timedelta(
-                seconds=random.randint(
-                    0, int((session_end - session_start).total_seconds())
-                )
-            )
+            action_time = session_start + rng.randint(0, session_end - session_start)
 
             log = {
-                "log_id": str(uuid.uuid4()),
+                "log_id": self._new_uuid(),
                 "user_id": user_id,
-                "session_id": session["session_id"],
-                "timestamp": action_time.isoformat(),
-                "action_type": random.choice(action_types),
+                "session_id": session_id,
+                "timestamp": fmt(action_time),
+                "action_type": stage_actions[current_stage].draw(rng),
                 "stage": stage_name,
-                "region": random.choice(self.regions),
-                "quest_id": random.choice(self.quest_ids),
-                "skill_used": random.choice(self.skill_ids),
-                "experience_gained": random.randint(10, 100),
-                "level": min(current_stage * 5 + random.randint(1, 10), 50),
+                "region": region.draw(rng),
+                "quest_id": rng.choice(self.quest_ids),
+                "skill_used": rng.choice(self.skill_ids),
+                "experience_gained": rng.randint(10, 100),
+                "level": min(current_stage * 5 + rng.randint(1, 10), 50),
             }
+            if add_epoch_ms:
+                log["epoch_ms"] = action_time * 1000
             logs.append(log)
 
         return logs
 
     def generate_item_logs(self, count=10000):
         """아이템 로그 생성 - 특별 무기 구매 패턴 반영"""
-        if not self.sessions:
+        rng = self.rng
+        fmt = self.time_formatter.format
+        add_epoch_ms = self.time_formatter.add_epoch_ms
+        sessions = self.sessions
+        if not sessions:
             print("세션 로그를 먼저 생성해주세요.")
             return []
 
         logs = []
-        action_types = ["acquire", "use", "sell", "buy", "trade", "enhance"]
+        item_action = self.scenario["item_action"]
+        item_rarity = self.scenario["item_rarity"]
 
         for i in range(count):
-            session = random.choice(self.sessions)
-            user_id = session["user_id"]
-
-            session_start = session["login_time"]
-            session_end = session["logout_time"]
-            timestamp = session_start + timedelta(
-                seconds=random.randint(
-                    0, int((session_end - session_start).total_seconds())
-                )
+            user_index, session_start, session_end, session_id = sessions.get(
+                rng.randrange(len(sessions))
             )
+            user_id = self.population.user_id(user_index)
+
+            timestamp = session_start + rng.randint(0, session_end - session_start)
 
             # 성공 유저는 특별 무기 구매 확률 높음
-            if user_id in self.successful_users and random.random() < 0.1:
+            is_successful = self.population.is_successful(user_index)
+            if is_successful and rng.random() < 0.1:
                 item_id = self.special_weapon
                 action_type = "buy"
                 price = 9900  # 고가 아이템
             else:
-                item_id = random.choice(self.item_ids)
-                action_type = random.choice(action_types)
-                price = random.randint(100, 5000)
+                item_id = rng.choice(self.item_ids)
+                action_type = item_action.draw(rng)
+                price = rng.randint(100, 5000)
 
             log = {
-                "log_id": str(uuid.uuid4()),
+                "log_id": self._new_uuid(),
                 "user_id": user_id,
-                "session_id": session["session_id"],
-                "timestamp": timestamp.isoformat(),
+                "session_id": session_id,
+                "timestamp": fmt(timestamp),
                 "action_type": action_type,
                 "item_id": item_id,
                 "item_name": f"아이템_{item_id.split('_')[-1]}",
-                "quantity": random.randint(1, 5),
+                "quantity": rng.randint(1, 5),
                 "price": price,
                 "currency": "gold",
-                "item_level": random.randint(1, 20),
+                "item_level": rng.randint(1, 20),
                 "rarity": (
                     "legendary"
                     if item_id == self.special_weapon
-                    else random.choice(["common", "rare", "epic"])
+                    else item_rarity.draw(rng)
                 ),
             }
+            if add_epoch_ms:
+                log["epoch_ms"] = timestamp * 1000
             logs.append(log)
 
         return logs
 
     def generate_payment_logs(self, count=10000):
         """결제 로그 생성 - 성공 유저의 결제 패턴"""
-        if not self.sessions:
+        rng = self.rng
+        fmt = self.time_formatter.format
+        add_epoch_ms = self.time_formatter.add_epoch_ms
+        sessions = self.sessions
+        if not sessions:
             print("세션 로그를 먼저 생성해주세요.")
             return []
 
         logs = []
+        scenario = self.scenario
+        payment_method = scenario["payment_method"]
+        payment_status = scenario["payment_status"]
+        exact = self.exact_counts
+        if exact:
+            successful_sessions, other_sessions, successful_share = self.payer_sessions()
 
         for i in range(count):
-            session = random.choice(self.sessions)
-            user_id = session["user_id"]
-
-            # 성공 유저가 결제할 확률이 훨씬 높음
-            if user_id in self.successful_users:
-                payment_prob = 0.3
+            if exact:
+                # 결제가 나올 쪽을 먼저 정하고 그 쪽 세션에서 균등 추출
+                is_successful = rng.random() < successful_share
+                group = successful_sessions if is_successful else other_sessions
+                session_index = group[rng.randrange(len(group))]
+                user_index = sessions.user_index[session_index]
             else:
-                payment_prob = 0.05
+                session_index = rng.randrange(len(sessions))
+                user_index = sessions.user_index[session_index]
 
-            if random.random() > payment_prob:
-                continue
+                # 성공 유저가 결제할 확률이 훨씬 높음
+                is_successful = self.population.is_successful(user_index)
+                if is_successful:
+                    payment_prob = 0.3
+                else:
+                    payment_prob = 0.05
 
-            session_start = session["login_time"]
-            session_end = session["logout_time"]
-            timestamp = session_start + timedelta(
-                seconds=random.randint(
-                    0, int((session_end - session_start).total_seconds())
-                )
-            )
+                if rng.random() > payment_prob:
+                    continue
+
+            _, session_start, session_end, session_id = sessions.get(session_index)
+            user_id = self.population.user_id(user_index)
+
+            timestamp = session_start + rng.randint(0, session_end - session_start)
 
             # 성공 유저는 더 비싼 결제
-            if user_id in self.successful_users:
-                amount = random.choice([9.99, 19.99, 49.99, 99.99])
-                product = random.choice(
-                    ["special_weapon_pack", "premium_currency", "exp_booster"]
-                )
+            if is_successful:
+                amount = scenario["successful_amount"].draw(rng)
+                product = scenario["successful_product"].draw(rng)
             else:
-                amount = random.choice([0.99, 2.99, 4.99])
-                product = random.choice(["basic_currency", "small_booster"])
+                amount = scenario["amount"].draw(rng)
+                product = scenario["product"].draw(rng)
 
             log = {
-                "log_id": str(uuid.uuid4()),
+                "log_id": self._new_uuid(),
                 "user_id": user_id,
-                "session_id": session["session_id"],
-                "timestamp": timestamp.isoformat(),
-                "transaction_id": str(uuid.uuid4()),
+                "session_id": session_id,
+                "timestamp": fmt(timestamp),
+                "transaction_id": self._new_uuid(),
                 "product_id": product,
                 "product_name": product.replace("_", " ").title(),
                 "amount": amount,
                 "currency": "USD",
-                "payment_method": random.choice(
-                    ["credit_card", "paypal", "google_pay", "apple_pay"]
-                ),
-                "status": random.choices(["success", "failed"], weights=[95, 5])[0],
-                "country": fake.country_code(),
+                "payment_method": payment_method.draw(rng),
+                "status": payment_status.draw(rng),
+                "country": self.values.country_for(user_index, rng),
             }
+            if add_epoch_ms:
+                log["epoch_ms"] = timestamp * 1000
             logs.append(log)
 
         return logs
 
     def generate_error_logs(self, count=10000):
         """에러 로그 생성"""
-        if not self.sessions:
+        rng = self.rng
+        fmt = self.time_formatter.format
+        add_epoch_ms = self.time_formatter.add_epoch_ms
+        sessions = self.sessions
+        if not sessions:
             print("세션 로그를 먼저 생성해주세요.")
             return []
 
         logs = []
-        error_types = [
-            "network_timeout",
-            "server_error",
-            "client_crash",
-            "payment_failed",
-            "login_failed",
-            "data_sync_error",
-            "memory_error",
-        ]
+        scenario = self.scenario
+        error_types = scenario["error_type"]
+        severity = scenario["severity"]
+        device, os_version, app_version = (
+            scenario["device"],
+            scenario["os_version"],
+            scenario["app_version"],
+        )
 
         for i in range(count):
-            session = random.choice(self.sessions)
-            user_id = session["user_id"]
-
-            session_start = session["login_time"]
-            session_end = session["logout_time"]
-            timestamp = session_start + timedelta(
-                seconds=random.randint(
-                    0, int((session_end - session_start).total_seconds())
-                )
+            user_index, session_start, session_end, session_id = sessions.get(
+                rng.randrange(len(sessions))
             )
+            user_id = self.population.user_id(user_index)
 
-            error_type = random.choice(error_types)
+            timestamp = session_start + rng.randint(0, session_end - session_start)
+
+            error_type = error_types.draw(rng)
 
             log = {
-                "log_id": str(uuid.uuid4()),
+                "log_id": self._new_uuid(),
                 "user_id": user_id,
-                "session_id": session["session_id"],
-                "timestamp": timestamp.isoformat(),
+                "session_id": session_id,
+                "timestamp": fmt(timestamp),
                 "error_type": error_type,
-                "error_code": f"E{random.randint(1000, 9999)}",
+                "error_code": f"E{rng.randint(1000, 9999)}",
                 "error_message": f"{error_type.replace('_', ' ').title()} occurred",
-                "severity": random.choice(["low", "medium", "high", "critical"]),
-                "device": random.choice(self.devices),
-                "os_version": random.choice(self.os_versions),
-                "app_version": random.choice(self.app_versions),
-                "stack_trace": fake.text(max_nb_chars=200),
+                "severity": severity.draw(rng),
+                "device": device.draw(rng),
+                "os_version": os_version.draw(rng),
+                "app_version": app_version.draw(rng),
+                "stack_trace": self.values.stack_trace(rng),
             }
+            if add_epoch_ms:
+                log["epoch_ms"] = timestamp * 1000
             logs.append(log)
 
         return logs
 
     def save_to_json(self, data, filename):
         """JSON 파일로 저장"""
-        if not data:
-            print(f"❌ {filename} 저장 실패: 데이터가 없습니다.")
-            return
-
-        filepath = os.path.join(log_dir, filename)
-
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        print(f"✅ {filename} 저장 완료 ({len(data)}건)")
+        self.save_chunks([data], filename, "json")
 
     def save_to_csv(self, data, filename):
         """CSV 파일로 저장"""
-        if not data:
+        self.save_chunks([data], filename, "csv")
+
+    def save_to_ndjson(self, records, filename, flush_bytes=1024 * 1024, flush_interval=1.0):
+        """NDJSON 파일로 저장 - 한 줄에 레코드 하나, 리스트 대신 iterable도 받음"""
+        self.save_chunks(
+            [records], filename, "ndjson", flush_bytes=flush_bytes, flush_interval=flush_interval
+        )
+
+    def save_chunks(self, chunks, filename, fmt="json", checkpoint=None, **options):
+        """레코드 청크들을 차례로 fmt(json/ndjson/csv) 파일에 기록하고 건수 반환
+
+        한 번에 한 청크만 메모리에 둡니다. compression 설정 시 확장자를 붙이고 블록 압축하며,
+        write_queue 설정 시 writer 스레드(AsyncSink)가 기록합니다. options는 sink 생성자로 전달됩니다.
+        checkpoint(Checkpointer)를 주면 청크마다 진행 상황을 알리고, 체크포인트 위치부터 이어 씁니다.
+        """
+        if checkpoint:
+            options["resume"] = checkpoint.resume_of(filename)
+        sink = self._open_sink(fmt, filename, **options)
+        if self.write_queue:
+            sink = AsyncSink(sink, self.write_queue)
+        timer = self.instrumentation.timer
+        # writer 스레드가 기록하면 생성 스레드에서 잰 시간은 큐 대기 시간
+        label = "write_wait" if self.write_queue else "write"
+        with sink:
+            for chunk in chunks:
+                with timer(label):
+                    sink.write(chunk)
+                if checkpoint:
+                    checkpoint.chunk_written({filename: sink})
+            if checkpoint:
+                checkpoint.sync({filename: sink})
+        if self.write_queue:
+            self.instrumentation.add("write_seconds", sink.write_time)
+
+        count = self._report(sink, filename, fmt)
+        if count and self.write_queue:
+            print(f"   ⏱️  {sink.wait_summary()}")
+        return count
+
+    def save_fan_out(self, chunks, filename, formats, checkpoint=None):
+        """청크를 한 번만 생성해 여러 형식 파일에 기록하고 형식별 건수 dict 반환
+
+        파일 이름은 filename의 확장자를 형식 이름으로 바꾼 것입니다 (session.log -> session.json,
+        session.csv, session.ndjson). 형식별 인코딩/압축은 생성 스레드에서 차례로 처리하므로
+        (FanOutSink 참고) 형식마다 따로 생성하는 것보다 레코드 생성 시간만큼 빠릅니다.
+        """
+        stem = filename.rsplit(".", 1)[0]
+        names = {fmt: f"{stem}.{fmt}" for fmt in formats}
+        sinks = {
+            fmt: self._open_sink(
+                fmt, name, resume=checkpoint.resume_of(name) if checkpoint else None
+            )
+            for fmt, name in names.items()
+        }
+        outputs = {names[fmt]: sinks[fmt] for fmt in formats}
+        with FanOutSink(sinks.values()) as fan_out:
+            for chunk in chunks:
+                with self.instrumentation.timer("write"):
+                    fan_out.write(chunk)
+                if checkpoint:
+                    checkpoint.chunk_written(outputs)
+            if checkpoint:
+                checkpoint.sync(outputs)
+        return {fmt: self._report(sinks[fmt], names[fmt], fmt) for fmt in formats}
+
+    def save_routed(self, chunks, formats):
+        """(로그 이름, 레코드 리스트) 청크를 로그 타입별 파일로 나눠 동시에 기록하고
+        로그 타입 -> {형식: 건수} dict 반환 (save_fan_out의 형식별 건수와 같은 모양)
+
+        여러 로그 타입이 섞여 나오는 시뮬레이션 엔진용입니다. 형식이 하나면 <로그>.log,
+        여러 개면 save_fan_out과 같이 <로그>.<형식> 파일로 기록합니다.
+        """
+        outputs = {}
+        for log_name, _ in LOG_TYPES:
+            if len(formats) > 1:
+                names = {fmt: f"{log_name}.{fmt}" for fmt in formats}
+                sinks = {fmt: self._open_sink(fmt, name) for fmt, name in names.items()}
+                writer = FanOutSink(sinks.values())
+            else:
+                names = {formats[0]: f"{log_name}.log"}
+                sinks = {formats[0]: self._open_sink(formats[0], names[formats[0]])}
+                writer = sinks[formats[0]]
+                if self.write_queue:
+                    writer = AsyncSink(writer, self.write_queue)
+            outputs[log_name] = (writer, names, sinks)
+
+        metrics = self.instrumentation
+        label = "write_wait" if len(formats) == 1 and self.write_queue else "write"
+        try:
+            for log_name, records in chunks:
+                metrics.add("records_generated", len(records))
+                with metrics.timer(label):
+                    outputs[log_name][0].write(records)
+        finally:
+            for writer, _, _ in outputs.values():
+                writer.close()
+        if label == "write_wait":
+            for writer, _, _ in outputs.values():
+                metrics.add("write_seconds", writer.write_time)
+
+        return {
+            log_name: {fmt: self._report(sink, names[fmt], fmt) for fmt, sink in sinks.items()}
+            for log_name, (_, names, sinks) in outputs.items()
+        }
+
+    def _open_sink(self, fmt, filename, **options):
+        """출력 디렉토리/압축 설정을 반영한 sink 생성 (CSV는 로그 타입별 고정 컬럼 순서 사용)"""
+        filepath = output_path(os.path.join(self.output_dir, filename), self.compression)
+        if fmt == "csv":
+            options.setdefault("schema", CSV_SCHEMAS.get(filename.split(".")[0]))
+        return open_sink(fmt, filepath, self.compression, self.compress_workers, **options)
+
+    def _report(self, sink, filename, fmt):
+        """저장 완료/실패 메시지 출력 후 기록 건수 반환"""
+        count = sink.records_written
+        if not count:
             print(f"❌ {filename} 저장 실패: 데이터가 없습니다.")
-            return
+            return 0
+        detail = f", 건당 {sink.bytes_written / count:.0f}바이트" if fmt == "ndjson" else ""
+        if self.instrumentation.enabled:
+            filepath = output_path(os.path.join(self.output_dir, filename), self.compression)
+            self.instrumentation.add("bytes_written", os.path.getsize(filepath))
+        print(
+            f"✅ {output_path(filename, self.compression)} 저장 완료 ({count}건{detail})"
+            f"{self._compression_note(sink.compressor)}"
+        )
+        return count
+
+    def _compression_note(self, compressor):
+        """저장 완료 메시지에 붙일 압축 요약 (압축하지 않았으면 빈 문자열)"""
+        if not self.compression:
+            return ""
+        return f" - {compressor.summary()}"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="게임 로그 데이터 생성기")
+    parser.add_argument(
+        "--format",
+        type=formats_of,
+        default=["json"],
+        help=(
+            "출력 형식 (json: 들여쓴 JSON 배열, ndjson: 한 줄에 레코드 하나, csv). "
+            "json,csv,ndjson처럼 쉼표로 여러 개를 주면 한 번 생성해 형식별 파일에 동시에 기록"
+        ),
+    )
+    parser.add_argument("--count", type=int, default=10000, help="로그 타입별 생성 건수")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=100000,
+        help="한 번에 생성해 기록할 건수 (메모리 사용량 상한)",
+    )
+    parser.add_argument("--users", type=int, default=1000, help="사용자 모집단 크기")
+    parser.add_argument(
+        "--engine",
+        choices=["python", "numpy", "simulation"],
+        default="python",
+        help=(
+            "생성 엔진 (numpy: 열 단위 배치 생성, numpy 필요 / simulation: 유저별 상태 머신 "
+            "이산 사건 시뮬레이션 - 5종 로그를 유저 행동 순서대로 생성하며 건수는 --users로 정해짐)"
+        ),
+    )
+    parser.add_argument(
+        "--value-pools",
+        action="store_true",
+        help="IP/국가 코드/스택 트레이스를 seed별 캐시 풀에서 꺼내 씀 (Faker 호출 제거)",
+    )
+    parser.add_argument(
+        "--per-user-values", action="store_true", help="유저별로 IP/국가 코드 고정 (--value-pools 필요)"
+    )
+    parser.add_argument("--pool-cache-dir", default=None, help="값 풀 캐시 디렉토리")
+    parser.add_argument("--output-dir", default=log_dir, help="로그 파일 저장 디렉토리")
+    parser.add_argument(
+        "--session-dir", default=None, help="세션 저장소를 memory-mapped 파일로 둘 디렉토리"
+    )
+    parser.add_argument(
+        "--shards", type=int, default=1, help="샤드 수 (2 이상이면 멀티 프로세스로 생성)"
+    )
+    parser.add_argument("--workers", type=int, default=None, help="샤드 생성 워커 프로세스 수")
+    parser.add_argument("--seed", type=int, default=42, help="샤드별 seed 계산에 쓰는 기본 seed")
+    parser.add_argument(
+        "--start-date",
+        type=datetime.fromisoformat,
+        default=None,
+        help="로그 시작 시각 (ISO 형식, 시간대가 없으면 UTC, 기본: 현재 - 30일). 재현 가능한 출력이 필요하면 지정",
+    )
+    parser.add_argument(
+        "--keep-shards", action="store_true", help="병합하지 않고 샤드별 파일을 그대로 남김"
+    )
+    parser.add_argument(
+        "--time-ordered",
+        action="store_true",
+        help="모든 로그 타입을 전역 시간순으로 병합해 events.log 하나로 기록",
+    )
+    parser.add_argument("--run-size", type=int, default=1000000, help="정렬 run 크기(건)")
+    parser.add_argument(
+        "--memory-records", type=int, default=2000000, help="메모리에 둘 최대 레코드 수 (초과분은 디스크로)"
+    )
+    parser.add_argument("--spill-dir", default=None, help="run 파일 임시 디렉토리")
+    parser.add_argument(
+        "--compression",
+        choices=COMPRESSIONS,
+        default="none",
+        help="출력 압축 형식 (gzip: .gz, bz2: .bz2, lzma: .xz 확장자 추가)",
+    )
+    parser.add_argument(
+        "--compress-workers", type=int, default=None, help="블록 압축 스레드 수 (기본: CPU 수)"
+    )
+    parser.add_argument(
+        "--async-write",
+        action="store_true",
+        help="별도 writer 스레드에서 직렬화/압축/기록 (생성과 디스크 I/O를 겹침, 형식이 하나일 때만)",
+    )
+    parser.add_argument(
+        "--write-queue", type=int, default=2, help="--async-write 큐에 쌓아 둘 최대 청크 수"
+    )
+    parser.add_argument(
+        "--partitioned",
+        action="store_true",
+        help="<로그 타입>/dt=YYYY-MM-DD/hour=HH/part-N.json 시간 파티션으로 기록 (NDJSON)",
+    )
+    parser.add_argument(
+        "--max-open-writers", type=int, default=64, help="동시에 열어 둘 파티션 writer 수 (LRU)"
+    )
+    parser.add_argument(
+        "--roll-mb", type=int, default=128, help="파티션 part 파일을 넘길 크기(MB, 압축 전 기준)"
+    )
+    parser.add_argument(
+        "--exact-counts",
+        action="store_true",
+        help="세션/결제 로그를 버리는 반복 없이 타입별 정확히 --count건 생성",
+    )
+    parser.add_argument(
+        "--scenario", default=None, help="분포를 덮어쓸 JSON 시나리오 파일 (scenario.py 참고)"
+    )
+    parser.add_argument(
+        "--time-format",
+        choices=TIME_FORMATS,
+        default="iso",
+        help="시각 필드 형식 (iso: ISO 문자열, epoch_ms: epoch 밀리초 정수, both: ISO + epoch_ms 필드)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=None,
+        help="생성 상태를 주기적으로 저장할 체크포인트 파일 (중단 시 --resume으로 이어서 생성)",
+    )
+    parser.add_argument(
+        "--checkpoint-interval", type=float, default=60.0, help="체크포인트 저장 간격(초)"
+    )
+    resume = parser.add_mutually_exclusive_group()
+    resume.add_argument(
+        "--resume",
+        default=None,
+        help="체크포인트 파일에서 중단된 생성을 이어서 진행 (생성 옵션은 체크포인트 값을 사용)",
+    )
+    resume.add_argument(
+        "--append",
+        default=None,
+        help=f"완료된 체크포인트에 같은 유저/진행도로 다음 {PERIOD_DAYS}일치 로그를 기존 파일 뒤에 추가",
+    )
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+    single_process = not (args.shards > 1 or args.partitioned or args.time_ordered)
+    if len(args.format) > 1 and not single_process:
+        parser.error("여러 --format 동시 기록은 단일 프로세스 로그 타입별 출력에서만 지원합니다.")
+    if (args.checkpoint or args.resume or args.append) and not single_process:
+        parser.error("체크포인트는 단일 프로세스 로그 타입별 출력에서만 지원합니다.")
+    if args.engine == "simulation" and (
+        args.shards > 1 or args.time_ordered or args.checkpoint or args.resume or args.append
+    ):
+        parser.error("simulation 엔진은 --shards, --time-ordered, 체크포인트와 함께 쓸 수 없습니다.")
+    return args
+
+
+def formats_of(value):
+    """--format 값('json' 또는 'json,csv,ndjson') -> 형식 목록 (중복 제거, 순서 유지)"""
+    formats = list(dict.fromkeys(fmt.strip() for fmt in value.split(",") if fmt.strip()))
+    unknown = [fmt for fmt in formats if fmt not in SINKS]
+    if not formats or unknown:
+        raise argparse.ArgumentTypeError(
+            f"지원하지 않는 형식: {', '.join(unknown) or value} (선택: {', '.join(SINKS)})"
+        )
+    return formats
+
+
+def load_value_pools(args):
+    """--value-pools 옵션에 따라 값 풀을 읽거나 생성 (없으면 None)"""
+    if not args.value_pools:
+        return None
+    pools = ValuePools.load_or_build(args.seed, args.pool_cache_dir or DEFAULT_CACHE_DIR)
+    pools.per_user = args.per_user_values
+    return pools
+
+
+def scenario_of(args):
+    """--scenario 파일을 컴파일한 Scenario (없으면 None: 기본 시나리오)"""
+    return Scenario.load(args.scenario) if args.scenario else None
+
+
+def write_queue_of(args):
+    """--async-write 옵션 -> 비동기 기록 큐 크기 (동기 기록이면 None)"""
+    return args.write_queue if args.async_write else None
+
+
+def compression_of(args):
+    """--compression 값 -> 압축 형식 (none이면 None)"""
+    return None if args.compression == "none" else args.compression
+
+
+def partition_options_of(args):
+    """--partitioned 옵션 -> PartitionedOutput 옵션 dict (파티션 출력이 아니면 None)"""
+    if not args.partitioned:
+        return None
+    return {"max_open_writers": args.max_open_writers, "roll_bytes": args.roll_mb * 1024 * 1024}
+
+
+def run_sharded_main(args):
+    from sharded_generation import run_sharded
+
+    start_date = to_utc(args.start_date) if args.start_date else utc_now() - timedelta(days=30)
+    print(f"🎮 게임 로그 데이터 생성 시작... ({args.shards}개 샤드)")
+    totals = run_sharded(
+        args.shards,
+        args.seed,
+        args.users,
+        args.count,
+        start_date,
+        args.output_dir,
+        fmt=args.format[0],
+        engine=args.engine,
+        value_pools=load_value_pools(args),
+        workers=args.workers,
+        merge=not args.keep_shards,
+        time_format=args.time_format,
+        compression=compression_of(args),
+        partition_options=partition_options_of(args),
+        scenario=scenario_of(args),
+        exact_counts=args.exact_counts,
+        chunk_size=args.chunk_size,
+        write_queue=write_queue_of(args),
+    )
+    print(f"\n🎉 모든 로그 생성 완료!")
+    for log_name, total in totals.items():
+        print(f"  - {log_name}: {total}건")
+
+
+def run_time_ordered_main(args, source):
+    from event_stream import TimeOrderedMerger, generate_runs, write_unified
 
-        filepath = os.path.join(log_dir, filename)
+    print("🎮 시간순 통합 이벤트 스트림 생성 시작...")
+    with TimeOrderedMerger(args.run_size, args.memory_records, args.spill_dir) as merger:
+        totals = generate_runs(source, args.count, merger, args.chunk_size)
+        print(f"📦 정렬 run 생성 완료 (디스크 run {merger.spilled_runs}개)")
+        written = write_unified(merger, os.path.join(args.output_dir, "events.log"))
 
-        with open(filepath, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=data[0].keys())
-            writer.writeheader()
-            writer.writerows(data)
-        print(f"✅ {filename} 저장 완료 ({len(data)}건)")
+    print(f"\n🎉 events.log 저장 완료 ({written}건)")
+    for log_name, total in totals.items():
+        print(f"  - {log_name}: {total}건")
+
+
+def run_simulation_main(args, generator, partitioned=None):
+    from simulation import UserSimulation
+
+    simulation = UserSimulation(generator)
+    print(f"🎮 유저 {args.users}명 이산 사건 시뮬레이션 시작...")
+    chunks = simulation.run(args.chunk_size)
+    if partitioned:
+        for log_name, records in chunks:
+            partitioned.write_many(log_name, records)
+        for log_name, _ in LOG_TYPES:
+            print(f"✅ {log_name} 파티션 저장 완료")
+    else:
+        generator.save_routed(chunks, args.format)
+    print(f"\n🎉 시뮬레이션 완료! ({simulation.summary()})")
+
+
+def load_checkpoint_of(args):
+    """--resume/--append 체크포인트를 읽고 저장된 생성 옵션으로 args를 덮어씀 (없으면 None)"""
+    path = args.resume or args.append
+    if not path:
+        return None
+    from checkpoint import Checkpoint
+
+    state = Checkpoint.load(path)
+    for key, value in state.settings.items():
+        setattr(args, key, value)
+    args.checkpoint = args.checkpoint or path
+    return state
 
 
 def main():
-    generator = GameLogGenerator()
+    args = parse_args()
+    metrics = instrumentation.from_args(args)
+    try:
+        generate_main(args, metrics)
+    finally:
+        if metrics.finish(args.report):
+            print(f"📝 실행 리포트: {args.report}")
+
+
+def generate_main(args, metrics):
+    if args.shards > 1:
+        with metrics.stage("sharded"):
+            run_sharded_main(args)
+        return
+
+    state = load_checkpoint_of(args)
+    if state and args.resume and state.is_complete():
+        print(f"✅ 체크포인트의 생성이 이미 완료되었습니다. (기간을 늘리려면 --append {args.resume})")
+        return
+    if state and args.append and not state.is_complete():
+        print(f"❌ 완료되지 않은 체크포인트입니다. 먼저 --resume {args.append}로 마저 생성해주세요.")
+        return
+
+    generator = GameLogGenerator(
+        args.users,
+        start_date=args.start_date,
+        session_dir=args.session_dir,
+        time_format=args.time_format,
+        scenario=Scenario(state.meta["scenario"]) if state else scenario_of(args),
+        exact_counts=args.exact_counts,
+    )
+    if state:
+        # --append는 세션 저장소를 비우고 다음 기간의 세션부터 새로 만듦 (유저/진행도는 유지)
+        state.restore(generator, sessions=not args.append)
+        if args.append:
+            generator.first_day += PERIOD_DAYS
+    generator.output_dir = args.output_dir
+    generator.compression = compression_of(args)
+    generator.compress_workers = args.compress_workers
+    generator.write_queue = write_queue_of(args)
+    pools = load_value_pools(args)
+    if pools:
+        generator.use_value_pools(pools)
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    partitioned = None
+    if args.partitioned:
+        from partitioned_output import PartitionedOutput
+
+        partitioned = PartitionedOutput(
+            args.output_dir,
+            compression=generator.compression,
+            compress_workers=args.compress_workers,
+            **partition_options_of(args),
+        )
+    source = generator
+    if args.engine == "numpy":
+        from batch_engine import NumpyBatchEngine
+
+        source = NumpyBatchEngine(generator, seed=args.seed)
+        if state:
+            state.restore_engine(source)
+    # 엔진이 값 풀을 가져간 뒤에 교체 (계측 래퍼는 generator의 Faker/값 풀 호출에만 적용)
+    generator.use_instrumentation(metrics)
+
+    if args.time_ordered:
+        with metrics.stage("time_ordered"):
+            run_time_ordered_main(args, source)
+        return
+    if args.engine == "simulation":
+        with metrics.stage("simulation"):
+            run_simulation_main(args, generator, partitioned)
+        if partitioned:
+            partitioned.close()
+            print(f"📂 {partitioned.summary()}")
+        return
+
+    checkpointer = None
+    if args.checkpoint:
+        from checkpoint import Checkpointer
+
+        checkpointer = Checkpointer(
+            args.checkpoint,
+            generator,
+            vars(args),
+            [log_name for log_name, _ in LOG_TYPES],
+            engine=source if source is not generator else None,
+            interval=args.checkpoint_interval,
+            progress=state.meta["progress"] if state and args.resume else None,
+            outputs=state.meta["outputs"] if state else None,
+        )
+
+    def save(log_name, method):
+        """로그 타입 하나를 chunk_size 단위로 생성 즉시 기록 (체크포인트가 있으면 이어서 생성)"""
+        with metrics.stage(log_name):
+            write_log(log_name, method)
+
+    def write_log(log_name, method):
+        filename = f"{log_name}.log"
+        if partitioned:
+            partitioned.save_chunks(
+                iter_log_chunks(source, method, args.count, args.chunk_size, metrics), filename
+            )
+            return
+        if checkpointer:
+            if checkpointer.done(log_name) >= args.count:
+                print(f"⏭️  {log_name} 로그는 체크포인트 시점에 이미 완료되었습니다.")
+                return
+            chunks = checkpointer.chunks(source, method, log_name, args.count, args.chunk_size)
+        else:
+            chunks = iter_log_chunks(source, method, args.count, args.chunk_size, metrics)
+        if len(args.format) > 1:
+            generator.save_fan_out(chunks, filename, args.format, checkpointer)
+        else:
+            generator.save_chunks(chunks, filename, args.format[0], checkpointer)
+        if checkpointer:
+            checkpointer.step_done(log_name, args.count)
 
     # 데이터 디렉토리 생성
     os.makedirs("data", exist_ok=True)
 
-    print("🎮 게임 로그 데이터 생성 시작...")
+    # 로그 타입마다 chunk_size 단위로 생성 즉시 기록하므로 메모리에는 한 청크와 세션 저장소만 남음
+    if args.append:
+        print(f"🎮 게임 로그 기간 추가 시작... (경과일 {generator.first_day}일부터)")
+    elif state:
+        done = ", ".join(f"{name} {count}" for name, count in state.meta["progress"].items())
+        print(f"🎮 체크포인트에서 게임 로그 생성 재개... (완료 반복 수: {done or '없음'})")
+    else:
+        print("🎮 게임 로그 데이터 생성 시작...")
 
     # 1. 세션 로그 생성 (가장 먼저)
     print("\n📊 세션 로그 생성 중...")
-    session_logs = generator.generate_session_logs(10000)
-    generator.save_to_json(session_logs, "session.log")
+    save("session", "generate_session_logs")
 
     # 2. 인게임 액션 로그 생성
     print("\n🎯 인게임 액션 로그 생성 중...")
-    ingame_logs = generator.generate_ingame_action_logs(10000)
-    generator.save_to_json(ingame_logs, "ingame_action.log")
+    save("ingame_action", "generate_ingame_action_logs")
 
     # 3. 아이템 로그 생성
     print("\n🎒 아이템 로그 생성 중...")
-    item_logs = generator.generate_item_logs(10000)
-    generator.save_to_json(item_logs, "item.log")
+    save("item", "generate_item_logs")
 
     # 4. 결제 로그 생성
     print("\n💳 결제 로그 생성 중...")
-    payment_logs = generator.generate_payment_logs(10000)
-    generator.save_to_json(payment_logs, "payment.log")
+    save("payment", "generate_payment_logs")
 
     # 5. 에러 로그 생성
     print("\n❌ 에러 로그 생성 중...")
-    error_logs = generator.generate_error_logs(10000)
-    generator.save_to_json(error_logs, "error.log")
+    save("error", "generate_error_logs")
+    if partitioned:
+        partitioned.close()
+        print(f"📂 {partitioned.summary()}")
+    if checkpointer:
+        print(f"💾 체크포인트: {args.checkpoint} (저장 {checkpointer.saves}회)")
 
     print(f"\n🎉 모든 로그 생성 완료!")
     print(f"📈 성공 유저: {len(generator.successful_users)}명 (30%)")
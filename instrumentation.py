@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+생성/분석 실행 계측
+단계(stage)별 타이머와 카운터(생성 건수, 버린 건수, 기록 바이트, Faker 시간, 직렬화/기록 시간)를 모으고,
+선택적으로 단계 경계마다 tracemalloc 스냅샷과 샘플링 프로파일(스택 샘플)을 남겨 JSON 실행 리포트로 저장합니다.
+
+계측은 청크/단계 단위로만 호출되며, 꺼져 있으면(DISABLED) 모든 메서드가 플래그 확인 후 바로 반환하므로
+운영 실행에도 그대로 켜 둘 수 있습니다.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+_NULL_CONTEXT = nullcontext()
+
+
+class StackSampler:
+    """메인 스레드의 호출 스택을 interval초마다 샘플링하는 프로파일러 스레드
+
+    hook(frame)을 주면 샘플마다 호출해 외부 프로파일러로 넘길 수 있습니다 (샘플러 스레드에서 호출됨).
+    """
+
+    def __init__(self, interval=0.005, hook=None, max_depth=32):
+        self.interval = interval
+        self.hook = hook
+        self.max_depth = max_depth
+        self.samples = 0
+        self.functions = Counter()
+        self.stacks = Counter()
+        self._target = threading.main_thread().ident
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            self.samples += 1
+            if self.hook is not None:
+                self.hook(frame)
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            self.functions[stack[0]] += 1
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def report(self, top=20):
+        def share(count):
+            return round(count / self.samples, 4) if self.samples else 0.0
+
+        return {
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "top_functions": [
+                {"function": name, "samples": count, "share": share(count)}
+                for name, count in self.functions.most_common(top)
+            ],
+            # flamegraph.pl 등에 넣을 수 있는 접힌 스택 ("바깥;...;안쪽")
+            "top_stacks": [
+                {"stack": stack, "samples": count} for stack, count in self.stacks.most_common(top)
+            ],
+        }
+
+
+class Instrumentation:
+    """단계별 타이머/카운터와 실행 리포트
+
+    - stage(name): 단계 구간 (벽시계/CPU 시간, 단계 안에서 더해진 카운터, tracemalloc 스냅샷)
+    - add(name, value): 카운터 증가 (현재 단계와 전체 합계에 함께 반영)
+    - timer(name): 구간 시간을 '<name>_seconds' 카운터에 더함
+    - generated(generate, size): 청크 생성 시간과 생성/버린 건수 기록
+    """
+
+    def __init__(
+        self, enabled=True, trace_memory=False, profile_interval=None, profile_hook=None
+    ):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.totals = Counter()
+        self.stages = []
+        self.sampler = None
+        if enabled and profile_interval:
+            self.sampler = StackSampler(profile_interval, profile_hook)
+        self._current = None
+        self._started_at = datetime.now()
+        self._started = time.perf_counter()
+        self._cpu_started = time.process_time()
+
+    def start(self):
+        if not self.enabled:
+            return self
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self.sampler:
+            self.sampler.start()
+        return self
+
+    def add(self, name, value=1):
+        if not self.enabled:
+            return
+        self.totals[name] += value
+        if self._current is not None:
+            self._current["counters"][name] += value
+
+    def timer(self, name):
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._timer(name + "_seconds")
+
+    @contextmanager
+    def _timer(self, counter):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(counter, time.perf_counter() - started)
+
+    def generated(self, generate, size):
+        """generate(size)로 청크 생성 - 생성 시간, 생성 건수, 버린 반복 수(size - 청크 건수) 기록"""
+        if not self.enabled:
+            return generate(size)
+        with self._timer("generate_seconds"):
+            chunk = generate(size)
+        self.add("records_generated", len(chunk))
+        self.add("records_rejected", size - len(chunk))
+        return chunk
+
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._stage(name)
+
+    @contextmanager
+    def _stage(self, name):
+        parent = self._current
+        stage = {"name": name, "counters": Counter()}
+        self._current = stage
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        started, cpu_started = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            stage["seconds"] = round(time.perf_counter() - started, 4)
+            stage["cpu_seconds"] = round(time.process_time() - cpu_started, 4)
+            if self.trace_memory:
+                stage["memory"] = self._memory_snapshot()
+            self.stages.append(stage)
+            self._current = parent
+            if parent is not None:
+                parent["counters"].update(stage["counters"])
+
+    def _memory_snapshot(self, top=5):
+        current, peak = tracemalloc.get_traced_memory()
+        # 계측 자체(샘플러 스택 집계 등)의 할당은 제외
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+        statistics = snapshot.statistics("lineno")[:top]
+        return {
+            "current_mb": round(current / 1024 / 1024, 2),
+            "peak_mb": round(peak / 1024 / 1024, 2),
+            "top_allocations": [
+                {
+                    "where": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    "size_kb": round(stat.size / 1024, 1),
+                    "count": stat.count,
+                }
+                for stat in statistics
+            ],
+        }
+
+    def report(self, script=None):
+        """JSON으로 저장할 실행 리포트 dict"""
+        report = {
+            "script": script or os.path.basename(sys.argv[0]),
+            "started_at": self._started_at.isoformat(timespec="seconds"),
+            "elapsed_seconds": round(time.perf_counter() - self._started, 4),
+            "cpu_seconds": round(time.process_time() - self._cpu_started, 4),
+            "stages": [
+                dict(stage, counters=_rounded(stage["counters"])) for stage in self.stages
+            ],
+            "counters": _rounded(self.totals),
+        }
+        records = self.totals.get("records_generated")
+        if records:
+            report["records_per_sec"] = round(records / report["elapsed_seconds"], 1)
+        if self.sampler:
+            report["profile"] = self.sampler.report()
+        return report
+
+    def finish(self, path, script=None):
+        """샘플러/tracemalloc을 멈추고 리포트를 path에 저장"""
+        if not self.enabled:
+            return None
+        if self.sampler:
+            self.sampler.stop()
+        report = self.report(script)
+        if self.trace_memory:
+            tracemalloc.stop()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return report
+
+
+def _rounded(counters):
+    return {
+        name: round(value, 4) if isinstance(value, float) else value
+        for name, value in counters.items()
+    }
+
+
+# 계측을 켜지 않았을 때 쓰는 공용 인스턴스
+DISABLED = Instrumentation(enabled=False)
+
+
+class TimedValues:
+    """값 공급자(FakerValues/ValuePools) 호출 시간을 '<kind>_seconds' 카운터에 더하는 래퍼 (계측 시에만 사용)"""
+
+    def __init__(self, values, instrumentation, kind):
+        self.values = values
+        self._add = instrumentation.add
+        self._counter = kind + "_seconds"
+
+    def _timed(self, method, *args):
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            self._add(self._counter, time.perf_counter() - started)
+
+    def ip_for(self, user_index, rng):
+        return self._timed(self.values.ip_for, user_index, rng)
+
+    def country_for(self, user_index, rng):
+        return self._timed(self.values.country_for, user_index, rng)
+
+    def stack_trace(self, rng):
+        return self._timed(self.values.stack_trace, rng)
+
+    def __getattr__(self, name):
+        return getattr(self.values, name)
+
+
+def add_arguments(parser):
+    """--report / --trace-memory / --profile-interval 옵션 추가 (생성기/분석 스크립트 공용)"""
+    parser.add_argument("--report", default=None, help="단계별 시간/카운터를 담은 JSON 실행 리포트 경로")
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="단계 경계마다 tracemalloc 스냅샷을 리포트에 포함 (--report 필요, 실행이 느려짐)",
+    )
+    parser.add_argument(
+        "--profile-interval",
+        type=float,
+        default=0,
+        help="샘플링 프로파일 간격(ms) - 0이면 끔 (--report 필요)",
+    )
+
+
+def from_args(args):
+    """add_arguments 옵션 -> 시작된 Instrumentation (--report가 없으면 DISABLED)"""
+    if not args.report:
+        return DISABLED
+    return Instrumentation(
+        trace_memory=args.trace_memory,
+        profile_interval=args.profile_interval / 1000 if args.profile_interval else None,
+    ).start()
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+실시간 게임 로그 발생기 (부하 생성기)
+GameLogGenerator로 만든 이벤트를 목표 초당 이벤트 수에 맞춰 /var/log/game/*.log에 NDJSON으로 이어 씁니다.
+일정 속도뿐 아니라 ramp, 일중 주기(diurnal), burst 형태의 부하와
+기존 data/*.json 데이터셋의 배속 재생을 지원하며, 목표 대비 실제 속도 차이를 보고합니다.
+"""
+
+import argparse
+import heapq
+import json
+import math
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+from compressed_io import open_input, resolve_input
+from generate_game_logs import GameLogGenerator, log_dir
+from log_writers import NDJSONWriter
+from scenario import Scenario
+from session_store import utc_now
+
+LOG_NAMES = ["session", "ingame_action", "item", "payment", "error"]
+
+# main()의 기본 생성량 비율과 비슷한 로그 타입별 가중치 (결제는 약 15%만 남음)
+DEFAULT_MIX = {"session": 1.0, "ingame_action": 1.0, "item": 1.0, "payment": 0.15, "error": 1.0}
+
+# 재생 시 시각을 다시 쓰는 필드
+TIME_FIELDS = ["timestamp", "login_time", "logout_time"]
+
+
+# ---------------------------------------------------------------------------
+# 부하 형태 (경과 초 -> 초당 이벤트 수)
+# ---------------------------------------------------------------------------
+
+
+def constant_rate(rate):
+    return lambda t: rate
+
+
+def ramp_rate(start_rate, end_rate, ramp_seconds):
+    """ramp_seconds 동안 start_rate에서 end_rate로 선형 증가 후 유지"""
+
+    def rate(t):
+        if t >= ramp_seconds:
+            return end_rate
+        return start_rate + (end_rate - start_rate) * t / ramp_seconds
+
+    return rate
+
+
+def diurnal_rate(mean_rate, amplitude, period):
+    """period 초 주기의 사인 곡선 (최저점에서 시작, amplitude는 0~1 비율)"""
+    return lambda t: mean_rate * (1 + amplitude * math.sin(2 * math.pi * t / period - math.pi / 2))
+
+
+def burst_rate(base_rate, peak_rate, every, length):
+    """every 초마다 length 초 동안 peak_rate, 나머지는 base_rate"""
+    return lambda t: peak_rate if (t % every) < length else base_rate
+
+
+class TokenBucket:
+    """시간에 따라 변하는 속도를 지원하는 토큰 버킷
+
+    take()는 마지막 호출 이후 쌓인 토큰을 정수 건수로 돌려주므로
+    초당 수만 건에서도 이벤트마다 sleep 하지 않고 묶음으로 방출할 수 있습니다.
+    target_total은 버킷 상한과 무관한 이상적인 누적 이벤트 수로, 드리프트 계산에 사용합니다.
+    """
+
+    def __init__(self, rate_fn, burst_seconds=0.5):
+        self.rate_fn = rate_fn
+        self.burst_seconds = burst_seconds
+        self.tokens = 0.0
+        self.target_total = 0.0
+        self.start = self.last = time.monotonic()
+        self._last_rate = rate_fn(0.0)
+
+    def elapsed(self):
+        return time.monotonic() - self.start
+
+    def take(self):
+        now = time.monotonic()
+        rate = self.rate_fn(now - self.start)
+        # 구간 평균 속도(사다리꼴)로 토큰 적립
+        added = (self._last_rate + rate) / 2 * (now - self.last)
+        self.target_total += added
+        capacity = max(1.0, rate * self.burst_seconds)
+        self.tokens = min(self.tokens + added, capacity)
+        self.last = now
+        self._last_rate = rate
+
+        count = int(self.tokens)
+        self.tokens -= count
+        return count
+
+    def wait_time(self):
+        """다음 토큰 하나가 쌓일 때까지의 대략적인 시간(초)"""
+        if self._last_rate <= 0:
+            return 0.01
+        return min(0.01, (1 - self.tokens) / self._last_rate)
+
+
+# ---------------------------------------------------------------------------
+# 이벤트 공급원
+# ---------------------------------------------------------------------------
+
+
+class LiveEventSource:
+    """GameLogGenerator에서 로그 타입별 레코드를 묶음으로 받아 한 건씩 꺼내주는 공급원
+
+    세션은 최근 max_sessions개만 유지해 장시간 실행에도 메모리가 늘지 않습니다.
+    """
+
+    def __init__(self, generator, engine=None, chunk_size=2000, max_sessions=100000):
+        self.generator = generator
+        self.source = engine or generator
+        self.chunk_size = chunk_size
+        self.max_sessions = max_sessions
+        self._buffers = {name: [] for name in LOG_NAMES}
+        self._methods = {
+            "session": self.source.generate_session_logs,
+            "ingame_action": self.source.generate_ingame_action_logs,
+            "item": self.source.generate_item_logs,
+            "payment": self.source.generate_payment_logs,
+            "error": self.source.generate_error_logs,
+        }
+        self._refill("session")
+
+    def _refill(self, name):
+        records = list(self._methods[name](self.chunk_size))
+        records.reverse()  # pop()으로 앞에서부터 꺼내기 위해
+        self._buffers[name] = records
+        if name == "session":
+            self._trim_sessions()
+
+    def _trim_sessions(self):
+        # 배치 엔진도 generator.sessions를 공유하므로 한 곳만 정리하면 됨
+        self.generator.sessions.keep_last(self.max_sessions)
+
+    def next_record(self, name):
+        buffer = self._buffers[name]
+        while not buffer:
+            self._refill(name)
+            buffer = self._buffers[name]
+        return buffer.pop()
+
+
+def stamp_now(record, name, now):
+    """레코드 시각을 현재 시각 기준으로 다시 기록 (세션은 지속시간만큼 로그아웃 시각 조정)"""
+    now_iso = now.isoformat()
+    record["timestamp"] = now_iso
+    if name == "session":
+        record["login_time"] = now_iso
+        record["logout_time"] = (
+            now + timedelta(seconds=record["session_duration_seconds"])
+        ).isoformat()
+    return record
+
+
+# ---------------------------------------------------------------------------
+# 발생기
+# ---------------------------------------------------------------------------
+
+
+class RateReport:
+    """목표 속도 대비 실제 속도 집계"""
+
+    def __init__(self, interval=5.0):
+        self.interval = interval
+        self.emitted = 0
+        self.per_type = {name: 0 for name in LOG_NAMES}
+        self._last_time = time.monotonic()
+        self._last_emitted = 0
+        self._last_target = 0.0
+
+    def maybe_print(self, bucket):
+        now = time.monotonic()
+        if now - self._last_time < self.interval:
+            return
+        span = now - self._last_time
+        actual = (self.emitted - self._last_emitted) / span
+        target = (bucket.target_total - self._last_target) / span
+        drift = drift_percent(self.emitted, bucket.target_total)
+        print(
+            f"⏱️  {bucket.elapsed():7.1f}s | 목표 {target:10,.0f}/s | 실제 {actual:10,.0f}/s"
+            f" | 누적 {self.emitted:,}건 | 드리프트 {drift:+.2f}%"
+        )
+        self._last_time = now
+        self._last_emitted = self.emitted
+        self._last_target = bucket.target_total
+
+
+def drift_percent(actual, target):
+    if target <= 0:
+        return 0.0
+    return (actual - target) / target * 100
+
+
+def open_writers(output_dir, flush_interval):
+    os.makedirs(output_dir, exist_ok=True)
+    return {
+        name: NDJSONWriter(
+            os.path.join(output_dir, f"{name}.log"),
+            flush_bytes=256 * 1024,
+            flush_interval=flush_interval,
+            mode="a",
+        )
+        for name in LOG_NAMES
+    }
+
+
+def close_writers(writers):
+    for writer in writers.values():
+        writer.close()
+
+
+def run_live(
+    source, rate_fn, duration, output_dir=log_dir, mix=None, report_interval=5.0, flush_interval=0.2
+):
+    """rate_fn 속도로 duration 초 동안 이벤트를 이어 쓰고 요약 dict 반환"""
+    mix = mix or DEFAULT_MIX
+    names = [name for name in LOG_NAMES if mix.get(name, 0) > 0]
+    weights = [mix[name] for name in names]
+    rng = random.Random()
+
+    writers = open_writers(output_dir, flush_interval)
+    bucket = TokenBucket(rate_fn)
+    report = RateReport(report_interval)
+
+    try:
+        while bucket.elapsed() < duration:
+            count = bucket.take()
+            if not count:
+                time.sleep(bucket.wait_time())
+                continue
+
+            # 같은 묶음의 이벤트는 같은 현재 시각으로 기록
+            now = utc_now()
+            for name in rng.choices(names, weights=weights, k=count):
+                record = stamp_now(source.next_record(name), name, now)
+                writers[name].write(record)
+                report.per_type[name] += 1
+            report.emitted += count
+            report.maybe_print(bucket)
+    finally:
+        close_writers(writers)
+
+    elapsed = bucket.elapsed()
+    summary = {
+        "elapsed_seconds": round(elapsed, 3),
+        "target_events": round(bucket.target_total),
+        "emitted_events": report.emitted,
+        "actual_rate": round(report.emitted / elapsed, 1) if elapsed else 0.0,
+        "drift_percent": round(drift_percent(report.emitted, bucket.target_total), 3),
+        "per_type": report.per_type,
+    }
+    return summary
+
+
+# ---------------------------------------------------------------------------
+# 데이터셋 배속 재생
+# ---------------------------------------------------------------------------
+
+
+def load_log_file(path):
+    """JSON 배열 또는 NDJSON 파일 읽기 (gzip/bz2/xz 압축 파일도 가능)"""
+    with open_input(path) as f:
+        first = f.read(1)
+        f.seek(0)
+        if first == "[":
+            return json.load(f)
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def replay_dataset(data_dir, speed, output_dir=log_dir, report_interval=5.0, flush_interval=0.2):
+    """data_dir의 <log_name>_logs.json을 원래 시간 간격의 1/speed로 재생
+
+    시각 필드는 (재생 시작 시각 + 원래 경과 시간 / speed)로 다시 기록됩니다.
+    """
+    streams = []
+    for name in LOG_NAMES:
+        path = resolve_input(os.path.join(data_dir, f"{name}_logs.json"))
+        if path is None:
+            print(f"⚠️  {os.path.join(data_dir, name)}_logs.json 없음 - 건너뜀")
+            continue
+        records = load_log_file(path)
+        records.sort(key=lambda record: record["timestamp"])
+        streams.append([(record["timestamp"], name, record) for record in records])
+
+    events = heapq.merge(*streams, key=lambda event: event[0])
+    writers = open_writers(output_dir, flush_interval)
+    emitted = 0
+    max_lag = 0.0
+    first_time = None
+    wall_start = utc_now()
+    start = time.monotonic()
+    last_report = start
+
+    try:
+        for timestamp, name, record in events:
+            event_time = datetime.fromisoformat(timestamp)
+            if first_time is None:
+                first_time = event_time
+            due = (event_time - first_time).total_seconds() / speed
+            delay = due - (time.monotonic() - start)
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                max_lag = max(max_lag, -delay)
+
+            for field in TIME_FIELDS:
+                if field in record:
+                    original = datetime.fromisoformat(record[field])
+                    record[field] = (wall_start + (original - first_time) / speed).isoformat()
+            writers[name].write(record)
+            emitted += 1
+
+            now = time.monotonic()
+            if now - last_report >= report_interval:
+                print(
+                    f"⏱️  {now - start:7.1f}s | 재생 {emitted:,}건"
+                    f" | 원본 시각 {timestamp} | 최대 지연 {max_lag * 1000:.1f}ms"
+                )
+                last_report = now
+    finally:
+        close_writers(writers)
+
+    elapsed = time.monotonic() - start
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "emitted_events": emitted,
+        "actual_rate": round(emitted / elapsed, 1) if elapsed else 0.0,
+        "max_lag_ms": round(max_lag * 1000, 1),
+    }
+
+
+def build_rate_fn(args):
+    if args.shape == "ramp":
+        return ramp_rate(args.ramp_from, args.rate, args.ramp_seconds)
+    if args.shape == "diurnal":
+        return diurnal_rate(args.rate, args.amplitude, args.period)
+    if args.shape == "burst":
+        return burst_rate(args.rate, args.burst_rate, args.burst_every, args.burst_length)
+    return constant_rate(args.rate)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="실시간 게임 로그 발생기")
+    parser.add_argument("--output-dir", default=log_dir, help="로그 파일 디렉토리")
+    parser.add_argument("--rate", type=float, default=1000, help="목표 초당 이벤트 수 (shape별 기준값)")
+    parser.add_argument(
+        "--shape", choices=["constant", "ramp", "diurnal", "burst"], default="constant"
+    )
+    parser.add_argument("--duration", type=float, default=60, help="실행 시간(초)")
+    parser.add_argument("--ramp-from", type=float, default=0, help="ramp 시작 속도")
+    parser.add_argument("--ramp-seconds", type=float, default=60, help="ramp 구간 길이(초)")
+    parser.add_argument("--amplitude", type=float, default=0.8, help="diurnal 진폭 (0~1)")
+    parser.add_argument("--period", type=float, default=600, help="diurnal 주기(초)")
+    parser.add_argument("--burst-rate", type=float, default=10000, help="burst 구간 속도")
+    parser.add_argument("--burst-every", type=float, default=30, help="burst 간격(초)")
+    parser.add_argument("--burst-length", type=float, default=5, help="burst 지속 시간(초)")
+    parser.add_argument("--users", type=int, default=1000, help="사용자 모집단 크기")
+    parser.add_argument("--engine", choices=["python", "numpy"], default="numpy")
+    parser.add_argument("--scenario", default=None, help="분포를 덮어쓸 JSON 시나리오 파일")
+    parser.add_argument("--report-interval", type=float, default=5.0, help="속도 보고 간격(초)")
+    parser.add_argument("--replay", metavar="DATA_DIR", help="이 디렉토리의 *_logs.json을 배속 재생")
+    parser.add_argument("--speed", type=float, default=60, help="재생 배속 (--replay)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.replay:
+        print(f"🔁 {args.replay} 데이터셋을 {args.speed:g}배속으로 재생합니다...")
+        summary = replay_dataset(
+            args.replay, args.speed, args.output_dir, args.report_interval
+        )
+    else:
+        scenario = Scenario.load(args.scenario) if args.scenario else None
+        generator = GameLogGenerator(args.users, scenario=scenario)
+        engine = None
+        if args.engine == "numpy":
+            from batch_engine import NumpyBatchEngine
+
+            engine = NumpyBatchEngine(generator)
+        print(f"🚀 {args.shape} 부하로 {args.duration:g}초 동안 로그를 발생시킵니다...")
+        summary = run_live(
+            LiveEventSource(generator, engine),
+            build_rate_fn(args),
+            args.duration,
+            args.output_dir,
+            report_interval=args.report_interval,
+        )
+
+    print("\n📊 실행 요약:")
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+로그 파일 청크 단위 읽기
+파일 전체를 json.load 하지 않고 NDJSON / CSV / JSON 배열 로그를 chunk_rows건씩 읽어
+필요한 컬럼만 담은 {컬럼: 리스트} 청크로 반환합니다. 메모리에는 한 청크만 남으므로
+분석 호스트 메모리보다 큰 로그도 처리할 수 있습니다. 압축 파일(.gz/.bz2/.xz)도 그대로 읽습니다.
+
+병렬 분석 워커용으로 split_ranges가 파일을 레코드 경계에 맞춘 바이트 범위로 나누고,
+byte_range를 주면 그 범위의 레코드만 읽습니다 (워커마다 파일 일부만 읽고 파싱).
+"""
+
+import io
+import json
+import os
+import re
+
+import pandas as pd
+
+from compressed_io import is_compressed, open_input, resolve_input
+
+# 자동 탐색 시 확인하는 파일 이름 (<로그>_logs.* 는 data/ 샘플, <로그>.* 는 생성기 출력)
+INPUT_PATTERNS = [
+    "{log}_logs.ndjson",
+    "{log}.ndjson",
+    "{log}.log",
+    "{log}_logs.csv",
+    "{log}.csv",
+    "{log}_logs.json",
+    "{log}.json",
+]
+
+_SEPARATOR = re.compile(r"[\s,]*")
+_SPLIT_BLOCK = 1024 * 1024
+# 레코드 시작 표시와 표시 시작부터 레코드 첫 바이트까지의 거리
+#   NDJSON: 줄바꿈 다음, JSON 배열: json.dump(indent=2) 모양에서 최상위 원소만 줄 앞 공백 2칸 + '{'
+#   (JSON 문자열 안의 줄바꿈은 항상 이스케이프되므로 원소 안에서는 나올 수 없음)
+_RECORD_MARKERS = {"ndjson": (b"\n", 1), "json": (b"\n  {", 3)}
+
+
+def find_log_file(data_dir, log_name):
+    """data_dir에서 log_name 로그 파일 경로 찾기 (INPUT_PATTERNS 순서, 압축 파일 포함)"""
+    for pattern in INPUT_PATTERNS:
+        path = resolve_input(os.path.join(data_dir, pattern.format(log=log_name)))
+        if path is not None:
+            return path
+    raise FileNotFoundError(f"{data_dir}에 {log_name} 로그 파일이 없습니다.")
+
+
+def detect_format(path):
+    """파일 형식 판별 - 확장자와 관계없이 첫 글자로 JSON 배열('[') / NDJSON('{') / CSV(그 밖, 헤더 행) 구분
+
+    생성기의 --format csv 출력도 <로그>.log 이름으로 저장되므로 확장자로는 구분할 수 없습니다.
+    """
+    with open_input(path) as f:
+        head = f.read(4096).lstrip("\ufeff \t\r\n")
+    if head.startswith("["):
+        return "json"
+    if head.startswith("{") or not head:
+        return "ndjson"
+    return "csv"
+
+
+def _iter_ndjson(f):
+    for line in f:
+        if line.strip():
+            yield json.loads(line.decode("utf-8"))
+
+
+def _iter_json_array(f, block_size=1024 * 1024):
+    """JSON 배열 파일의 원소를 block_size 문자씩 읽으며 하나씩 반환"""
+    decoder = json.JSONDecoder()
+    buffer = f.read(block_size).lstrip()
+    if not buffer.startswith("["):
+        raise ValueError("JSON 배열 파일이 아닙니다.")
+    pos = 1
+    while True:
+        pos = _SEPARATOR.match(buffer, pos).end()
+        if pos < len(buffer) and buffer[pos] == "]":
+            return
+        try:
+            if pos == len(buffer):
+                raise json.JSONDecodeError("버퍼 끝", buffer, pos)
+            record, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # 원소가 블록 경계에서 잘림 -> 다음 블록을 이어 붙여 다시 시도
+            more = f.read(block_size)
+            if not more:
+                raise ValueError("JSON 배열이 중간에 끝났습니다.") from None
+            buffer = buffer[pos:] + more
+            pos = 0
+            continue
+        yield record
+
+
+def _record_chunks(records, columns, chunk_rows):
+    chunk = {column: [] for column in columns}
+    count = 0
+    for record in records:
+        for column, values in chunk.items():
+            values.append(record.get(column))
+        count += 1
+        if count == chunk_rows:
+            yield chunk
+            chunk = {column: [] for column in columns}
+            count = 0
+    if count:
+        yield chunk
+
+
+def iter_column_chunks(path, columns, chunk_rows=100000, fmt=None, byte_range=None):
+    """path 로그를 chunk_rows건씩 {컬럼: 값 리스트(또는 Series)} 청크로 반환
+
+    fmt(ndjson/csv/json)를 주지 않으면 detect_format으로 판별합니다.
+    byte_range=(시작, 끝)이면 split_ranges가 나눈 범위 하나의 레코드만 반환합니다.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt == "csv":
+        with _open_range(path, fmt, byte_range, newline="") as f:
+            for frame in pd.read_csv(f, usecols=columns, chunksize=chunk_rows):
+                yield {column: frame[column] for column in columns}
+        return
+    if fmt == "json":
+        with _open_range(path, fmt, byte_range) as f:
+            yield from _record_chunks(_iter_json_array(f), columns, chunk_rows)
+        return
+    # NDJSON은 바이너리로 읽어 줄마다 디코딩
+    with _open_range(path, fmt, byte_range, binary=True) as f:
+        yield from _record_chunks(_iter_ndjson(f), columns, chunk_rows)
+
+
+def split_ranges(path, parts, fmt=None):
+    """path 로그를 최대 parts개의 (시작, 끝) 바이트 범위로 나눔 (끝이 None이면 파일 끝까지)
+
+    경계는 항상 레코드 시작이므로 범위마다 iter_column_chunks(byte_range=...)로 따로 읽어도
+    레코드가 잘리거나 겹치지 않고, 범위 순서대로 이으면 파일 전체의 레코드 순서와 같습니다.
+      - NDJSON: 줄 시작 (목표 위치에서 다음 줄바꿈만 찾음)
+      - CSV: 따옴표 밖의 줄 시작 (따옴표 안 줄바꿈을 피하려고 경계 앞까지 따옴표 개수만 셈)
+      - JSON 배열: 최상위 원소 시작 (indent 없이 한 줄로 쓴 배열은 나누지 않음)
+    압축 파일은 중간부터 읽을 수 없으므로 [(0, None)] 하나를 반환합니다.
+    """
+    fmt = fmt or detect_format(path)
+    path = resolve_input(path)
+    if parts <= 1 or is_compressed(path):
+        return [(0, None)]
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        first = _first_record(f, fmt)
+        targets = [max(first, size * i // parts) for i in range(1, parts)]
+        if fmt == "csv":
+            starts = _csv_row_starts(f, first, targets)
+        else:
+            marker, lead = _RECORD_MARKERS[fmt]
+            starts = [_next_record(f, target, marker, lead) for target in targets]
+    bounds = sorted({first, *(start for start in starts if start is not None and start < size)})
+    return list(zip(bounds, bounds[1:] + [None]))
+
+
+def _first_record(f, fmt):
+    """첫 레코드의 바이트 위치 (CSV는 헤더 다음 줄, JSON 배열은 '[' 다음)"""
+    f.seek(0)
+    if fmt == "csv":
+        return len(f.readline())
+    if fmt == "json":
+        return f.read(_SPLIT_BLOCK).index(b"[") + 1
+    return 0
+
+
+def _next_record(f, target, marker, lead):
+    """target 이후(target 포함) 첫 레코드 시작 위치 - marker 위치 + lead (없으면 None)"""
+    position = max(target - lead, 0)
+    f.seek(position)
+    carry = b""
+    while True:
+        block = f.read(_SPLIT_BLOCK)
+        if not block:
+            return None
+        data = carry + block
+        index = data.find(marker)
+        if index >= 0:
+            return position - len(carry) + index + lead
+        # 블록 경계에 걸친 marker를 찾도록 끝부분을 다음 블록 앞에 붙임
+        carry = data[len(data) - len(marker) + 1 :]
+        position += len(block)
+
+
+def _csv_row_starts(f, first, targets):
+    """targets 각각에 대해 그 이후 첫 CSV 행 시작 위치 (따옴표 밖 줄바꿈 다음, 없으면 None)
+
+    RFC 4180의 이스케이프("")도 따옴표 2개이므로 앞의 따옴표 개수가 홀수인 줄바꿈은 필드 안입니다.
+    target 앞까지는 따옴표 개수만 세고(bytes.count), target부터 따옴표 밖 줄바꿈을 찾습니다.
+    """
+    starts = []
+    position, quotes = first, 0
+    for target in targets:
+        f.seek(position)
+        while position < target:
+            block = f.read(min(_SPLIT_BLOCK, target - position))
+            if not block:
+                break
+            quotes += block.count(b'"')
+            position += len(block)
+        starts.append(_csv_next_row(f, position, quotes % 2))
+    return starts
+
+
+def _csv_next_row(f, position, inside):
+    """position부터 따옴표 밖 첫 줄바꿈 다음 위치 (inside: position에서 따옴표 필드 안인지)"""
+    f.seek(position)
+    while True:
+        block = f.read(_SPLIT_BLOCK)
+        if not block:
+            return None
+        index = 0
+        while True:
+            newline = block.find(b"\n", index)
+            inside ^= block.count(b'"', index, len(block) if newline < 0 else newline) % 2
+            if newline < 0:
+                break
+            if not inside:
+                return position + newline + 1
+            index = newline + 1
+        position += len(block)
+
+
+def _open_range(path, fmt, byte_range, binary=False, newline=None):
+    """byte_range 부분만 읽는 파일 객체 (없으면 open_input)
+
+    범위를 혼자 파싱할 수 있도록 CSV는 파일의 헤더 행을, JSON 배열은 '['와 ']'를 앞뒤에 붙입니다.
+    """
+    if byte_range is None or byte_range == (0, None):
+        return open_input(path, newline=newline, binary=binary)
+    path = resolve_input(path)
+    start, end = byte_range
+    prefix = suffix = b""
+    if fmt == "csv":
+        with open(path, "rb") as f:
+            prefix = f.readline()
+    elif fmt == "json":
+        prefix, suffix = b"[", b"]"
+    stream = io.BufferedReader(_ByteRange(path, start, end, prefix, suffix), _SPLIT_BLOCK)
+    if binary:
+        return stream
+    return io.TextIOWrapper(stream, encoding="utf-8", newline=newline)
+
+
+class _ByteRange(io.RawIOBase):
+    """파일의 [start, end) 바이트 앞뒤에 prefix/suffix를 붙여 읽는 스트림 (end가 None이면 파일 끝까지)"""
+
+    def __init__(self, path, start, end, prefix=b"", suffix=b""):
+        self._file = open(path, "rb")
+        self._file.seek(start)
+        self._remaining = None if end is None else end - start
+        self._parts = [prefix, suffix]
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        view = memoryview(buffer)
+        if self._parts[0]:
+            return self._read_part(view, 0)
+        size = len(view) if self._remaining is None else min(len(view), self._remaining)
+        count = self._file.readinto(view[:size]) if size else 0
+        if count:
+            if self._remaining is not None:
+                self._remaining -= count
+            return count
+        return self._read_part(view, 1)
+
+    def _read_part(self, view, index):
+        part = self._parts[index]
+        count = min(len(view), len(part))
+        view[:count] = part[:count]
+        self._parts[index] = part[count:]
+        return count
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def iter_frames(path, chunk_rows=100000, fmt=None):
+    """path 로그를 chunk_rows건씩 모든 컬럼을 담은 DataFrame으로 반환 (읽을 컬럼을 미리 모를 때)"""
+    fmt = fmt or detect_format(path)
+    if fmt == "csv":
+        with open_input(path, newline="") as f:
+            yield from pd.read_csv(f, chunksize=chunk_rows)
+        return
+    with open_input(path, binary=fmt == "ndjson") as f:
+        records = _iter_json_array(f) if fmt == "json" else _iter_ndjson(f)
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) == chunk_rows:
+                yield pd.DataFrame(chunk)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk)
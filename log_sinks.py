@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+레코드 청크 sink 모음
+생성기가 청크 단위로 내보내는 레코드를 JSON 배열 / NDJSON / CSV 파일에 이어서 기록합니다.
+한 번에 한 청크만 메모리에 두므로 생성 건수와 관계없이 메모리 사용량이 일정하며,
+compression(gzip/bz2/lzma)을 주면 compressed_io의 블록 압축 writer로 기록합니다.
+AsyncSink로 감싸면 기록을 별도 스레드에서 처리해 생성과 디스크 I/O가 겹쳐 진행됩니다.
+FanOutSink는 같은 청크를 여러 형식 sink에 차례로 기록합니다(한 번 생성해 JSON + CSV + NDJSON).
+"""
+
+import csv
+import json
+import queue
+import threading
+import time
+from operator import itemgetter
+
+from compressed_io import open_input, open_output, sync_output, truncate_output
+from log_writers import NDJSONWriter
+
+# 로그 타입별 CSV 컬럼 순서 (generate_*_logs 레코드 필드 순서와 동일)
+CSV_SCHEMAS = {
+    "session": [
+        "log_id",
+        "user_id",
+        "session_id",
+        "login_time",
+        "logout_time",
+        "session_duration_seconds",
+        "device",
+        "os_version",
+        "app_version",
+        "ip_address",
+        "country",
+        "timestamp",
+    ],
+    "ingame_action": [
+        "log_id",
+        "user_id",
+        "session_id",
+        "timestamp",
+        "action_type",
+        "stage",
+        "region",
+        "quest_id",
+        "skill_used",
+        "experience_gained",
+        "level",
+    ],
+    "item": [
+        "log_id",
+        "user_id",
+        "session_id",
+        "timestamp",
+        "action_type",
+        "item_id",
+        "item_name",
+        "quantity",
+        "price",
+        "currency",
+        "item_level",
+        "rarity",
+    ],
+    "payment": [
+        "log_id",
+        "user_id",
+        "session_id",
+        "timestamp",
+        "transaction_id",
+        "product_id",
+        "product_name",
+        "amount",
+        "currency",
+        "payment_method",
+        "status",
+        "country",
+    ],
+    "error": [
+        "log_id",
+        "user_id",
+        "session_id",
+        "timestamp",
+        "error_type",
+        "error_code",
+        "error_message",
+        "severity",
+        "device",
+        "os_version",
+        "app_version",
+        "stack_trace",
+    ],
+}
+
+
+class RecordSink:
+    """청크 sink 기본 클래스 - 첫 레코드가 들어올 때 파일을 열어 빈 출력이면 파일을 만들지 않음"""
+
+    # True면 ColumnBatch를 dict 레코드로 풀지 않고 열 단위로 바로 기록
+    columnar = False
+
+    def __init__(self, filepath, compression=None, compress_workers=None, resume=None):
+        self.filepath = filepath
+        self.compression = compression
+        self.compress_workers = compress_workers
+        self.records_written = 0
+        # 압축 시 BlockCompressedWriter (요약 출력용)
+        self.compressor = None
+        self._file = None
+        if resume and resume[1]:
+            # resume = checkpoint()가 반환한 (파일 위치, 기록 건수, 원본 바이트)
+            offset, self.records_written, _ = resume
+            truncate_output(filepath, offset)
+            self._reopen(resume)
+
+    def write(self, records):
+        """레코드 iterable(리스트, ColumnBatch 등) 하나를 기록하고 기록한 건수 반환"""
+        count = 0
+        for record in records:
+            if self._file is None:
+                self._open(record)
+            self._write_record(record)
+            count += 1
+        self.records_written += count
+        return count
+
+    def _open(self, first_record, mode="w"):
+        self._file = open_output(
+            self.filepath, self.compression, mode, newline="", workers=self.compress_workers
+        )
+        if self.compression:
+            self.compressor = self._file.buffer
+
+    def _reopen(self, resume):
+        """체크포인트 위치에서 잘라 낸 파일을 이어 쓰기로 열기 (헤더 등은 이미 기록되어 있음)"""
+        self._open(None, mode="a")
+
+    def _write_record(self, record):
+        raise NotImplementedError
+
+    def checkpoint(self):
+        """기록한 내용을 디스크에 내리고 (파일 위치, 기록 건수, 원본 바이트) 반환
+
+        파일 위치는 닫는 괄호 같은 마무리 기록을 뺀 위치이며, resume으로 넘기면 그 위치부터 이어 씁니다.
+        """
+        if self._file is None:
+            return 0, self.records_written, 0
+        self._file.flush()
+        return sync_output(self._file.buffer), self.records_written, 0
+
+    def _finish(self):
+        """닫기 직전 마무리 기록 (JSON 배열의 닫는 괄호 등)"""
+
+    def close(self):
+        if self._file is None or self._file.closed:
+            return
+        self._finish()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class JSONArraySink(RecordSink):
+    """json.dump(records, indent=2)와 같은 모양의 JSON 배열을 레코드 단위로 기록"""
+
+    def _open(self, first_record, mode="w"):
+        super()._open(first_record, mode)
+        self._file.write("[")
+        self._separator = "\n  "
+
+    def _reopen(self, resume):
+        super()._open(None, mode="a")
+        self._separator = ",\n  "
+
+    def _write_record(self, record):
+        text = json.dumps(record, ensure_ascii=False, indent=2)
+        self._file.write(self._separator)
+        self._file.write(text.replace("\n", "\n  "))
+        self._separator = ",\n  "
+
+    def _finish(self):
+        self._file.write("\n]")
+
+
+class CSVSink(RecordSink):
+    """고정 컬럼 순서로 튜플 행을 기록하는 CSV sink
+
+    schema(컬럼 목록)가 없으면 첫 레코드의 키를 헤더로 쓰고, schema에 없는 키가 첫 레코드에 있으면
+    (--time-format both의 epoch_ms 등) 뒤에 붙입니다. 행마다 키를 찾는 DictWriter 대신
+    itemgetter로 값 튜플을 만들고, ColumnBatch는 dict를 조립하지 않고 열을 바로 묶어 기록합니다.
+    """
+
+    columnar = True
+
+    def __init__(
+        self, filepath, compression=None, compress_workers=None, schema=None, resume=None
+    ):
+        self.schema = schema
+        super().__init__(filepath, compression, compress_workers, resume)
+
+    def write(self, records):
+        if not hasattr(records, "rows"):
+            return super().write(records)
+        count = len(records)
+        if count:
+            if self._file is None:
+                self._open(records.columns)
+            self._writer.writerows(records.rows(self.fields))
+            self.records_written += count
+        return count
+
+    def _open(self, first_record, mode="w"):
+        super()._open(first_record, mode)
+        schema = list(self.schema or [])
+        self._set_fields(schema + [key for key in first_record if key not in schema])
+        self._writer.writerow(self.fields)
+
+    def _reopen(self, resume):
+        # 컬럼 순서는 이미 기록된 헤더를 그대로 따름
+        with open_input(self.filepath, newline="") as f:
+            header = next(csv.reader(f))
+        super()._open(None, mode="a")
+        self._set_fields(header)
+
+    def _set_fields(self, fields):
+        self.fields = fields
+        if len(fields) == 1:
+            field = fields[0]
+            self._row = lambda record: (record[field],)
+        else:
+            self._row = itemgetter(*fields)
+        self._writer = csv.writer(self._file)
+
+    def _write_record(self, record):
+        self._writer.writerow(self._row(record))
+
+
+class NDJSONSink(RecordSink):
+    """NDJSONWriter 기반 sink (flush_bytes/flush_interval은 NDJSONWriter와 같음)"""
+
+    def __init__(
+        self,
+        filepath,
+        compression=None,
+        compress_workers=None,
+        flush_bytes=1024 * 1024,
+        flush_interval=1.0,
+        resume=None,
+    ):
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        super().__init__(filepath, compression, compress_workers, resume)
+
+    @property
+    def bytes_written(self):
+        return self._file.bytes_written if self._file else 0
+
+    def _open(self, first_record, mode="w"):
+        self._file = NDJSONWriter(
+            self.filepath,
+            self.flush_bytes,
+            self.flush_interval,
+            mode=mode,
+            compression=self.compression,
+            compress_workers=self.compress_workers,
+        )
+        self.compressor = self._file.compressor
+
+    def _reopen(self, resume):
+        self._open(None, mode="a")
+        self._file.bytes_written = resume[2]
+
+    def _write_record(self, record):
+        self._file.write(record)
+
+    def checkpoint(self):
+        if self._file is None:
+            return 0, self.records_written, 0
+        return self._file.sync(), self.records_written, self._file.bytes_written
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+SINKS = {"json": JSONArraySink, "ndjson": NDJSONSink, "csv": CSVSink}
+
+
+def open_sink(fmt, filepath, compression=None, compress_workers=None, **options):
+    """형식 이름(json/ndjson/csv)으로 sink 생성"""
+    return SINKS[fmt](filepath, compression, compress_workers, **options)
+
+
+_DONE = object()
+
+
+class AsyncSink:
+    """별도 writer 스레드에서 직렬화/압축/기록을 처리하는 sink 래퍼
+
+    write()는 청크를 크기 max_pending인 큐에 넣고 바로 돌아오므로 생성 스레드는 다음 청크를 만들고,
+    writer 스레드는 이전 청크를 기록합니다(max_pending=2면 이중 버퍼). 디스크가 밀려 큐가 차면
+    write()가 빈 자리가 날 때까지 기다려 메모리 사용량이 max_pending 청크를 넘지 않습니다.
+
+    producer_wait(생성 측이 큐 자리를 기다린 시간)가 크면 I/O 병목,
+    writer_wait(writer가 다음 청크를 기다린 시간)가 크면 생성(CPU) 병목입니다.
+    write_time은 writer 스레드가 직렬화/압축/기록에 쓴 시간입니다.
+    """
+
+    def __init__(self, sink, max_pending=2):
+        self.sink = sink
+        self.producer_wait = 0.0
+        self.writer_wait = 0.0
+        self.write_time = 0.0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            started = time.perf_counter()
+            chunk = self._queue.get()
+            self.writer_wait += time.perf_counter() - started
+            if chunk is _DONE:
+                break
+            if self._error is None:  # 오류 이후 청크는 버려 생성 측이 큐에서 막히지 않게 함
+                started = time.perf_counter()
+                try:
+                    self.sink.write(chunk)
+                except BaseException as exc:  # noqa: BLE001 - close()에서 생성 스레드로 다시 던짐
+                    self._error = exc
+                self.write_time += time.perf_counter() - started
+            self._queue.task_done()
+
+    def write(self, records):
+        """청크를 writer 스레드로 넘김 (큐가 가득 차 있으면 대기)"""
+        if self._error is not None:
+            raise self._error
+        started = time.perf_counter()
+        self._queue.put(records)
+        self.producer_wait += time.perf_counter() - started
+
+    def checkpoint(self):
+        """큐에 남은 청크를 모두 기록한 뒤 감싼 sink의 checkpoint() 결과 반환"""
+        self._queue.join()
+        if self._error is not None:
+            raise self._error
+        return self.sink.checkpoint()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(_DONE)
+            self._thread.join()
+        self.sink.close()
+        if self._error is not None:
+            raise self._error
+
+    @property
+    def records_written(self):
+        return self.sink.records_written
+
+    @property
+    def compressor(self):
+        return self.sink.compressor
+
+    @property
+    def bytes_written(self):
+        return self.sink.bytes_written
+
+    def wait_summary(self):
+        bound = "디스크(I/O) 병목" if self.producer_wait > self.writer_wait else "생성(CPU) 병목"
+        return (
+            f"큐 대기 - 생성 측 {self.producer_wait:.2f}s, 기록 측 {self.writer_wait:.2f}s ({bound})"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class FanOutSink:
+    """같은 청크를 여러 형식 sink에 한 번에 기록하는 sink
+
+    레코드는 한 번만 생성되고, ColumnBatch는 dict 레코드로 한 번만 풀어 dict가 필요한 sink들이
+    같은 리스트를 공유합니다(열 단위 sink에는 배치를 그대로 넘김). 형식별 기록은 호출한 스레드에서
+    차례로 처리합니다 - JSON/CSV 인코딩은 GIL을 잡고 도므로 형식마다 스레드를 두어도 겹쳐 진행되지
+    않고 스레드 전환 비용만 늘어납니다. 절약되는 것은 레코드를 형식마다 다시 생성하는 시간입니다.
+    """
+
+    def __init__(self, sinks):
+        self.sinks = list(sinks)
+        self.write_time = 0.0
+
+    def write(self, records):
+        """청크를 모든 sink에 기록하고 청크 건수 반환"""
+        started = time.perf_counter()
+        shared = records
+        if hasattr(records, "to_records") and not all(sink.columnar for sink in self.sinks):
+            shared = records.to_records()
+        for sink in self.sinks:
+            sink.write(records if sink.columnar else shared)
+        self.write_time += time.perf_counter() - started
+        return len(shared)
+
+    def checkpoint(self):
+        """sink 순서대로 checkpoint() 결과 목록 반환"""
+        return [sink.checkpoint() for sink in self.sinks]
+
+    def close(self):
+        error = None
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except BaseException as exc:  # noqa: BLE001 - 나머지 sink도 닫은 뒤 다시 던짐
+                error = error or exc
+        if error is not None:
+            raise error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+딕셔너리 인코딩 로그 테이블 로더
+세션/인게임 액션/아이템/결제/에러 로그를 메모리를 적게 쓰는 DataFrame으로 읽습니다.
+
+- user_id / session_id / log_id: 다섯 테이블이 공유하는 ID 사전(IdDictionary)의 int32 코드
+  (테이블 간 조인/isin이 문자열 해시 대신 정수 비교가 됨, 빈 값은 -1)
+- 시각 컬럼(timestamp, login_time, logout_time): datetime64
+- 그 밖의 문자열 컬럼(device, os_version, stage, rarity, severity ...): 범주형(category)
+- 정수 컬럼: 값 범위에 맞는 가장 작은 정수형
+
+파일은 log_reader.iter_frames로 청크 단위로 읽어 바로 압축하므로, 원본 문자열 테이블 전체가
+메모리에 올라가지 않습니다. ID 사전은 적재가 끝나면 값을 고정 폭 바이트 배열로만 보관합니다.
+
+파싱한 테이블은 파일별 ID 사전과 함께 column_cache에 저장해 두고, 원본이 그대로면 다음 실행부터
+파싱 없이 mmap으로 읽은 뒤 ID 코드만 공용 사전 코드로 바꿉니다 (cache=False면 캐시를 쓰지 않음).
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_integer_dtype, is_string_dtype, union_categoricals
+
+import column_cache
+from log_reader import iter_frames
+
+ID_COLUMNS = ("user_id", "session_id", "log_id")
+TIME_COLUMNS = ("timestamp", "login_time", "logout_time")
+_HASH_MULTIPLIERS = np.random.default_rng(0).integers(1, 2**63, 64, dtype=np.uint64) | np.uint64(1)
+
+
+class IdDictionary:
+    """문자열 ID <-> int32 코드 사전 (여러 테이블이 공유)
+
+    적재 중에는 ID -> 코드 dict로 코드를 찾고, compact() 뒤에는 dict를 버리고
+    코드 -> ID 바이트 배열(values, UUID당 36바이트)만 남깁니다. 다시 encode하면 dict를 새로 만듭니다.
+    """
+
+    def __init__(self):
+        self.values = np.zeros(0, dtype="S1")  # 코드 -> ID (utf-8 바이트)
+        self._codes = {}  # ID -> 코드 (compact() 뒤에는 None)
+        self._hashes = None  # add()용 값 해시 (values와 같은 순서)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, code):
+        return self.values[code].decode("utf-8")
+
+    def encode(self, ids):
+        """ID 배열 -> 코드 배열 (처음 보는 ID는 새 코드, 빈 값은 -1)"""
+        chunk_codes, uniques = pd.factorize(np.asarray(ids, dtype=object))
+        if self._codes is None:
+            self._codes = {value: code for code, value in enumerate(self.decode(range(len(self))))}
+        index = self._codes
+        start = len(index)
+        mapped = np.fromiter(
+            (index.setdefault(str(value), len(index)) for value in uniques),
+            dtype=np.int32,
+            count=len(uniques),
+        )
+        new = uniques[mapped >= start]
+        if len(new):
+            added = np.array([str(value).encode("utf-8") for value in new], dtype="S")
+            self.values = np.concatenate([self.values, added])
+        codes = mapped[chunk_codes]
+        codes[chunk_codes < 0] = -1
+        return codes
+
+    def add(self, values):
+        """다른 사전의 값 배열(코드 순서) -> 이 사전의 코드 배열
+
+        이 사전이 비어 있으면 values를 그대로 가져오고(복사 없음) None을 반환합니다 (코드가 같음).
+        """
+        if not len(self):
+            self.values = values
+            self._codes = None
+            self._hashes = None
+            return None
+        # 바이트 값을 uint64 해시로 조회하고 찾은 값은 바이트로 다시 비교 (해시 충돌 시 바이트 값 조회)
+        known = self._value_hashes()
+        hashes = _hashes(values)
+        index = pd.Index(known)
+        codes = index.get_indexer(hashes) if index.is_unique else None
+        found = codes >= 0 if codes is not None else None
+        if codes is None or not (self.values[codes[found]] == values[found]).all():
+            codes = pd.Index(self.values).get_indexer(values)
+            found = codes >= 0
+        new = ~found
+        codes[new] = np.arange(len(self), len(self) + new.sum())
+        self.values = np.concatenate([self.values, values[new]])
+        self._codes = None
+        self._hashes = np.concatenate([known, hashes[new]])
+        return codes.astype(np.int32)
+
+    def _value_hashes(self):
+        if self._hashes is None or len(self._hashes) != len(self.values):
+            self._hashes = _hashes(self.values)
+        return self._hashes
+
+    def decode(self, codes):
+        """코드 배열 -> ID 문자열 리스트 (-1은 None)"""
+        return [self.values[code].decode("utf-8") if code >= 0 else None for code in codes]
+
+    def compact(self):
+        """ID -> 코드 dict를 버려 사전 메모리를 값 배열만큼으로 줄임"""
+        self._codes = None
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+
+class LogTables:
+    """로그 타입 -> 압축 DataFrame과 ID 컬럼별 공용 사전
+
+    tables["session"]처럼 꺼내 쓰고, ID 코드는 decode("user_id", codes)로 문자열로 되돌립니다.
+    """
+
+    def __init__(self, cache=True):
+        self.cache = cache
+        self.tables = {}
+        self.dictionaries = {column: IdDictionary() for column in ID_COLUMNS}
+
+    def __getitem__(self, log_name):
+        return self.tables[log_name]
+
+    def __contains__(self, log_name):
+        return log_name in self.tables
+
+    def load(self, log_name, path, chunk_rows=100000):
+        """path 로그(NDJSON/CSV/JSON 배열, 압축 포함)를 읽어 log_name 테이블로 추가"""
+        cached = column_cache.read(path) if self.cache else None
+        if cached is None:
+            cached = read_table(path, chunk_rows)
+            if self.cache:
+                column_cache.write(path, *cached)
+        table, ids = cached
+        for column, values in ids.items():
+            # 파일 안 코드 -> 공용 사전 코드
+            mapping = self.dictionaries[column].add(values)
+            if mapping is not None:
+                codes = table[column].to_numpy()
+                table[column] = np.where(codes >= 0, mapping[codes], -1).astype(np.int32)
+        self.tables[log_name] = table
+        return table
+
+    def decode(self, column, codes):
+        """ID 컬럼 코드 배열 -> 문자열 리스트"""
+        return self.dictionaries[column].decode(codes)
+
+    def compact(self):
+        for dictionary in self.dictionaries.values():
+            dictionary.compact()
+
+    def memory_usage(self):
+        """테이블과 ID 사전이 차지하는 바이트 수"""
+        tables = sum(int(table.memory_usage(deep=True).sum()) for table in self.tables.values())
+        return tables + sum(dictionary.nbytes for dictionary in self.dictionaries.values())
+
+
+def load_tables(paths, chunk_rows=100000, cache=True):
+    """로그 타입 -> 파일 경로 dict를 한 사전으로 인코딩해 읽은 LogTables"""
+    tables = LogTables(cache)
+    for log_name, path in paths.items():
+        tables.load(log_name, path, chunk_rows)
+    tables.compact()
+    return tables
+
+
+def read_table(path, chunk_rows=100000):
+    """path 로그 -> (압축 테이블, ID 컬럼 -> 파일 안 코드 순서의 ID 바이트 배열)"""
+    dictionaries = {column: IdDictionary() for column in ID_COLUMNS}
+    table = _concat([_compact(frame, dictionaries) for frame in iter_frames(path, chunk_rows)])
+    ids = {column: dictionaries[column].values for column in ID_COLUMNS if column in table}
+    return table, ids
+
+
+def counts_in_order(values):
+    """값 -> 건수 dict (collections.Counter처럼 처음 등장한 순서, 빈 값 제외)"""
+    codes, uniques = pd.factorize(values)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    return dict(zip(uniques.tolist(), counts.tolist()))
+
+
+def _hashes(values):
+    """고정 폭 바이트 배열 -> uint64 해시 (8바이트 단어마다 위치별 홀수 상수를 곱해 더함)
+
+    끝의 0 바이트는 해시에 영향이 없으므로 폭이 다른 배열(S36, S40)에서도 같은 값은 같은 해시입니다.
+    """
+    words = -(-values.dtype.itemsize // 8)
+    matrix = values.astype(f"S{words * 8}").view(np.uint64).reshape(len(values), words)
+    hashes = np.zeros(len(values), dtype=np.uint64)
+    for position in range(words):
+        hashes += matrix[:, position] * _HASH_MULTIPLIERS[position % len(_HASH_MULTIPLIERS)]
+    return hashes
+
+
+def _compact(frame, dictionaries):
+    data = {}
+    for column in frame.columns:
+        values = frame[column]
+        if column in dictionaries:
+            data[column] = dictionaries[column].encode(values)
+        elif column in TIME_COLUMNS and is_string_dtype(values):
+            data[column] = _datetimes(values)
+        elif is_string_dtype(values):
+            data[column] = values.astype("category")
+        elif is_integer_dtype(values):
+            data[column] = pd.to_numeric(values, downcast="integer")
+        else:
+            data[column] = values
+    return pd.DataFrame(data)
+
+
+def _datetimes(values):
+    try:
+        return pd.to_datetime(values, format="ISO8601")
+    except (ValueError, TypeError):
+        # ISO 8601이 아니거나 시간대가 섞인 시각은 문자열 범주형으로 둠
+        return values.astype("category")
+
+
+def _concat(frames):
+    """압축한 청크들을 이어 붙임 - 범주형은 범주를 합쳐 유지하고, 일부 청크에 없는 컬럼은 빈 값으로 채움"""
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0]
+    columns = list(dict.fromkeys(column for frame in frames for column in frame.columns))
+    data = {}
+    for column in columns:
+        sample = next(frame[column] for frame in frames if column in frame.columns)
+        parts = [
+            frame[column] if column in frame.columns else _missing(column, sample, len(frame))
+            for frame in frames
+        ]
+        if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            data[column] = union_categoricals(parts)
+        else:
+            data[column] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(data)
+
+
+def _missing(column, sample, size):
+    if column in ID_COLUMNS:
+        return pd.Series(np.full(size, -1, dtype=np.int32))
+    return sample.iloc[:0].reindex(range(size))
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+로그 타입 목록과 청크 단위 생성 루프
+generate_game_logs, event_stream, sharded_generation이 함께 쓰는 부작용 없는 모듈입니다.
+(generate_game_logs는 import 시 Faker/random 시드를 다시 설정하므로 스크립트 실행 중에 다시 import하면
+이미 만든 유저 모집단 이후의 난수열이 바뀝니다.)
+"""
+
+import instrumentation
+
+# (로그 이름, 생성 메서드) - 세션 로그가 가장 먼저 생성되어야 함
+LOG_TYPES = [
+    ("session", "generate_session_logs"),
+    ("ingame_action", "generate_ingame_action_logs"),
+    ("item", "generate_item_logs"),
+    ("payment", "generate_payment_logs"),
+    ("error", "generate_error_logs"),
+]
+
+
+def iter_log_chunks(source, method, count, chunk_size=100000, metrics=instrumentation.DISABLED):
+    """source(GameLogGenerator 또는 NumpyBatchEngine)의 generate_*_logs를 chunk_size 단위로 나눠 호출
+
+    청크(레코드 리스트 또는 ColumnBatch)를 차례로 반환하므로 전체 결과를 한꺼번에 들고 있지 않습니다.
+    세션/결제 로그는 기본 모드에서 청크마다 일부 반복이 버려지므로 청크 크기가 반복 횟수 기준입니다.
+    """
+    generate = getattr(source, method)
+    remaining = count
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        yield metrics.generated(generate, size)
+        remaining -= size
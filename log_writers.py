@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+게임 로그 파일 writer 모음
+GameLogGenerator가 생성한 레코드를 수집기(Kinesis Agent, Vector, Fluent Bit)가
+tail 할 수 있는 형태로 기록합니다.
+"""
+
+import json
+import time
+
+from compressed_io import BlockCompressedWriter, sync_output
+
+
+class NDJSONWriter:
+    """레코드를 한 줄에 하나씩(NDJSON) 기록하는 스트리밍 writer
+
+    레코드는 compact JSON 한 줄로 직렬화되어 내부 버퍼에 쌓이고,
+    버퍼 크기(flush_bytes) 또는 마지막 flush 이후 경과 시간(flush_interval)이
+    임계값을 넘으면 파일로 flush 됩니다. 전체 데이터를 메모리에 올리지 않으므로
+    생성 건수와 관계없이 메모리 사용량이 일정합니다.
+
+    compression(gzip/bz2/lzma)을 지정하면 BlockCompressedWriter로 블록 단위 압축해 기록하며,
+    이때 flush는 압축 블록이 찰 때까지 파일에 반영되지 않습니다. (수집기 tail 용도에는 비압축 사용)
+    """
+
+    def __init__(
+        self,
+        filepath,
+        flush_bytes=1024 * 1024,
+        flush_interval=1.0,
+        mode="w",
+        compression=None,
+        compress_workers=None,
+    ):
+        self.filepath = filepath
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.records_written = 0
+        self.bytes_written = 0
+
+        if compression in (None, "none"):
+            self.compressor = None
+            self._file = open(filepath, mode + "b")
+        else:
+            self.compressor = BlockCompressedWriter(
+                filepath, compression, workers=compress_workers, mode=mode
+            )
+            self._file = self.compressor
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._last_flush = time.monotonic()
+
+    def write(self, record):
+        """레코드 1건 기록하고 인코딩된 바이트 수 반환"""
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        data = (line + "\n").encode("utf-8")
+        self._buffer.append(data)
+        self._buffered_bytes += len(data)
+        self.records_written += 1
+
+        if (
+            self._buffered_bytes >= self.flush_bytes
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+        return len(data)
+
+    def write_many(self, records):
+        """iterable의 레코드를 순서대로 기록하고 기록한 건수 반환"""
+        count = 0
+        for record in records:
+            self.write(record)
+            count += 1
+        return count
+
+    def flush(self):
+        """버퍼에 쌓인 줄을 파일로 내보냄"""
+        if self._buffer:
+            self._file.write(b"".join(self._buffer))
+            self.bytes_written += self._buffered_bytes
+            self._buffer = []
+            self._buffered_bytes = 0
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def sync(self):
+        """버퍼를 모두 디스크에 내리고 파일 끝 위치(바이트) 반환 - 체크포인트용"""
+        self.flush()
+        return sync_output(self._file)
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
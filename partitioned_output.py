@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Hive 스타일 시간 파티션 출력
+이벤트를 timestamp 기준으로 <log_type>/dt=YYYY-MM-DD/hour=HH/part-N.json 파일에 나눠 기록합니다.
+S3에 그대로 올리면 Athena/Glue가 dt, hour 파티션으로 스캔 범위를 줄일 수 있으므로
+30일치 수 GB 데이터셋도 후처리 없이 한 번에 쿼리 가능한 구조로 생성됩니다.
+"""
+
+import os
+from collections import OrderedDict
+
+from compressed_io import output_path
+from log_writers import NDJSONWriter
+from session_store import from_epoch
+
+
+class PartitionedOutput:
+    """로그 타입/날짜/시간 파티션별 NDJSON writer
+
+    열린 writer는 최대 max_open_writers개만 LRU로 유지합니다. 밀려나 닫힌 파티션에 다시 쓸 때는
+    같은 part 파일에 이어 쓰고(append), part 파일이 roll_bytes(압축 전 기준)를 넘으면 다음 번호로 넘어갑니다.
+    샤드처럼 여러 프로세스가 같은 디렉토리에 쓸 때는 part_prefix를 서로 다르게 지정합니다.
+    """
+
+    def __init__(
+        self,
+        base_dir,
+        max_open_writers=64,
+        roll_bytes=128 * 1024 * 1024,
+        compression=None,
+        compress_workers=None,
+        part_prefix="part",
+    ):
+        self.base_dir = base_dir
+        self.max_open_writers = max_open_writers
+        self.roll_bytes = roll_bytes
+        self.compression = compression
+        self.compress_workers = compress_workers
+        self.part_prefix = part_prefix
+        self.records_written = 0
+        self.files_written = 0
+        self.reopened = 0
+
+        self._writers = OrderedDict()
+        # (log_name, 파티션) -> [현재 part 번호, 현재 part에 쓴 바이트]
+        self._parts = {}
+        self._partition_cache = {}
+
+    def partition_of(self, timestamp):
+        """timestamp(ISO 문자열 또는 epoch 밀리초) -> 'dt=YYYY-MM-DD/hour=HH'"""
+        if isinstance(timestamp, str):
+            hour_key = timestamp[:13]
+        else:
+            hour_key = timestamp // 3600000
+        partition = self._partition_cache.get(hour_key)
+        if partition is None:
+            if isinstance(hour_key, str):
+                partition = f"dt={hour_key[:10]}/hour={hour_key[11:13]}"
+            else:
+                partition = from_epoch(hour_key * 3600).strftime("dt=%Y-%m-%d/hour=%H")
+            self._partition_cache[hour_key] = partition
+        return partition
+
+    def write_many(self, log_name, records):
+        """레코드를 파티션별로 모아 기록하고 기록한 건수 반환
+
+        파티션마다 writer를 한 번만 꺼내 쓰므로 열린 writer 수보다 파티션이 많아도
+        배치 하나당 파일을 다시 여는 횟수는 파티션 수를 넘지 않습니다.
+        """
+        partition_of = self.partition_of
+        groups = {}
+        for record in records:
+            partition = partition_of(record["timestamp"])
+            group = groups.get(partition)
+            if group is None:
+                group = groups[partition] = []
+            group.append(record)
+
+        for partition, group in groups.items():
+            self._write_group((log_name, partition), group)
+        count = sum(len(group) for group in groups.values())
+        self.records_written += count
+        return count
+
+    def _write_group(self, key, records):
+        state = self._parts.setdefault(key, [0, 0])
+        writer = self._writer(key)
+        for record in records:
+            state[1] += writer.write(record)
+            if state[1] >= self.roll_bytes:
+                # 현재 part를 닫고 다음 part 번호로
+                self._writers.pop(key).close()
+                state[0] += 1
+                state[1] = 0
+                writer = self._writer(key)
+
+    def _writer(self, key):
+        writer = self._writers.get(key)
+        if writer is not None:
+            self._writers.move_to_end(key)
+            return writer
+
+        if len(self._writers) >= self.max_open_writers:
+            _, oldest = self._writers.popitem(last=False)
+            oldest.close()
+
+        log_name, partition = key
+        part, written = self._parts[key]
+        directory = os.path.join(self.base_dir, log_name, partition)
+        os.makedirs(directory, exist_ok=True)
+        filepath = output_path(
+            os.path.join(directory, f"{self.part_prefix}-{part:05d}.json"), self.compression
+        )
+        if written:
+            self.reopened += 1
+        else:
+            self.files_written += 1
+        writer = NDJSONWriter(
+            filepath,
+            mode="a" if written else "w",
+            compression=self.compression,
+            compress_workers=self.compress_workers,
+        )
+        self._writers[key] = writer
+        return writer
+
+    def save(self, records, filename):
+        """GameLogGenerator.save_to_*와 같은 호출 형태 (filename의 첫 '.' 앞이 로그 타입)"""
+        self.save_chunks([records], filename)
+
+    def save_chunks(self, chunks, filename):
+        """GameLogGenerator.save_chunks와 같은 호출 형태 - 청크마다 파티션별로 나눠 기록하고 건수 반환"""
+        log_name = filename.split(".")[0]
+        count = sum(self.write_many(log_name, chunk) for chunk in chunks)
+        if not count:
+            print(f"❌ {log_name} 저장 실패: 데이터가 없습니다.")
+            return 0
+        print(f"✅ {log_name} 파티션 저장 완료 ({count}건)")
+        return count
+
+    def close(self):
+        while self._writers:
+            _, writer = self._writers.popitem(last=False)
+            writer.close()
+
+    def summary(self):
+        partitions = len({partition for _, partition in self._parts})
+        return (
+            f"시간 파티션 {partitions}개, 파일 {self.files_written}개 "
+            f"(writer 재오픈 {self.reopened}회)"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
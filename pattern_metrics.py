@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+사용자 이탈 패턴 지표 엔진
+analyze_user_patterns의 6개 섹션(일별 활성 사용자, 스테이지별 사용자, 특별 무기 구매, 결제 패턴,
+세션 시간, 스테이지 6-7 이탈)을 계산합니다.
+
+각 컬럼은 한 번만 파싱합니다 (스테이지 번호는 고유값에만 정규식 적용, user_id는 네 테이블 공용 정수 코드,
+로그인 시각은 날짜 코드). 그 뒤 유저 코드로 인덱싱한 집계 배열(최대 스테이지, 결제/무기 구매/6-7 도달 여부,
+세션 시간 합계, 날짜/스테이지별 유저 비트맵)을 갱신하고 모든 섹션을 이 배열에서 벡터 연산으로 구합니다.
+
+집계는 청크 단위로 더할 수 있고(add) 다른 집계와 합칠 수 있으므로(merge), 전체 로그를 한 번에 올리는
+분석과 청크 단위 스트리밍 분석이 같은 리포트를 냅니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from log_reader import iter_column_chunks
+
+SPECIAL_WEAPON = "weapon_legendary_001"
+CHURN_STAGES = ("stage_06", "stage_07")
+# 이 스테이지 번호 이상을 기록한 유저는 6-7 구간을 넘어선 것으로 봄
+PAST_CHURN_STAGE = 8
+
+
+def stage_numbers(names):
+    """스테이지 이름 배열 -> 이름의 첫 숫자 정수 배열 (예: stage_07 -> 7)"""
+    return pd.Series(names, dtype=object).str.extract(r"(\d+)")[0].astype(int).to_numpy()
+
+
+class KeyedUserBitmap:
+    """키(날짜, 스테이지 이름) x 유저 코드 등장 여부 - 행이 키, 열이 유저 코드인 bool 2차원 배열"""
+
+    def __init__(self):
+        self.rows = {}  # 키 -> 행 번호
+        self.bits = np.zeros((0, 0), dtype=bool)
+
+    def resize(self, capacity):
+        """유저 열을 capacity개로 늘림"""
+        bits = np.zeros((self.bits.shape[0], capacity), dtype=bool)
+        bits[:, : self.bits.shape[1]] = self.bits
+        self.bits = bits
+
+    def rows_of(self, keys):
+        """키 목록 -> 행 번호 배열 (처음 보는 키는 행 추가)"""
+        rows = np.array([self.rows.setdefault(key, len(self.rows)) for key in keys], dtype=np.int64)
+        if len(self.rows) > self.bits.shape[0]:
+            bits = np.zeros((len(self.rows), self.bits.shape[1]), dtype=bool)
+            bits[: self.bits.shape[0]] = self.bits
+            self.bits = bits
+        return rows
+
+    def mark(self, keys, key_codes, codes):
+        """행마다 (keys[key_codes], codes) 칸 표시 - 키가 없는(factorize 코드 -1) 행은 제외"""
+        key_codes, codes = _without_missing(key_codes, codes)
+        rows = self.rows_of(keys)
+        self.bits.reshape(-1)[rows[key_codes] * self.bits.shape[1] + codes] = True
+
+    def merge(self, other, codes):
+        """other의 표시를 옮겨 담음 - codes는 other 유저 코드 -> 이 비트맵의 유저 코드"""
+        n = len(codes)
+        rows = self.rows_of(other.rows)
+        for row, other_row in zip(rows, other.rows.values()):
+            self.bits[row, codes[other.bits[other_row, :n]]] = True
+
+    def counts(self, n):
+        """키 -> 표시된 유저 수 (앞 n명 기준)"""
+        totals = self.bits[:, :n].sum(axis=1)
+        return {key: int(totals[row]) for key, row in self.rows.items()}
+
+
+class UserPatternMetrics:
+    """유저 코드별 집계와 그로부터 계산한 리포트 섹션
+
+    add(log_name, table)로 테이블 또는 청크를 더하고, merge(other)로 다른 청크/파티션의 집계를 합친 뒤
+    report()로 섹션 값을 계산합니다. table은 컬럼을 이름으로 꺼낼 수 있는 객체
+    (pandas DataFrame 또는 {컬럼: 배열} dict)이며 COLUMNS의 컬럼만 사용합니다.
+
+    user_dictionary를 주면 user_id 컬럼을 그 사전(log_tables.IdDictionary)의 정수 코드로 받고
+    리포트의 유저 목록만 문자열로 되돌립니다.
+    """
+
+    # 로그 타입별로 사용하는 컬럼
+    COLUMNS = {
+        "session": ["user_id", "login_time", "session_duration_seconds"],
+        "ingame_action": ["user_id", "stage"],
+        "item": ["user_id", "item_id"],
+        "payment": ["user_id"],
+    }
+    # 유저 코드로 인덱싱하는 배열 -> 빈 값
+    _USER_ARRAYS = {
+        "max_stage": -1,
+        "session_user": False,
+        "payer": False,
+        "weapon_buyer": False,
+        "reached_churn_stages": False,
+        "session_hours": 0.0,
+        "session_rows": 0,
+    }
+
+    def __init__(self, user_dictionary=None):
+        self.user_dictionary = user_dictionary
+        self.users = []  # 코드 -> user_id (처음 등장한 순서, user_dictionary가 있으면 사전 코드)
+        self._codes = {}  # user_id -> 코드
+        self._capacity = 0
+        for name, empty in self._USER_ARRAYS.items():
+            setattr(self, name, np.full(0, empty))
+        # 날짜(date) / 스테이지 이름 x 유저 코드 등장 여부
+        self.daily = KeyedUserBitmap()
+        self.stages = KeyedUserBitmap()
+        self.stage_values = {}  # 스테이지 이름 -> 번호
+        # 결제자/특별 무기 구매자 코드 (처음 등장한 순서)
+        self._payer_order = []
+        self._weapon_order = []
+
+    @classmethod
+    def from_tables(cls, tables, user_dictionary=None):
+        """로그 타입 -> 테이블 dict(또는 log_tables.LogTables) 전체를 한 번에 집계"""
+        metrics = cls(user_dictionary)
+        for log_name in cls.COLUMNS:
+            metrics.add(log_name, tables[log_name])
+        return metrics
+
+    def add(self, log_name, table):
+        """log_name 로그의 테이블(청크)을 집계에 더함"""
+        codes = self._encode(table["user_id"])
+        getattr(self, "_add_" + log_name)(table, codes)
+
+    def _add_session(self, table, codes):
+        self.session_user[codes] = True
+        hours = np.asarray(table["session_duration_seconds"], dtype=np.float64) / 3600
+        np.add.at(self.session_hours, codes, hours)
+        np.add.at(self.session_rows, codes, 1)
+        login_days = pd.to_datetime(pd.Series(table["login_time"])).dt.normalize()
+        day_codes, days = pd.factorize(login_days)
+        self.daily.mark([day.date() for day in days], day_codes, codes)
+
+    def _add_ingame_action(self, table, codes):
+        stage_codes, names = _factorize(table["stage"])
+        names = list(names)
+        new_names = [name for name in names if name not in self.stage_values]
+        if new_names:
+            self.stage_values.update(zip(new_names, stage_numbers(new_names).tolist()))
+        values = np.array([self.stage_values[name] for name in names], dtype=np.int64)
+        stage_codes, codes = _without_missing(stage_codes, codes)
+        np.maximum.at(self.max_stage, codes, values[stage_codes])
+        churn = np.isin(np.asarray(names, dtype=object), CHURN_STAGES)
+        self.reached_churn_stages[codes[churn[stage_codes]]] = True
+        self.stages.mark(names, stage_codes, codes)
+
+    def _add_item(self, table, codes):
+        weapon_rows = np.asarray(table["item_id"], dtype=object) == SPECIAL_WEAPON
+        self._flag(self.weapon_buyer, self._weapon_order, codes[weapon_rows])
+
+    def _add_payment(self, table, codes):
+        self._flag(self.payer, self._payer_order, codes)
+
+    def merge(self, other):
+        """다른 집계(다른 청크/파티션)를 이 집계에 합침"""
+        n = len(other.users)
+        codes = self._encode(other.users)  # other 코드 -> 이 집계의 코드 (서로 다름)
+        self.max_stage[codes] = np.maximum(self.max_stage[codes], other.max_stage[:n])
+        for name in ("session_user", "reached_churn_stages"):
+            getattr(self, name)[codes] |= getattr(other, name)[:n]
+        self.session_hours[codes] += other.session_hours[:n]
+        self.session_rows[codes] += other.session_rows[:n]
+        for order in other._payer_order:
+            self._flag(self.payer, self._payer_order, codes[order])
+        for order in other._weapon_order:
+            self._flag(self.weapon_buyer, self._weapon_order, codes[order])
+        self.stage_values.update(other.stage_values)
+        self.daily.merge(other.daily, codes)
+        self.stages.merge(other.stages, codes)
+        return self
+
+    def _encode(self, user_ids):
+        """user_id 배열 -> 집계 공용 정수 코드 배열 (처음 보는 user_id는 새 코드 부여)"""
+        chunk_codes, uniques = _factorize(user_ids)
+        index = self._codes
+        start = len(index)
+        mapped = np.fromiter(
+            (index.setdefault(user_id, len(index)) for user_id in uniques),
+            dtype=np.int64,
+            count=len(uniques),
+        )
+        self.users.extend(uniques[mapped >= start])
+        self._grow(len(index))
+        return mapped[chunk_codes]
+
+    def _grow(self, size):
+        """유저 배열/비트맵을 size명 이상 담도록 늘림 (두 배씩)"""
+        if size <= self._capacity:
+            return
+        capacity = max(size, self._capacity * 2, 1024)
+        for name, empty in self._USER_ARRAYS.items():
+            setattr(self, name, _resized(getattr(self, name), capacity, empty))
+        self.daily.resize(capacity)
+        self.stages.resize(capacity)
+        self._capacity = capacity
+
+    @staticmethod
+    def _flag(flags, order, codes):
+        """codes 유저를 flags에 표시하고 새로 표시된 유저를 등장 순서대로 order에 추가"""
+        first = pd.unique(codes)
+        order.append(first[~flags[first]])
+        flags[first] = True
+
+    def _users_of(self, order):
+        users = np.asarray(self.users, dtype=object)
+        users = users[np.concatenate(order)] if order else users[:0]
+        if self.user_dictionary is not None:
+            return np.array(self.user_dictionary.decode(users), dtype=object)
+        return users
+
+    def summary(self):
+        """리포트 계산에 필요한 값만 담은 작은 dict (평균 항목은 (합계, 개수))"""
+        n = len(self.users)
+        max_stage = self.max_stage[:n]
+        has_actions = max_stage >= 0
+        payer = self.payer[:n]
+        weapon_buyer = self.weapon_buyer[:n]
+        hours = self.session_hours[:n]
+        rows = self.session_rows[:n]
+        return {
+            "daily": self.daily.counts(n),
+            "stages": self.stages.counts(n),
+            "stage_values": dict(self.stage_values),
+            "special_weapon_buyers": self._users_of(self._weapon_order),
+            "paying_users": self._users_of(self._payer_order),
+            "total_users": int(self.session_user[:n].sum()),
+            # (합계, 개수) - 평균은 합친 뒤 계산
+            "weapon_buyer_max_stage": _total(max_stage[weapon_buyer & has_actions]),
+            "payer_max_stage": _total(max_stage[payer & has_actions]),
+            "non_payer_max_stage": _total(max_stage[~payer & has_actions]),
+            "payer_session_hours": (float(hours[payer].sum()), int(rows[payer].sum())),
+            "non_payer_session_hours": (float(hours[~payer].sum()), int(rows[~payer].sum())),
+            "churn_stage_users": int(self.reached_churn_stages[:n].sum()),
+            "past_churn_stage_users": int((max_stage >= PAST_CHURN_STAGE).sum()),
+        }
+
+    def report(self):
+        """리포트 섹션 값 dict"""
+        return report_of(self.summary())
+
+
+def report_of(summary):
+    """summary -> 리포트 섹션 값 dict"""
+    days = sorted(summary["daily"])
+    daily_users = pd.DataFrame(
+        {
+            "login_date": np.array(days, dtype=object),
+            "user_id": np.array([summary["daily"][day] for day in days], dtype=np.int64),
+        }
+    )
+    names = sorted(summary["stages"])
+    stage_users = pd.DataFrame(
+        {
+            "stage": np.array(names, dtype=object),
+            "user_id": np.array([summary["stages"][name] for name in names], dtype=np.int64),
+            "stage_num": np.array([summary["stage_values"][name] for name in names], dtype=np.int64),
+        }
+    ).sort_values("stage_num")
+    early = daily_users.head(3)["user_id"].mean()
+    late = daily_users.tail(3)["user_id"].mean()
+    report = {
+        "daily_users": daily_users,
+        "early_daily_users": early,
+        "late_daily_users": late,
+        "daily_decline": (1 - late / early) * 100,
+        "stage_users": stage_users,
+    }
+    for key, value in summary.items():
+        if key in _TOTALS:
+            total, count = value
+            report[key] = total / count if count else float("nan")
+        elif key not in ("daily", "stages", "stage_values"):
+            report[key] = value
+    return report
+
+
+def aggregate_files(paths, chunk_rows=100000):
+    """로그 타입 -> 파일 경로 dict의 로그를 청크 단위로 읽어 집계"""
+    metrics = UserPatternMetrics()
+    for log_name, columns in UserPatternMetrics.COLUMNS.items():
+        for chunk in iter_column_chunks(paths[log_name], columns, chunk_rows):
+            metrics.add(log_name, chunk)
+    return metrics
+
+
+def aggregate_range(log_name, path, byte_range, chunk_rows=100000):
+    """log_name 로그 파일의 바이트 범위 하나를 집계 (병렬 분석 워커 프로세스에서 실행)
+
+    byte_range는 log_reader.split_ranges가 나눈 범위이며, 범위별 집계를 파일/범위 순서대로
+    merge하면 파일 전체를 차례로 집계한 것과 같습니다.
+    """
+    metrics = UserPatternMetrics()
+    columns = UserPatternMetrics.COLUMNS[log_name]
+    for chunk in iter_column_chunks(path, columns, chunk_rows, byte_range=byte_range):
+        metrics.add(log_name, chunk)
+    return metrics
+
+
+# summary에서 (합계, 개수)로 저장하고 report_of에서 평균으로 바꾸는 항목
+_TOTALS = (
+    "weapon_buyer_max_stage",
+    "payer_max_stage",
+    "non_payer_max_stage",
+    "payer_session_hours",
+    "non_payer_session_hours",
+)
+
+
+def _total(values):
+    return (int(values.sum()), len(values))
+
+
+def _factorize(values):
+    """배열 -> (코드, 고유값) - 범주형/정수 코드 컬럼은 문자열로 바꾸지 않고 그대로 factorize"""
+    if isinstance(values, pd.Series) and (
+        isinstance(values.dtype, pd.CategoricalDtype) or values.dtype.kind in "iu"
+    ):
+        return pd.factorize(values)
+    return pd.factorize(np.asarray(values, dtype=object))
+
+
+def _without_missing(key_codes, codes):
+    """factorize 결과에서 키가 없는(NaN, 코드 -1) 행 제외"""
+    if key_codes.min(initial=0) >= 0:
+        return key_codes, codes
+    valid = key_codes >= 0
+    return key_codes[valid], codes[valid]
+
+
+def _resized(array, size, empty):
+    resized = np.full(size, empty, dtype=array.dtype)
+    resized[: len(array)] = array
+    return resized
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+컴파일된 생성 시나리오
+생성기가 쓰는 범주형 분포(디바이스, 결제 상태, 스테이지별 액션 등)를 한 번에 Walker alias 테이블로
+컴파일해 두고, 추출할 때는 난수 한 번과 비교 한 번(O(1))으로 값을 고릅니다.
+분포는 JSON 시나리오 파일로 바꿀 수 있으며, 파일에 없는 항목은 기본 시나리오를 그대로 씁니다.
+
+시나리오 파일 예시:
+    {
+      "distributions": {
+        "device": {"values": ["iPhone", "Android", "iPad", "PC"], "weights": [40, 40, 10, 10]},
+        "payment_status": {"values": ["success", "failed"], "weights": [90, 10]}
+      },
+      "stage_actions": [
+        {"max_stage": 5, "values": ["move", "attack", "collect", "jump"]},
+        ...
+      ]
+    }
+"""
+
+import copy
+import json
+
+# weights가 없으면 균등 분포
+DEFAULT_SCENARIO = {
+    "distributions": {
+        # 세션/에러 로그
+        "device": {"values": ["iPhone", "Android", "iPad", "PC"]},
+        "os_version": {
+            "values": ["iOS 17.0", "Android 13", "iOS 16.5", "Windows 11", "Android 12"]
+        },
+        "app_version": {"values": ["1.0.0", "1.0.1", "1.1.0", "1.1.1", "1.2.0"]},
+        # 인게임 액션 로그
+        "region": {"values": ["forest", "desert", "mountain", "city", "dungeon", "castle"]},
+        # 실패 유저의 최대 도달 스테이지 (성공 유저는 항상 10)
+        "max_stage": {"values": [5, 6, 7], "weights": [30, 50, 20]},
+        # 아이템 로그
+        "item_action": {"values": ["acquire", "use", "sell", "buy", "trade", "enhance"]},
+        "item_rarity": {"values": ["common", "rare", "epic"]},
+        # 결제 로그 (successful_*: 성공 유저, 그 외: 실패 유저)
+        "successful_amount": {"values": [9.99, 19.99, 49.99, 99.99]},
+        "successful_product": {
+            "values": ["special_weapon_pack", "premium_currency", "exp_booster"]
+        },
+        "amount": {"values": [0.99, 2.99, 4.99]},
+        "product": {"values": ["basic_currency", "small_booster"]},
+        "payment_method": {"values": ["credit_card", "paypal", "google_pay", "apple_pay"]},
+        "payment_status": {"values": ["success", "failed"], "weights": [95, 5]},
+        # 에러 로그
+        "error_type": {
+            "values": [
+                "network_timeout",
+                "server_error",
+                "client_crash",
+                "payment_failed",
+                "login_failed",
+                "data_sync_error",
+                "memory_error",
+            ]
+        },
+        "severity": {"values": ["low", "medium", "high", "critical"]},
+    },
+    # 스테이지 구간별 액션 타입 (max_stage 이하인 첫 구간 사용)
+    "stage_actions": [
+        {"max_stage": 5, "values": ["move", "attack", "collect", "jump"]},
+        {"max_stage": 7, "values": ["move", "attack", "defend", "special_attack"]},
+        {
+            "max_stage": 10,
+            "values": ["move", "attack", "defend", "special_attack", "ultimate"],
+        },
+    ],
+}
+
+MAX_STAGE = 10
+
+# 한 번 생성할 때 세션이 분포하는 기간(일) - --append는 다음 기간을 이어 붙임
+PERIOD_DAYS = 31
+
+
+class AliasTable:
+    """Walker alias method 범주형 분포 (Vose 구성)
+
+    칸 i를 균등하게 고른 뒤 prob[i] 확률로 values[i], 아니면 values[alias[i]]를 돌려줍니다.
+    """
+
+    def __init__(self, values, weights=None):
+        values = list(values)
+        if not values:
+            raise ValueError("분포 값이 비어 있습니다.")
+        if weights is None:
+            weights = [1] * len(values)
+        if len(weights) != len(values):
+            raise ValueError(f"values({len(values)}개)와 weights({len(weights)}개) 길이가 다릅니다.")
+        total = float(sum(weights))
+        if total <= 0 or min(weights) < 0:
+            raise ValueError("weights는 0 이상이고 합이 0보다 커야 합니다.")
+
+        n = len(values)
+        scaled = [w * n / total for w in weights]
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # 남은 칸은 부동소수점 오차만 있으므로 확률 1
+
+        self.values = values
+        self.weights = list(weights)
+        self.prob = prob
+        self.alias = alias
+        self._n = n
+        # draw에서 인덱싱 한 번으로 꺼내도록 (prob, 값, alias 값) 묶음
+        self._entries = [(prob[i], values[i], values[alias[i]]) for i in range(n)]
+
+    def __len__(self):
+        return self._n
+
+    def draw(self, rng):
+        """rng(random.Random 호환)로 값 1개 추출"""
+        u = rng.random() * self._n
+        i = int(u)
+        p, value, alias_value = self._entries[i]
+        return value if u - i < p else alias_value
+
+
+class Scenario:
+    """시나리오 spec을 alias 테이블과 스테이지별 조회 테이블로 컴파일"""
+
+    def __init__(self, spec=None):
+        self.spec = merge_spec(DEFAULT_SCENARIO, spec or {})
+        self.distributions = {
+            name: AliasTable(dist["values"], dist.get("weights"))
+            for name, dist in self.spec["distributions"].items()
+        }
+        for value in self.distributions["max_stage"].values:
+            if not 1 <= value <= MAX_STAGE:
+                raise ValueError(f"max_stage 값은 1~{MAX_STAGE} 사이여야 합니다: {value}")
+
+        # stage_actions[stage] -> 해당 스테이지의 액션 alias 테이블 (0번은 사용하지 않음)
+        tiers = sorted(self.spec["stage_actions"], key=lambda tier: tier["max_stage"])
+        if tiers[-1]["max_stage"] < MAX_STAGE:
+            raise ValueError(f"stage_actions가 스테이지 {MAX_STAGE}까지 덮어야 합니다.")
+        compiled = [AliasTable(tier["values"], tier.get("weights")) for tier in tiers]
+        self.stage_actions = [None]
+        for stage in range(1, MAX_STAGE + 1):
+            tier = next(i for i, t in enumerate(tiers) if stage <= t["max_stage"])
+            self.stage_actions.append(compiled[tier])
+
+    def __getitem__(self, name):
+        return self.distributions[name]
+
+    @classmethod
+    def load(cls, path):
+        """JSON 시나리오 파일 읽기 (파일에 있는 항목만 기본값을 덮어씀)"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+
+def merge_spec(base, override):
+    """distributions는 이름별로 덮어쓰고, 그 외 최상위 항목은 통째로 교체"""
+    unknown = set(override.get("distributions", {})) - set(base["distributions"])
+    if unknown:
+        raise ValueError(f"알 수 없는 분포 이름: {', '.join(sorted(unknown))}")
+    spec = copy.deepcopy(base)
+    for key, value in override.items():
+        if key == "distributions":
+            spec["distributions"].update(copy.deepcopy(value))
+        else:
+            spec[key] = copy.deepcopy(value)
+    return spec
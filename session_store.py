@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+배열 기반 세션 저장소
+세션을 dict 목록 대신 열(column)별 typed array로 보관합니다.
+(로그인/로그아웃 epoch 초, int32 유저 인덱스, 128비트 세션 ID를 상·하위 64비트로 나눠 저장)
+세션당 36바이트이며, 디렉토리를 지정하면 열마다 memory-mapped 파일을 사용해
+1억 개 세션도 일반 생성 호스트에서 다룰 수 있습니다.
+"""
+
+import calendar
+import mmap
+import os
+import uuid
+from array import array
+from datetime import datetime, timedelta, timezone
+
+# 생성기 시각은 모두 UTC입니다 (naive datetime = UTC 벽시계 시각).
+# 그래야 epoch/epoch_ms 값과 ISO 문자열이 같은 순간을 가리킵니다.
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch(dt):
+    """datetime -> epoch 초 (naive는 UTC로 간주, 시간대가 있으면 UTC로 변환)"""
+    return calendar.timegm(dt.utctimetuple())
+
+
+def from_epoch(seconds):
+    """epoch 초 -> naive UTC datetime (to_epoch의 역변환)"""
+    return EPOCH + timedelta(seconds=seconds)
+
+
+def to_utc(dt):
+    """datetime -> naive UTC datetime (시간대가 있으면 UTC로 변환, naive는 그대로)"""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def utc_now():
+    """현재 UTC 시각 (naive)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class ArrayColumn:
+    """array.array 기반 메모리 열"""
+
+    def __init__(self, typecode):
+        self.data = array(typecode)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        return self.data[index]
+
+    def append(self, value):
+        self.data.append(value)
+
+    def frombytes(self, raw):
+        self.data.frombytes(raw)
+
+    def view(self):
+        return memoryview(self.data)
+
+    def keep_last(self, count):
+        del self.data[: len(self.data) - count]
+
+    def close(self):
+        pass
+
+
+class MmapColumn:
+    """memory-mapped 파일 기반 열 - 용량이 부족하면 파일과 매핑을 두 배로 늘림"""
+
+    def __init__(self, typecode, path, capacity=1 << 16):
+        self.typecode = typecode
+        self.itemsize = array(typecode).itemsize
+        self.path = path
+        self.length = 0
+        self.capacity = capacity
+        self._file = open(path, "w+b")
+        self._file.truncate(capacity * self.itemsize)
+        self._mmap = mmap.mmap(self._file.fileno(), capacity * self.itemsize)
+        self._values = memoryview(self._mmap).cast(typecode)
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("session index out of range")
+        return self._values[index]
+
+    def _reserve(self, count):
+        if self.length + count <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < self.length + count:
+            capacity *= 2
+        # 외부에 노출된 버퍼가 있으면 resize가 실패하므로 먼저 해제
+        self._values.release()
+        self._mmap.resize(capacity * self.itemsize)
+        self._values = memoryview(self._mmap).cast(self.typecode)
+        self.capacity = capacity
+
+    def append(self, value):
+        self._reserve(1)
+        self._values[self.length] = value
+        self.length += 1
+
+    def frombytes(self, raw):
+        count = len(raw) // self.itemsize
+        self._reserve(count)
+        start = self.length * self.itemsize
+        self._mmap[start : start + len(raw)] = raw
+        self.length += count
+
+    def view(self):
+        return self._values[: self.length]
+
+    def keep_last(self, count):
+        if count >= self.length:
+            return
+        drop = self.length - count
+        self._mmap.move(0, drop * self.itemsize, count * self.itemsize)
+        self.length = count
+
+    def close(self):
+        self._values.release()
+        self._mmap.close()
+        self._file.close()
+
+
+class SessionStore:
+    """struct-of-arrays 세션 저장소
+
+    directory가 None이면 메모리 array, 지정하면 열마다 <directory>/sessions.<열>.bin 파일을 매핑합니다.
+    """
+
+    COLUMNS = [
+        ("user_index", "i"),
+        ("login", "q"),
+        ("logout", "q"),
+        ("id_hi", "Q"),
+        ("id_lo", "Q"),
+    ]
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        for name, typecode in self.COLUMNS:
+            if directory:
+                column = MmapColumn(typecode, os.path.join(directory, f"sessions.{name}.bin"))
+            else:
+                column = ArrayColumn(typecode)
+            setattr(self, name, column)
+
+    def __len__(self):
+        return len(self.user_index)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def append(self, user_index, login, logout, session_uuid):
+        """세션 1개 추가 (session_uuid는 128비트 정수)"""
+        self.user_index.append(user_index)
+        self.login.append(login)
+        self.logout.append(logout)
+        self.id_hi.append(session_uuid >> 64)
+        self.id_lo.append(session_uuid & 0xFFFFFFFFFFFFFFFF)
+
+    def extend_bytes(self, user_index, login, logout, id_hi, id_lo):
+        """열별 원시 바이트(네이티브 바이트 순서)로 여러 세션 추가 - 배치 엔진용"""
+        self.user_index.frombytes(user_index)
+        self.login.frombytes(login)
+        self.logout.frombytes(logout)
+        self.id_hi.frombytes(id_hi)
+        self.id_lo.frombytes(id_lo)
+
+    def session_id(self, index):
+        return str(uuid.UUID(int=(self.id_hi[index] << 64) | self.id_lo[index]))
+
+    def get(self, index):
+        """(user_index, login 초, logout 초, session_id 문자열)"""
+        return (
+            self.user_index[index],
+            self.login[index],
+            self.logout[index],
+            self.session_id(index),
+        )
+
+    def keep_last(self, count):
+        """최근 count개 세션만 남김 (장시간 실행용)"""
+        for name, _ in self.COLUMNS:
+            getattr(self, name).keep_last(count)
+
+    def close(self):
+        for name, _ in self.COLUMNS:
+            getattr(self, name).close()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+멀티 프로세스 샤드 로그 생성
+사용자 모집단을 샤드로 나누고 샤드마다 별도 프로세스에서 GameLogGenerator를 실행합니다.
+각 샤드의 seed는 (기본 seed, 샤드 번호)로부터 결정되므로 같은 seed/샤드 수/시작일이면
+출력이 바이트 단위로 동일합니다.
+"""
+
+import hashlib
+import os
+import random
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+from faker import Faker
+
+from compressed_io import open_input, open_output, output_path
+from generate_game_logs import GameLogGenerator
+from log_types import LOG_TYPES, iter_log_chunks
+from partitioned_output import PartitionedOutput
+
+_COPY_BLOCK = 1024 * 1024
+
+
+def derive_shard_seed(seed, shard_index):
+    """기본 seed와 샤드 번호로부터 샤드 전용 seed 계산"""
+    digest = hashlib.blake2b(f"{seed}:{shard_index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def split_evenly(total, parts):
+    """total을 parts개로 최대한 고르게 나눈 크기 목록"""
+    base, remainder = divmod(total, parts)
+    return [base + (1 if i < remainder else 0) for i in range(parts)]
+
+
+def shard_filename(log_name, shard_index):
+    return f"{log_name}.shard-{shard_index:03d}.log"
+
+
+def generate_shard(
+    shard_index,
+    seed,
+    user_count,
+    count,
+    start_date,
+    output_dir,
+    fmt,
+    engine="python",
+    value_pools=None,
+    time_format="iso",
+    compression=None,
+    partition_options=None,
+    scenario=None,
+    exact_counts=False,
+    chunk_size=100000,
+    write_queue=None,
+):
+    """샤드 하나를 생성 (워커 프로세스에서 실행)
+
+    같은 워커가 여러 샤드를 순서대로 처리할 수 있으므로 샤드마다 전역 seed도 다시 설정합니다.
+    Faker의 다국어 locale 선택은 전역 random을 사용하기 때문입니다.
+    """
+    shard_seed = derive_shard_seed(seed, shard_index)
+    random.seed(shard_seed)
+    Faker.seed(shard_seed)
+
+    generator = GameLogGenerator(
+        user_count,
+        seed=shard_seed,
+        start_date=start_date,
+        time_format=time_format,
+        scenario=scenario,
+        exact_counts=exact_counts,
+    )
+    generator.output_dir = output_dir
+    # 샤드 자체가 프로세스 단위로 병렬이므로 샤드 안의 블록 압축은 스레드 하나로 충분
+    generator.compression = compression
+    generator.compress_workers = 1
+    generator.write_queue = write_queue
+    if value_pools:
+        generator.use_value_pools(value_pools)
+
+    def save(chunks, filename):
+        return generator.save_chunks(chunks, filename, fmt)
+
+    partitioned = None
+    if partition_options is not None:
+        # 시간 파티션 출력은 샤드마다 part 이름을 달리해 같은 파티션 디렉토리에 바로 기록
+        partitioned = PartitionedOutput(
+            output_dir,
+            compression=compression,
+            compress_workers=1,
+            part_prefix=f"part-{shard_index:03d}",
+            **partition_options,
+        )
+        save = partitioned.save_chunks
+    source = generator
+    if engine == "numpy":
+        from batch_engine import NumpyBatchEngine
+
+        source = NumpyBatchEngine(generator, seed=shard_seed)
+
+    counts = {}
+    for log_name, method in LOG_TYPES:
+        chunks = iter_log_chunks(source, method, count, chunk_size)
+        counts[log_name] = save(chunks, shard_filename(log_name, shard_index))
+    if partitioned:
+        partitioned.close()
+    return counts
+
+
+def merge_shards(output_dir, shard_count, fmt, keep_shards=False, compression=None):
+    """샤드 파일을 샤드 번호 순서대로 이어 붙여 최종 <log_name>.log 생성
+
+    압축된 NDJSON은 gzip 멤버(bz2/xz 스트림)를 그대로 이어 붙여도 유효한 파일이므로 다시 압축하지 않습니다.
+    """
+    for log_name, _ in LOG_TYPES:
+        target = output_path(os.path.join(output_dir, f"{log_name}.log"), compression)
+        shard_paths = [
+            output_path(os.path.join(output_dir, shard_filename(log_name, i)), compression)
+            for i in range(shard_count)
+        ]
+        shard_paths = [path for path in shard_paths if os.path.exists(path)]
+
+        if fmt == "ndjson":
+            with open(target, "wb") as out:
+                for path in shard_paths:
+                    with open(path, "rb") as f:
+                        shutil.copyfileobj(f, out, _COPY_BLOCK)
+        elif fmt == "csv":
+            _merge_csv(shard_paths, target, compression)
+        else:
+            _merge_json_arrays(shard_paths, target, compression)
+
+        if not keep_shards:
+            for path in shard_paths:
+                os.remove(path)
+
+
+def _merge_csv(paths, target, compression=None):
+    """CSV 샤드들을 헤더 한 줄만 남기고 이어 붙임"""
+    with open_output(target, compression, newline="") as out:
+        for i, path in enumerate(paths):
+            with open_input(path, newline="") as f:
+                if i:
+                    f.readline()
+                shutil.copyfileobj(f, out, _COPY_BLOCK)
+
+
+def _merge_json_arrays(paths, target, compression=None):
+    """JSON 배열 샤드들을 json.dump(indent=2)와 같은 모양의 배열 하나로 병합
+
+    샤드는 JSONArraySink가 기록한 '[' + 원소들 + '\\n]' 모양이므로 괄호 사이 내용을 블록 단위로 복사하고
+    샤드 사이에 ','만 넣습니다. 레코드를 파싱하지 않으며 메모리에는 한 블록만 올라갑니다.
+    """
+    if not paths:
+        return
+    with open_output(target, compression, newline="") as out:
+        out.write("[")
+        for i, path in enumerate(paths):
+            if i:
+                out.write(",")
+            with open_input(path, newline="") as f:
+                if f.read(1) != "[":
+                    raise ValueError(f"JSON 배열 샤드가 아닙니다: {path}")
+                # 닫는 괄호('\n]')를 빼고 쓰도록 블록 끝 두 글자는 다음 블록과 함께 기록
+                tail = ""
+                for block in iter(lambda: f.read(_COPY_BLOCK), ""):
+                    block = tail + block
+                    out.write(block[:-2])
+                    tail = block[-2:]
+            if tail != "\n]":
+                raise ValueError(f"JSON 배열 샤드가 중간에 끝났습니다: {path}")
+        out.write("\n]")
+
+
+def run_sharded(
+    shard_count,
+    seed,
+    user_count,
+    count,
+    start_date,
+    output_dir,
+    fmt="ndjson",
+    engine="python",
+    value_pools=None,
+    workers=None,
+    merge=True,
+    time_format="iso",
+    compression=None,
+    partition_options=None,
+    scenario=None,
+    exact_counts=False,
+    chunk_size=100000,
+    write_queue=None,
+):
+    """user_count명/로그 타입별 count건을 shard_count개 샤드로 나눠 병렬 생성
+
+    partition_options(PartitionedOutput 옵션 dict)를 주면 시간 파티션으로 기록하며 병합 단계가 없습니다.
+    """
+    user_counts = split_evenly(user_count, shard_count)
+    event_counts = split_evenly(count, shard_count)
+    os.makedirs(output_dir, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                generate_shard,
+                shard_index,
+                seed,
+                user_counts[shard_index],
+                event_counts[shard_index],
+                start_date,
+                output_dir,
+                fmt,
+                engine,
+                value_pools,
+                time_format,
+                compression,
+                partition_options,
+                scenario,
+                exact_counts,
+                chunk_size,
+                write_queue,
+            )
+            for shard_index in range(shard_count)
+        ]
+        # 샤드 번호 순서로 결과 수집
+        results = [future.result() for future in futures]
+
+    if merge and partition_options is None:
+        merge_shards(output_dir, shard_count, fmt, compression=compression)
+
+    totals = {log_name: sum(r[log_name] for r in results) for log_name, _ in LOG_TYPES}
+    return totals
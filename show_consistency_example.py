@@ -6,9 +6,11 @@
 import json
 from datetime import datetime
 
+from compressed_io import open_input
+
 def load_json_data(filename):
     """JSON 파일 로드"""
-    with open(f"data/{filename}", 'r', encoding='utf-8') as f:
+    with open_input(f"data/{filename}") as f:
         return json.load(f)
 
 def show_consistency_example():
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+이산 사건(discrete-event) 유저 시뮬레이션 엔진
+유저마다 작은 상태 머신(로그인 → 스테이지 플레이 → 결제 → 특별 무기 구매 → 로그아웃/이탈)을 두고,
+전역 사건 시각 우선순위 큐(heapq)에서 가장 이른 사건부터 처리하며 5종 로그를 부수 효과로 기록합니다.
+로그 타입마다 세션을 따로 뽑는 generate_*_logs와 달리 한 유저의 스테이지 진행, 결제, 아이템 구매,
+에러가 세션 안에서 시간 순서와 인과 관계(결제 → 무기 구매 → 다음 스테이지)를 지킵니다.
+
+- 큐에는 유저당 다음 사건 하나만 (시각 << 32 | 유저 인덱스) 정수로 들어가므로 스케줄링은 O(log n),
+  100만 명을 동시에 시뮬레이션해도 큐 항목은 튜플 없이 정수 100만 개입니다.
+- 유저 상태는 bytearray/array 열(struct-of-arrays)로 보관하고, 접속 중인 유저만 세션 정보를 dict에 둡니다.
+"""
+
+import heapq
+import uuid
+from array import array
+
+from scenario import PERIOD_DAYS
+from session_store import to_epoch
+
+# 유저 상태
+OFFLINE, PLAYING, CHURNED = 0, 1, 2
+
+# flags 비트
+PAID = 1  # 무기 구매용 결제 완료
+ARMED = 2  # 특별 무기 보유 (7스테이지 이후 진행 가능)
+
+# 무기 없이 넘을 수 없는 스테이지 (성공 유저는 결제 → 무기 구매 후 통과)
+WEAPON_GATE = 7
+
+USER_MASK = (1 << 32) - 1
+
+
+class UserSimulation:
+    """GameLogGenerator의 모집단/시나리오/값 공급자를 공유하는 이산 사건 시뮬레이션
+
+    run()은 (로그 이름, 레코드 리스트) 청크를 시간순으로 내보냅니다. 세션은 generator.sessions에도
+    추가되므로 세션 저장소를 쓰는 다른 도구와 그대로 호환됩니다.
+    """
+
+    # 접속 중 행동 비율 (결제는 아래 확률로 별도 결정)
+    ACTION_WEIGHT = 0.6
+    ITEM_WEIGHT = 0.25  # 나머지는 에러
+    MEAN_EVENT_GAP = 90  # 세션 안 사건 간격 평균(초)
+    STAGE_CLEAR_PROB = 0.2
+
+    def __init__(self, generator, days=PERIOD_DAYS):
+        self.generator = generator
+        self.rng = generator.rng
+        self.population = generator.population
+        user_count = self.population.user_count
+        # 이탈률은 start_date 기준 경과일로 정하고, 시뮬레이션은 generator.first_day부터 days일 동안
+        self.origin = to_epoch(generator.start_date)
+        self.start = self.origin + generator.first_day * 86400
+        self.end = self.start + days * 86400
+
+        # 유저별 상태 열 (스테이지 상한은 generator.user_progress를 공유)
+        self.state = bytearray(user_count)
+        self.stage = bytearray(b"\x01" * user_count)
+        self.flags = bytearray(user_count)
+        self.session_end = array("q", bytes(8 * user_count))
+        # 접속 중인 유저 -> (session_id, device, os_version, app_version)
+        self.active = {}
+        self.events = 0
+        self._queue = []
+
+    def _assign_progress(self, user_index):
+        progress = self.generator.user_progress
+        if not progress[user_index]:
+            if self.population.is_successful(user_index):
+                progress[user_index] = 10
+            else:
+                progress[user_index] = self.generator.scenario["max_stage"].draw(self.rng)
+        return progress[user_index]
+
+    def _first_logins(self):
+        """첫 접속 시각 - 초기 유입이 가장 많고 시간이 지날수록 줄어듦 (경과일 ∝ u³)"""
+        rng = self.rng
+        span = self.end - self.start
+        queue = [
+            ((self.start + int(span * rng.random() ** 3)) << 32) | user_index
+            for user_index in range(self.population.user_count)
+        ]
+        heapq.heapify(queue)
+        self._queue = queue
+
+    def run(self, chunk_size=100000):
+        """시뮬레이션 기간이 끝날 때까지 사건을 처리하며 (로그 이름, 레코드 리스트) 청크를 반환"""
+        generator = self.generator
+        rng = self.rng
+        random = rng.random
+        randint = rng.randint
+        new_uuid = generator._new_uuid
+        fmt = generator.time_formatter.format
+        add_epoch_ms = generator.time_formatter.add_epoch_ms
+        population = self.population
+        user_id_of = population.user_id
+        is_successful = population.is_successful
+        values = generator.values
+        scenario = generator.scenario
+        device, os_version, app_version = (
+            scenario["device"],
+            scenario["os_version"],
+            scenario["app_version"],
+        )
+        stage_actions = scenario.stage_actions
+        region = scenario["region"]
+        item_action, item_rarity = scenario["item_action"], scenario["item_rarity"]
+        error_types, severity = scenario["error_type"], scenario["severity"]
+        quest_ids, skill_ids, item_ids = generator.quest_ids, generator.skill_ids, generator.item_ids
+        special_weapon = generator.special_weapon
+        sessions = generator.sessions
+        progress = generator.user_progress
+
+        state, stage, flags = self.state, self.stage, self.flags
+        session_end = self.session_end
+        active = self.active
+        self._first_logins()
+        queue = self._queue
+        heappush, heappop = heapq.heappush, heapq.heappop
+        mean_gap = self.MEAN_EVENT_GAP
+        action_weight = self.ACTION_WEIGHT
+        item_weight = action_weight + self.ITEM_WEIGHT
+        clear_prob = self.STAGE_CLEAR_PROB
+        origin, end = self.origin, self.end
+
+        buffers = {name: [] for name in ("session", "ingame_action", "item", "payment", "error")}
+        session_logs = buffers["session"]
+        action_logs = buffers["ingame_action"]
+        item_logs = buffers["item"]
+        payment_logs = buffers["payment"]
+        error_logs = buffers["error"]
+        out_name, out = None, None
+
+        while queue:
+            key = heappop(queue)
+            now = key >> 32
+            if now >= end:
+                break
+            user_index = key & USER_MASK
+            self.events += 1
+
+            if state[user_index] != PLAYING:
+                # 로그인: 세션을 열고 세션 로그 기록
+                successful = is_successful(user_index)
+                duration = randint(1800, 10800) if successful else randint(300, 3600)
+                logout = now + duration
+                session_uuid = uuid.UUID(int=rng.getrandbits(128), version=4)
+                session_id = str(session_uuid)
+                login_time = fmt(now)
+                session = (
+                    session_id,
+                    device.draw(rng),
+                    os_version.draw(rng),
+                    app_version.draw(rng),
+                )
+                log = {
+                    "log_id": new_uuid(),
+                    "user_id": user_id_of(user_index),
+                    "session_id": session_id,
+                    "login_time": login_time,
+                    "logout_time": fmt(logout),
+                    "session_duration_seconds": duration,
+                    "device": session[1],
+                    "os_version": session[2],
+                    "app_version": session[3],
+                    "ip_address": values.ip_for(user_index, rng),
+                    "country": values.country_for(user_index, rng),
+                    "timestamp": login_time,
+                }
+                if add_epoch_ms:
+                    log["epoch_ms"] = now * 1000
+                session_logs.append(log)
+                out_name, out = "session", session_logs
+                sessions.append(user_index, now, logout, session_uuid.int)
+
+                if not progress[user_index]:
+                    self._assign_progress(user_index)
+                state[user_index] = PLAYING
+                session_end[user_index] = logout
+                active[user_index] = session
+                first_action = now + 1 + int(rng.expovariate(1.0 / mean_gap))
+                heappush(queue, (first_action << 32) | user_index)
+            elif now >= session_end[user_index]:
+                # 로그아웃: 이탈 여부를 정하고 다음 로그인 예약
+                del active[user_index]
+                successful = is_successful(user_index)
+                days_passed = (now - origin) // 86400
+                retention = max(0.2, 1.0 - days_passed * 0.027)
+                if successful:
+                    churn = 0.01
+                else:
+                    churn = (1.0 - retention) * 0.2
+                    if stage[user_index] >= progress[user_index]:
+                        churn += 0.15  # 넘을 수 없는 스테이지에 막힌 유저는 더 빨리 이탈
+                out = None
+                if random() < churn:
+                    state[user_index] = CHURNED
+                    continue
+                state[user_index] = OFFLINE
+                mean_offline = 12 * 3600 if successful else 24 * 3600
+                heappush(
+                    queue,
+                    ((now + 600 + int(rng.expovariate(1.0 / mean_offline))) << 32) | user_index,
+                )
+            else:
+                # 접속 중 행동 1건
+                session = active[user_index]
+                session_id = session[0]
+                user_id = user_id_of(user_index)
+                timestamp = fmt(now)
+                successful = is_successful(user_index)
+                current = stage[user_index]
+                user_flags = flags[user_index]
+                blocked = successful and current == WEAPON_GATE and not user_flags & ARMED
+
+                if blocked and not user_flags & PAID:
+                    # 무기 없이 막힌 성공 유저: 결제
+                    log = self._payment(
+                        user_index, user_id, session_id, timestamp, True, new_uuid, values
+                    )
+                    payment_logs.append(log)
+                    out_name, out = "payment", payment_logs
+                    if log["status"] == "success":
+                        flags[user_index] = user_flags | PAID
+                    if add_epoch_ms:
+                        log["epoch_ms"] = now * 1000
+                elif blocked:
+                    # 결제 완료 -> 특별 무기 구매
+                    log = {
+                        "log_id": new_uuid(),
+                        "user_id": user_id,
+                        "session_id": session_id,
+                        "timestamp": timestamp,
+                        "action_type": "buy",
+                        "item_id": special_weapon,
+                        "item_name": f"아이템_{special_weapon.split('_')[-1]}",
+                        "quantity": 1,
+                        "price": 9900,
+                        "currency": "gold",
+                        "item_level": randint(1, 20),
+                        "rarity": "legendary",
+                    }
+                    if add_epoch_ms:
+                        log["epoch_ms"] = now * 1000
+                    item_logs.append(log)
+                    out_name, out = "item", item_logs
+                    flags[user_index] = user_flags | ARMED
+                else:
+                    roll = random()
+                    if roll < action_weight:
+                        log = {
+                            "log_id": new_uuid(),
+                            "user_id": user_id,
+                            "session_id": session_id,
+                            "timestamp": timestamp,
+                            "action_type": stage_actions[current].draw(rng),
+                            "stage": f"stage_{current:02d}",
+                            "region": region.draw(rng),
+                            "quest_id": rng.choice(quest_ids),
+                            "skill_used": rng.choice(skill_ids),
+                            "experience_gained": randint(10, 100),
+                            "level": min(current * 5 + randint(1, 10), 50),
+                        }
+                        if add_epoch_ms:
+                            log["epoch_ms"] = now * 1000
+                        action_logs.append(log)
+                        out_name, out = "ingame_action", action_logs
+                        # 스테이지 클리어 -> 다음 스테이지 (유저별 최대 스테이지까지)
+                        if current < progress[user_index] and random() < clear_prob:
+                            stage[user_index] = current + 1
+                    elif roll < item_weight:
+                        item_id = rng.choice(item_ids)
+                        log = {
+                            "log_id": new_uuid(),
+                            "user_id": user_id,
+                            "session_id": session_id,
+                            "timestamp": timestamp,
+                            "action_type": item_action.draw(rng),
+                            "item_id": item_id,
+                            "item_name": f"아이템_{item_id.split('_')[-1]}",
+                            "quantity": randint(1, 5),
+                            "price": randint(100, 5000),
+                            "currency": "gold",
+                            "item_level": randint(1, 20),
+                            "rarity": item_rarity.draw(rng),
+                        }
+                        if add_epoch_ms:
+                            log["epoch_ms"] = now * 1000
+                        item_logs.append(log)
+                        out_name, out = "item", item_logs
+                    elif random() < (0.05 if successful else 0.01):
+                        # 그 외 결제 (성공 유저가 더 자주, 더 비싸게)
+                        log = self._payment(
+                            user_index, user_id, session_id, timestamp, successful, new_uuid, values
+                        )
+                        if add_epoch_ms:
+                            log["epoch_ms"] = now * 1000
+                        payment_logs.append(log)
+                        out_name, out = "payment", payment_logs
+                    else:
+                        error_type = error_types.draw(rng)
+                        log = {
+                            "log_id": new_uuid(),
+                            "user_id": user_id,
+                            "session_id": session_id,
+                            "timestamp": timestamp,
+                            "error_type": error_type,
+                            "error_code": f"E{randint(1000, 9999)}",
+                            "error_message": f"{error_type.replace('_', ' ').title()} occurred",
+                            "severity": severity.draw(rng),
+                            "device": session[1],
+                            "os_version": session[2],
+                            "app_version": session[3],
+                            "stack_trace": values.stack_trace(rng),
+                        }
+                        if add_epoch_ms:
+                            log["epoch_ms"] = now * 1000
+                        error_logs.append(log)
+                        out_name, out = "error", error_logs
+
+                # 다음 행동 (세션 종료 시각을 넘으면 그 시각에 로그아웃)
+                next_time = now + 1 + int(rng.expovariate(1.0 / mean_gap))
+                heappush(queue, (min(next_time, session_end[user_index]) << 32) | user_index)
+
+            # 방금 기록한 로그 타입의 버퍼가 차면 청크로 내보냄 (리스트는 재사용)
+            if out is not None and len(out) >= chunk_size:
+                yield out_name, out[:]
+                del out[:]
+
+        for name, logs in buffers.items():
+            if logs:
+                yield name, logs
+
+    def _payment(self, user_index, user_id, session_id, timestamp, successful, new_uuid, values):
+        rng = self.rng
+        scenario = self.generator.scenario
+        if successful:
+            amount = scenario["successful_amount"].draw(rng)
+            product = scenario["successful_product"].draw(rng)
+        else:
+            amount = scenario["amount"].draw(rng)
+            product = scenario["product"].draw(rng)
+        return {
+            "log_id": new_uuid(),
+            "user_id": user_id,
+            "session_id": session_id,
+            "timestamp": timestamp,
+            "transaction_id": new_uuid(),
+            "product_id": product,
+            "product_name": product.replace("_", " ").title(),
+            "amount": amount,
+            "currency": "USD",
+            "payment_method": scenario["payment_method"].draw(rng),
+            "status": scenario["payment_status"].draw(rng),
+            "country": values.country_for(user_index, rng),
+        }
+
+    def summary(self):
+        churned = self.state.count(CHURNED)
+        armed = sum(1 for f in self.flags if f & ARMED)
+        return (
+            f"사건 {self.events}건 처리, 이탈 유저 {churned}명, 특별 무기 보유 {armed}명, "
+            f"세션 {len(self.generator.sessions)}개"
+        )
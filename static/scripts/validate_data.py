@@ -3,11 +3,27 @@
 생성된 게임 로그 데이터 검증 스크립트
 """
 
-import json
 import csv
 import os
+import sys
 from collections import Counter
 
+import numpy as np
+
+# 저장소 루트의 compressed_io(gzip/bz2/xz 압축 데이터)와 log_tables(딕셔너리 인코딩 로더) 사용
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from compressed_io import open_input, resolve_input
+from log_tables import LogTables, counts_in_order
+
+# JSON 로그를 한 번씩만 읽어 검증 단계들이 공유 (user_id 등은 다섯 테이블 공용 정수 코드)
+_tables = LogTables()
+
+def load_json_table(filename):
+    """data/<filename> 압축 테이블 (처음 요청할 때 한 번만 읽음)"""
+    if filename not in _tables:
+        _tables.load(filename, os.path.join("data", filename))
+    return _tables[filename]
+
 def validate_json_files():
     """JSON 파일들의 레코드 수와 구조 검증"""
     json_files = [
@@ -22,16 +38,15 @@ def validate_json_files():
     print("-" * 50)
     
     for filename in json_files:
-        filepath = os.path.join("data", filename)
-        if os.path.exists(filepath):
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                print(f"✅ {filename}: {len(data):,}건")
-                
-                # 첫 번째 레코드의 키 구조 출력
-                if data:
-                    keys = list(data[0].keys())
-                    print(f"   📋 필드: {', '.join(keys[:5])}{'...' if len(keys) > 5 else ''}")
+        filepath = resolve_input(os.path.join("data", filename))
+        if filepath:
+            data = load_json_table(filename)
+            print(f"✅ {filename}: {len(data):,}건")
+            
+            # 레코드의 키 구조 출력
+            if len(data):
+                keys = list(data.columns)
+                print(f"   📋 필드: {', '.join(keys[:5])}{'...' if len(keys) > 5 else ''}")
         else:
             print(f"❌ {filename}: 파일이 존재하지 않습니다")
     print()
@@ -50,9 +65,9 @@ def validate_csv_files():
     print("-" * 50)
     
     for filename in csv_files:
-        filepath = os.path.join("data", filename)
-        if os.path.exists(filepath):
-            with open(filepath, 'r', encoding='utf-8') as f:
+        filepath = resolve_input(os.path.join("data", filename))
+        if filepath:
+            with open_input(filepath, newline='') as f:
                 reader = csv.reader(f)
                 header = next(reader)  # 헤더 스킵
                 row_count = sum(1 for row in reader)
@@ -67,41 +82,31 @@ def analyze_sample_data():
     print("🔍 샘플 데이터 분석:")
     print("-" * 50)
     
-    # 세션 로그 분석
-    with open("data/session_logs.json", 'r', encoding='utf-8') as f:
-        session_data = json.load(f)
-        devices = [log['device'] for log in session_data]
-        device_counts = Counter(devices)
-        print(f"📱 디바이스 분포: {dict(device_counts)}")
+    # 세션 로그 분석 (범주형 컬럼 코드로 집계 - 처음 등장한 순서는 Counter와 같음)
+    session_data = load_json_table("session_logs.json")
+    device_counts = counts_in_order(session_data['device'])
+    print(f"📱 디바이스 분포: {device_counts}")
     
     # 인게임 액션 로그 분석
-    with open("data/ingame_action_logs.json", 'r', encoding='utf-8') as f:
-        action_data = json.load(f)
-        actions = [log['action_type'] for log in action_data]
-        action_counts = Counter(actions)
-        print(f"🎯 액션 타입 분포 (상위 5개): {dict(list(action_counts.most_common(5)))}")
+    action_data = load_json_table("ingame_action_logs.json")
+    action_counts = Counter(counts_in_order(action_data['action_type']))
+    print(f"🎯 액션 타입 분포 (상위 5개): {dict(list(action_counts.most_common(5)))}")
     
     # 에러 로그 분석
-    with open("data/error_logs.json", 'r', encoding='utf-8') as f:
-        error_data = json.load(f)
-        error_types = [log['error_type'] for log in error_data]
-        error_counts = Counter(error_types)
-        print(f"🚨 에러 타입 분포: {dict(error_counts)}")
-        
-        severities = [log['severity'] for log in error_data]
-        severity_counts = Counter(severities)
-        print(f"⚠️  심각도 분포: {dict(severity_counts)}")
+    error_data = load_json_table("error_logs.json")
+    error_counts = counts_in_order(error_data['error_type'])
+    print(f"🚨 에러 타입 분포: {error_counts}")
+    
+    severity_counts = counts_in_order(error_data['severity'])
+    print(f"⚠️  심각도 분포: {severity_counts}")
     
     # 결제 로그 분석
-    with open("data/payment_logs.json", 'r', encoding='utf-8') as f:
-        payment_data = json.load(f)
-        statuses = [log['status'] for log in payment_data]
-        status_counts = Counter(statuses)
-        print(f"💳 결제 상태 분포: {dict(status_counts)}")
-        
-        currencies = [log['currency'] for log in payment_data]
-        currency_counts = Counter(currencies)
-        print(f"💰 통화 분포: {dict(currency_counts)}")
+    payment_data = load_json_table("payment_logs.json")
+    status_counts = counts_in_order(payment_data['status'])
+    print(f"💳 결제 상태 분포: {status_counts}")
+    
+    currency_counts = counts_in_order(payment_data['currency'])
+    print(f"💰 통화 분포: {currency_counts}")
     
     print()
 
@@ -110,8 +115,8 @@ def check_data_consistency():
     print("🔧 데이터 일관성 검증:")
     print("-" * 50)
     
-    # 모든 JSON 파일에서 user_id 수집
-    all_user_ids = set()
+    # 모든 JSON 파일에서 user_id 코드 수집 (공용 사전 코드라 파일 간 합집합이 정수 연산)
+    all_user_ids = []
     
     files_to_check = [
         "session_logs.json",
@@ -122,13 +127,11 @@ def check_data_consistency():
     ]
     
     for filename in files_to_check:
-        with open(f"data/{filename}", 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            user_ids = {log['user_id'] for log in data}
-            all_user_ids.update(user_ids)
-            print(f"📊 {filename}: {len(user_ids)}개의 고유 사용자")
+        user_ids = load_json_table(filename)['user_id'].unique()
+        all_user_ids.append(user_ids)
+        print(f"📊 {filename}: {len(user_ids)}개의 고유 사용자")
     
-    print(f"👥 전체 고유 사용자 수: {len(all_user_ids)}명")
+    print(f"👥 전체 고유 사용자 수: {len(np.unique(np.concatenate(all_user_ids)))}명")
     print()
 
 def main():
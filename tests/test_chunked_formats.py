@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+청크 분석 입력 형식 확인
+생성기의 --format csv 출력(<로그>.log, 압축 포함)을 --chunked 분석이 CSV로 읽어
+같은 시드의 NDJSON 출력과 같은 리포트를 내는지 확인합니다.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GENERATE = ["--count", "2000", "--seed", "7", "--start-date", "2025-07-01T00:00:00"]
+
+
+def _run(script, *args):
+    result = subprocess.run(
+        [sys.executable, os.path.join(ROOT, script), *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout
+
+
+def _chunked_report(data_dir):
+    output = _run("analyze_user_patterns.py", "--chunked", "--data-dir", str(data_dir))
+    # 파일 경로가 들어가는 진행 메시지는 제외
+    return [line for line in output.splitlines() if not line.startswith("📂")]
+
+
+@pytest.fixture(scope="module")
+def ndjson_report(tmp_path_factory):
+    data_dir = tmp_path_factory.mktemp("ndjson")
+    _run("generate_game_logs.py", "--format", "ndjson", "--output-dir", str(data_dir), *GENERATE)
+    return _chunked_report(data_dir)
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_chunked_analysis_reads_csv_output(tmp_path, ndjson_report, compression):
+    args = ["--format", "csv", "--output-dir", str(tmp_path), *GENERATE]
+    if compression:
+        args += ["--compression", compression]
+    _run("generate_game_logs.py", *args)
+
+    assert _chunked_report(tmp_path) == ndjson_report
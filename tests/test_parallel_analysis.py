@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+병렬 분석 확인
+--workers N이 로그 파일을 바이트 범위로 나눠 집계해도 --chunked와 같은 리포트를 내는지,
+split_ranges의 범위를 이어 읽으면 파일 전체를 읽은 것과 같은지 확인합니다.
+"""
+
+import csv
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import log_reader
+from log_reader import iter_column_chunks, split_ranges
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GENERATE = ["--count", "3000", "--seed", "11", "--start-date", "2025-07-01T00:00:00"]
+
+
+def _run(script, *args):
+    result = subprocess.run(
+        [sys.executable, os.path.join(ROOT, script), *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # 파일 경로/범위 수가 들어가는 진행 메시지는 제외
+    return [line for line in result.stdout.splitlines() if not line.startswith("📂")]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "json"])
+def test_workers_report_matches_chunked(tmp_path, fmt):
+    _run("generate_game_logs.py", "--format", fmt, "--output-dir", str(tmp_path), *GENERATE)
+    chunked = _run("analyze_user_patterns.py", "--chunked", "--data-dir", str(tmp_path))
+    parallel = _run(
+        "analyze_user_patterns.py", "--workers", "3", "--chunk-rows", "500", "--data-dir", str(tmp_path)
+    )
+    assert parallel == chunked
+
+
+def _read_ranges(path, columns, ranges):
+    rows = []
+    for byte_range in ranges:
+        for chunk in iter_column_chunks(path, columns, 2, byte_range=byte_range):
+            rows += list(zip(*(list(chunk[column]) for column in columns)))
+    return rows
+
+
+RECORDS = [
+    {"user_id": f"u{i}", "note": "줄\n바꿈, \"따옴표\"" if i % 3 == 0 else f"n{i}"} for i in range(40)
+]
+
+
+def _write(path, fmt):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if fmt == "json":
+            json.dump(RECORDS, f, ensure_ascii=False, indent=2)
+        elif fmt == "ndjson":
+            f.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in RECORDS)
+        else:
+            writer = csv.writer(f)
+            writer.writerow(["user_id", "note"])
+            writer.writerows((record["user_id"], record["note"]) for record in RECORDS)
+
+
+@pytest.mark.parametrize("fmt", ["csv", "json", "ndjson"])
+@pytest.mark.parametrize("parts", [2, 7, 50])
+def test_split_ranges_cover_file(tmp_path, monkeypatch, fmt, parts):
+    # 블록 경계에서도 레코드 시작을 찾는지 확인하도록 블록을 작게
+    monkeypatch.setattr(log_reader, "_SPLIT_BLOCK", 16)
+    path = str(tmp_path / "log")
+    _write(path, fmt)
+    columns = ["user_id", "note"]
+    ranges = split_ranges(path, parts)
+
+    assert len(ranges) > 1
+    assert _read_ranges(path, columns, ranges) == _read_ranges(path, columns, [None])
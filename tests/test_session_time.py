@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+생성기 시각 기준 확인
+epoch 값과 ISO 문자열이 호스트 시간대와 관계없이 같은 UTC 순간을 가리키는지 확인합니다.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from session_store import from_epoch, to_epoch, to_utc
+from timestamp_format import TimestampFormatter
+
+
+def test_to_epoch_is_posix_time():
+    naive = datetime(2025, 7, 1, 9, 30, 15)
+    aware = naive.replace(tzinfo=timezone.utc)
+    assert to_epoch(naive) == aware.timestamp()
+    # 시간대가 있는 시각은 UTC로 변환
+    seoul = datetime(2025, 7, 1, 18, 30, 15, tzinfo=timezone(timedelta(hours=9)))
+    assert to_epoch(seoul) == aware.timestamp()
+    assert to_utc(seoul) == naive
+    assert from_epoch(to_epoch(naive)) == naive
+
+
+def test_iso_and_epoch_ms_agree():
+    seconds = to_epoch(datetime(2025, 7, 1, 23, 59, 59))
+    formatter = TimestampFormatter("both")
+    iso = datetime.fromisoformat(formatter.iso(seconds)).replace(tzinfo=timezone.utc)
+    assert iso.timestamp() * 1000 == formatter.epoch_ms(seconds)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+빠른 타임스탬프 포맷터
+생성기 내부 시각은 epoch 초(정수)로 다루고, ISO 문자열은 '날짜T시:' 접두사를 시간 단위로 캐시한 뒤
+미리 만들어 둔 '분:초' 3600개 중 하나를 붙이는 방식으로 만듭니다.
+datetime 객체 생성이나 isoformat() 호출 없이 문자열 연결 한 번으로 끝납니다.
+"""
+
+from session_store import from_epoch
+
+TIME_FORMATS = ["iso", "epoch_ms", "both"]
+
+# "MM:SS" 3600개 (시 안의 초 -> 문자열)
+_MINUTE_SECONDS = [f"{s // 60:02d}:{s % 60:02d}" for s in range(3600)]
+
+
+class TimestampFormatter:
+    """epoch 초 -> 출력 시각 값
+
+    mode
+      - iso: ISO 8601 문자열 (datetime.isoformat()과 동일, 초 단위)
+      - epoch_ms: 시각 필드를 epoch 밀리초 정수로 출력
+      - both: ISO 문자열을 유지하고 레코드에 epoch_ms 필드를 추가
+    """
+
+    def __init__(self, mode="iso"):
+        if mode not in TIME_FORMATS:
+            raise ValueError(f"알 수 없는 시각 형식: {mode}")
+        self.mode = mode
+        self.add_epoch_ms = mode == "both"
+        self._prefixes = {}
+        if mode == "epoch_ms":
+            self.format = self.epoch_ms
+        else:
+            self.format = self.iso
+
+    def iso(self, seconds):
+        hour, rest = divmod(seconds, 3600)
+        prefix = self._prefixes.get(hour)
+        if prefix is None:
+            prefix = from_epoch(hour * 3600).strftime("%Y-%m-%dT%H:")
+            self._prefixes[hour] = prefix
+        return prefix + _MINUTE_SECONDS[rest]
+
+    @staticmethod
+    def epoch_ms(seconds):
+        return seconds * 1000
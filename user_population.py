@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+게임 사용자 모집단 모델
+성공 유저(30%)와 실패 유저 풀을 미리 나눠두어 매 이벤트의 사용자 선택을 O(1)로 처리합니다.
+사용자 ID는 인덱스로부터 결정적으로 계산하므로 천만 명 규모도 문자열 목록 없이 다룰 수 있습니다.
+"""
+
+import hashlib
+import random
+import uuid
+from array import array
+from collections.abc import Sequence, Set
+
+
+class UserPopulation:
+    """인덱스 기반 사용자 모집단
+
+    - 사용자는 0..user_count-1 인덱스로 표현됩니다.
+    - 성공 여부는 bytearray 플래그, 성공/실패 유저 풀은 int32 array로 보관합니다.
+    - user_id 문자열은 (salt, 인덱스)의 해시로 필요할 때 만들어집니다.
+    """
+
+    def __init__(self, user_count=1000, success_ratio=0.3, rng=random):
+        self.user_count = user_count
+        self.success_ratio = success_ratio
+        self._salt = rng.getrandbits(64).to_bytes(8, "little")
+        self._index_by_id = None
+
+        success_count = int(user_count * success_ratio)
+        self.success_flags = bytearray(user_count)
+        self.successful_pool = array("i", rng.sample(range(user_count), success_count))
+        for index in self.successful_pool:
+            self.success_flags[index] = 1
+
+        flags = self.success_flags
+        self.unsuccessful_pool = array(
+            "i", (index for index in range(user_count) if not flags[index])
+        )
+
+        self.user_ids = UserIdSequence(self)
+        self.successful_user_ids = SuccessfulUserIds(self)
+
+    def user_id(self, index):
+        """인덱스에 대응하는 UUID4 형식의 사용자 ID"""
+        digest = hashlib.blake2b(
+            index.to_bytes(8, "little"), key=self._salt, digest_size=16
+        ).digest()
+        return str(uuid.UUID(bytes=digest, version=4))
+
+    def index_of(self, user_id):
+        """사용자 ID의 인덱스 (역방향 조회용 dict는 처음 호출될 때 한 번 생성)"""
+        if self._index_by_id is None:
+            self._index_by_id = {
+                self.user_id(index): index for index in range(self.user_count)
+            }
+        return self._index_by_id.get(user_id)
+
+    def is_successful(self, index):
+        return self.success_flags[index] == 1
+
+    def pick_successful(self, rng=random):
+        """성공 유저 인덱스 하나를 O(1)로 선택"""
+        pool = self.successful_pool
+        return pool[rng.randrange(len(pool))]
+
+    def pick_unsuccessful(self, rng=random):
+        """실패 유저 인덱스 하나를 O(1)로 선택"""
+        pool = self.unsuccessful_pool
+        return pool[rng.randrange(len(pool))]
+
+
+class UserIdSequence(Sequence):
+    """모집단 전체 사용자 ID를 리스트처럼 보여주는 읽기 전용 뷰"""
+
+    def __init__(self, population):
+        self._population = population
+
+    def __len__(self):
+        return self._population.user_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("user index out of range")
+        return self._population.user_id(index)
+
+    def __contains__(self, user_id):
+        return self._population.index_of(user_id) is not None
+
+
+class SuccessfulUserIds(Set):
+    """성공 유저 ID 집합 뷰 - 기존 successful_users set과 같은 방식으로 사용"""
+
+    def __init__(self, population):
+        self._population = population
+
+    def __len__(self):
+        return len(self._population.successful_pool)
+
+    def __iter__(self):
+        for index in self._population.successful_pool:
+            yield self._population.user_id(index)
+
+    def __contains__(self, user_id):
+        index = self._population.index_of(user_id)
+        return index is not None and self._population.is_successful(index)
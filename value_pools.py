@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Faker 값 풀
+IP, 국가 코드, 스택 트레이스 텍스트를 미리 한 번 생성해두고 생성 루프에서는 인덱스로만 꺼내 씁니다.
+풀은 seed와 크기별로 디스크에 저장되어 다음 실행에서 재사용됩니다.
+"""
+
+import json
+import os
+import random
+
+from faker import Faker
+
+LOCALES = ["ko_KR", "en_US"]
+DEFAULT_CACHE_DIR = os.path.expanduser("~/.cache/game-log-generator/pools")
+
+# 유저 인덱스를 풀 인덱스로 흩뿌리는 곱셈 상수 (Knuth multiplicative hash)
+_USER_HASH = 2654435761
+
+
+class FakerValues:
+    """풀 없이 매번 Faker를 호출하는 기본 값 공급자 (기존 동작)"""
+
+    def __init__(self, fake):
+        self.fake = fake
+
+    def ip_for(self, user_index, rng):
+        return self.fake.ipv4()
+
+    def country_for(self, user_index, rng):
+        return self.fake.country_code()
+
+    def stack_trace(self, rng):
+        return self.fake.text(max_nb_chars=200)
+
+
+class ValuePools:
+    """미리 생성한 Faker 값 풀
+
+    per_user=True이면 IP와 국가 코드가 유저 인덱스로 고정되어
+    같은 유저는 항상 같은 IP/국가로 기록됩니다.
+    """
+
+    def __init__(self, ips, countries, stack_traces, per_user=False):
+        self.ips = ips
+        self.countries = countries
+        self.stack_traces = stack_traces
+        self.per_user = per_user
+
+    @classmethod
+    def build(cls, seed, ip_count=4096, country_count=4096, stack_trace_count=1024):
+        """seed로 고정된 Faker 인스턴스로 풀 생성
+
+        다국어 Proxy의 locale 선택은 전역 random을 쓰므로, locale별 Generator를 직접 번갈아 사용합니다.
+        """
+        fake = Faker(LOCALES)
+        fake.seed_instance(seed)
+        factories = [fake[locale] for locale in LOCALES]
+        rng = random.Random(seed)
+        return cls(
+            [rng.choice(factories).ipv4() for _ in range(ip_count)],
+            [rng.choice(factories).country_code() for _ in range(country_count)],
+            [rng.choice(factories).text(max_nb_chars=200) for _ in range(stack_trace_count)],
+        )
+
+    @classmethod
+    def load_or_build(
+        cls,
+        seed,
+        cache_dir=DEFAULT_CACHE_DIR,
+        ip_count=4096,
+        country_count=4096,
+        stack_trace_count=1024,
+    ):
+        """디스크 캐시가 있으면 읽고, 없으면 생성해서 저장"""
+        path = os.path.join(
+            cache_dir, f"pools-seed{seed}-{ip_count}x{country_count}x{stack_trace_count}.json"
+        )
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return cls(data["ips"], data["countries"], data["stack_traces"])
+
+        pools = cls.build(seed, ip_count, country_count, stack_trace_count)
+        os.makedirs(cache_dir, exist_ok=True)
+        # 샤드 워커가 동시에 만들 수 있으므로 임시 파일에 쓰고 교체
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "ips": pools.ips,
+                    "countries": pools.countries,
+                    "stack_traces": pools.stack_traces,
+                },
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, path)
+        return pools
+
+    def user_slot(self, user_index, size):
+        """유저 인덱스에 고정된 풀 인덱스"""
+        return (user_index * _USER_HASH) % size
+
+    def ip_for(self, user_index, rng):
+        ips = self.ips
+        if self.per_user:
+            return ips[self.user_slot(user_index, len(ips))]
+        return ips[rng.randrange(len(ips))]
+
+    def country_for(self, user_index, rng):
+        countries = self.countries
+        if self.per_user:
+            return countries[self.user_slot(user_index, len(countries))]
+        return countries[rng.randrange(len(countries))]
+
+    def stack_trace(self, rng):
+        stack_traces = self.stack_traces
+        return stack_traces[rng.randrange(len(stack_traces))]